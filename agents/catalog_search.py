@@ -2,15 +2,18 @@
 Catalog Search Node - Searches for similar products using semantic RAG
 """
 
-from data import search_catalog
+import logging
+from data import IN_STOCK_LOTS, ETA_MATRIX, W_IDX, C_IDX, search_catalog
 from models import State
 
+logger = logging.getLogger(__name__)
+
 
 def catalog_search_node(state: State) -> State:
     """
     Search for similar products in catalog using semantic RAG
     """
-    print(f"🔍 CATALOG SEARCH: Searching alternatives for '{state['requested_item']}'")
+    logger.info("🔍 CATALOG SEARCH: Searching alternatives for '%s'", state["requested_item"])
     
     # Adjust search based on strategy
     k = 3 if state["strategy"] == "fast" else 5 if state["strategy"] == "balanced" else 10
@@ -18,6 +21,28 @@ def catalog_search_node(state: State) -> State:
     similar_docs = search_catalog(state["requested_item"], k=k)
     state["catalog_candidates"] = similar_docs
     
-    print(f"   ✓ Found {len(similar_docs)} candidates (strategy: {state['strategy']})\n")
+    # Join candidates with their in-stock lots once for all downstream agents
+    candidate_lots = []
+    for doc in similar_docs:
+        sku = doc.metadata.get("sku")
+        product_name = doc.metadata.get("product_name") or doc.page_content.split(" - ")[0]
+        for lot_info in IN_STOCK_LOTS.get(sku, ()):
+            candidate_lots.append((sku, product_name, lot_info))
+    
+    # One gather from the ETA matrix for all lots (-1 = unknown -> 999)
+    warehouse_idx = [W_IDX.get(lot_info["warehouse"], -1) for _, _, lot_info in candidate_lots]
+    etas = ETA_MATRIX[warehouse_idx, C_IDX.get(state["requested_country"], -1)].tolist()
+    
+    state["lots_join"] = [
+        {
+            **lot_info,
+            "sku": sku,
+            "product_name": product_name,
+            "eta_days": eta_days
+        }
+        for (sku, product_name, lot_info), eta_days in zip(candidate_lots, etas)
+    ]
+    
+    logger.info("   ✓ Found %d candidates (strategy: %s)", len(similar_docs), state["strategy"])
     return state
 
@@ -2,20 +2,35 @@
 Compliance Agent - Verifies regulatory compliance
 """
 
+import logging
+from typing import Any, Dict
 from langchain_core.prompts import ChatPromptTemplate
 from config import llm
-from data import REGULATIONS
+from data import REGULATIONS, REGISTERED_SETS
 from models import State
 
+logger = logging.getLogger(__name__)
 
-def compliance_agent(state: State) -> State:
+COMPLIANCE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are a Compliance Agent. Summarize the regulatory findings in 1-2 sentences."),
+    ("user", "Compliant: {compliant_skus}\nViolations: {violations}")
+])
+
+compliance_chain = COMPLIANCE_PROMPT | llm
+
+
+async def compliance_agent(state: State) -> Dict[str, Any]:
     """
     COMPLIANCE AGENT: Verifies regulatory compliance
+
+    Runs in parallel with the other specialized agents, so it returns only
+    the state key it owns.
     """
-    print(f"👮 COMPLIANCE AGENT: Verifying {state['requested_country']} regulations")
+    logger.info("👮 COMPLIANCE AGENT: Verifying %s regulations", state["requested_country"])
     
     country = state["requested_country"]
     country_rules = REGULATIONS.get(country, {})
+    registered_skus = REGISTERED_SETS.get(country, frozenset())
     
     compliant_skus = []
     violations = []
@@ -25,7 +40,7 @@ def compliance_agent(state: State) -> State:
         cold_chain = doc.metadata.get("cold_chain", False)
         
         # Verify registration
-        if sku not in country_rules.get("registered_skus", []):
+        if sku not in registered_skus:
             violations.append(f"{sku}: Not registered in {country}")
             continue
         
@@ -36,20 +51,24 @@ def compliance_agent(state: State) -> State:
         
         compliant_skus.append(sku)
     
-    # Use LLM to generate reasoning
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a Compliance Agent. Summarize the regulatory findings in 1-2 sentences."),
-        ("user", f"Compliant: {compliant_skus}\nViolations: {violations}")
-    ])
-    
-    reasoning = (prompt | llm).invoke({}).content if violations else "All candidates comply with regulations."
+    # The violations are already human-readable, so only the exhaustive
+    # strategy pays for an LLM summary
+    if not violations:
+        reasoning = "All candidates comply with regulations."
+    elif state["strategy"] == "exhaustive":
+        reasoning = (await compliance_chain.ainvoke({
+            "compliant_skus": compliant_skus,
+            "violations": violations
+        })).content
+    else:
+        reasoning = f"{len(compliant_skus)} compliant SKUs; {len(violations)} violations: {'; '.join(violations[:3])}"
     
-    state["compliance_result"] = {
+    compliance_result = {
         "compliant_skus": compliant_skus,
         "violations": violations,
         "reasoning": reasoning
     }
     
-    print(f"   ✓ {len(compliant_skus)} compliant products\n")
-    return state
+    logger.info("   ✓ %d compliant products", len(compliant_skus))
+    return {"compliance_result": compliance_result}
 
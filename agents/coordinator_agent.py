@@ -2,18 +2,23 @@
 Coordinator Agent - Synthesizes results from all specialized agents
 """
 
+import logging
 from datetime import datetime
-from data import INVENTORY, LOGISTICS_ETA, REGULATIONS
+import numpy as np
+from data import REGULATIONS
 from models import State, SubstituteCandidate
 
+logger = logging.getLogger(__name__)
+
+# Number of ranked candidates handed to the recommendation agent
+COORDINATOR_TOP_K = 5
+
 
 def coordinator_agent(state: State) -> State:
     """
     COORDINATOR AGENT: Synthesizes results from all specialized agents
     """
-    print("=" * 80)
-    print("🎯 COORDINATOR AGENT: Synthesizing results from specialized agents")
-    print("=" * 80)
+    logger.info("🎯 COORDINATOR AGENT: Synthesizing results from specialized agents")
     
     # Filter valid candidates by combining all criteria
     compliance_skus = set(state["compliance_result"]["compliant_skus"])
@@ -25,7 +30,7 @@ def coordinator_agent(state: State) -> State:
     if not valid_skus:
         state["coordinator_synthesis"] = "No substitutes meet all criteria."
         state["compliant_substitutes"] = []
-        print("   ⚠️  No valid substitutes found\n")
+        logger.info("   ⚠️  No valid substitutes found")
         return state
     
     # Build complete candidates
@@ -33,77 +38,85 @@ def coordinator_agent(state: State) -> State:
     country_rules = REGULATIONS.get(country, {})
     min_shelf_life = country_rules.get("min_shelf_life_months", 6)
     
-    candidates = []
+    now = datetime.now()
+    
+    # Gather every in-stock lot of the valid SKUs into parallel columns
+    rows = [lot_info for lot_info in state["lots_join"] if lot_info["sku"] in valid_skus]
+    
+    stocks = np.array([lot_info["stock"] for lot_info in rows], dtype=np.float64)
+    costs = np.array([lot_info["cost_usd"] for lot_info in rows], dtype=np.float64)
+    months = np.array([(lot_info["expiry_dt"] - now).days / 30 for lot_info in rows], dtype=np.float64)
+    etas = np.array([lot_info["eta_days"] for lot_info in rows], dtype=np.float64)
+    
+    # Multi-criteria scoring
+    eta_score = np.maximum(0, 100 - etas * 5)
+    stock_score = np.minimum(100, stocks / 10)
+    shelf_life_score = np.minimum(100, months * 3)
+    cost_score = np.maximum(0, 100 - costs * 100)
     
-    for doc in state["catalog_candidates"]:
-        sku = doc.metadata.get("sku")
-        if sku not in valid_skus:
-            continue
+    total_score = (
+        eta_score * 0.35 +
+        stock_score * 0.25 +
+        shelf_life_score * 0.25 +
+        cost_score * 0.15
+    )
+    # Built-in round() rounds the exact binary value, unlike np.round's scaling
+    scores = np.array([round(score, 2) for score in total_score.tolist()], dtype=np.float64)
+    
+    # Drop lots below the minimum shelf life
+    valid_rows = np.flatnonzero(months >= min_shelf_life)
+    
+    # Partial sort: only lots scoring at least the K-th best score are ranked
+    # (stable, so ties keep catalog order exactly as a full sort would)
+    top_rows = valid_rows
+    if len(valid_rows) > COORDINATOR_TOP_K:
+        valid_scores = scores[valid_rows]
+        kth_score = np.partition(valid_scores, -COORDINATOR_TOP_K)[-COORDINATOR_TOP_K]
+        top_rows = valid_rows[valid_scores >= kth_score]
+    ranked = top_rows[np.argsort(-scores[top_rows], kind="stable")][:COORDINATOR_TOP_K]
+    
+    # Materialize only the Top-K candidates
+    candidates = []
+    for i in ranked:
+        lot_info = rows[i]
+        sku = lot_info["sku"]
+        warehouse = lot_info["warehouse"]
+        eta_days = lot_info["eta_days"]
+        months_remaining = months[i]
         
-        lots = INVENTORY.get(sku, [])
+        candidate = SubstituteCandidate(
+            sku=sku,
+            product_name=lot_info["product_name"],
+            warehouse=warehouse,
+            country=lot_info["country"],
+            lot=lot_info["lot"],
+            stock=lot_info["stock"],
+            expiry=lot_info["expiry"],
+            cost_usd=lot_info["cost_usd"],
+            eta_days=eta_days,
+            score=float(scores[i]),
+            compliance_rules=[
+                f"Registered in {country}",
+                f"Shelf life: {months_remaining:.1f} months",
+                f"Stock: {lot_info['stock']} units"
+            ],
+            justification=f"ETA: {eta_days}d from {warehouse}. Cost: ${lot_info['cost_usd']:.2f}. Expires: {lot_info['expiry']}."
+        )
         
-        for lot_info in lots:
-            if lot_info["stock"] <= 0:
-                continue
-            
-            # Calculate shelf life
-            expiry_date = datetime.strptime(lot_info["expiry"], "%Y-%m-%d")
-            months_remaining = (expiry_date - datetime.now()).days / 30
-            
-            if months_remaining < min_shelf_life:
-                continue
-            
-            warehouse = lot_info["warehouse"]
-            eta_days = LOGISTICS_ETA.get((warehouse, country), 999)
-            
-            # Multi-criteria scoring
-            eta_score = max(0, 100 - eta_days * 5)
-            stock_score = min(100, lot_info["stock"] / 10)
-            shelf_life_score = min(100, months_remaining * 3)
-            cost_score = max(0, 100 - lot_info["cost_usd"] * 100)
-            
-            total_score = (
-                eta_score * 0.35 +
-                stock_score * 0.25 +
-                shelf_life_score * 0.25 +
-                cost_score * 0.15
-            )
-            
-            candidate = SubstituteCandidate(
-                sku=sku,
-                product_name=doc.page_content.split(" - ")[0],
-                warehouse=warehouse,
-                country=lot_info["country"],
-                lot=lot_info["lot"],
-                stock=lot_info["stock"],
-                expiry=lot_info["expiry"],
-                cost_usd=lot_info["cost_usd"],
-                eta_days=eta_days,
-                score=round(total_score, 2),
-                compliance_rules=[
-                    f"Registered in {country}",
-                    f"Shelf life: {months_remaining:.1f} months",
-                    f"Stock: {lot_info['stock']} units"
-                ],
-                justification=f"ETA: {eta_days}d from {warehouse}. Cost: ${lot_info['cost_usd']:.2f}. Expires: {lot_info['expiry']}."
-            )
-            
-            candidates.append(candidate)
-    
-    # Sort by score
-    candidates.sort(key=lambda x: x["score"], reverse=True)
+        candidates.append(candidate)
+    
     state["compliant_substitutes"] = candidates
     
-    # Use LLM for synthesis
-    summary = f"Found {len(candidates)} valid alternatives. "
+    # Templated synthesis (no LLM call)
+    summary = f"Found {len(valid_rows)} valid alternatives. "
     summary += f"Top 3: {', '.join([c['sku'] for c in candidates[:3]])}"
     
     state["coordinator_synthesis"] = summary
     
-    print(f"   ✓ {len(candidates)} valid candidates synthesized")
-    for i, c in enumerate(candidates[:3], 1):
-        print(f"      {i}. {c['sku']} - Score: {c['score']:.1f}")
-    print()
+    logger.info("   ✓ %d valid candidates synthesized", len(valid_rows))
+    if logger.isEnabledFor(logging.INFO):
+        for i, c in enumerate(candidates[:3], 1):
+            logger.info("      %d. %s - Score: %.1f", i, c["sku"], c["score"])
     
     return state
 
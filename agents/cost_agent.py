@@ -2,40 +2,54 @@
 Cost Agent - Analyzes costs and optimizes budget
 """
 
-from data import INVENTORY
+import logging
+from typing import Any, Dict
+import numpy as np
 from models import State
 
+logger = logging.getLogger(__name__)
 
-def cost_agent(state: State) -> State:
+# Number of cheapest options reported
+COST_TOP_K = 5
+
+
+def cost_agent(state: State) -> Dict[str, Any]:
     """
     COST AGENT: Analyzes costs and optimizes budget
+
+    Runs in parallel with the other specialized agents, so it returns only
+    the state key it owns.
     """
-    print(f"💰 COST AGENT: Analyzing costs")
+    logger.info("💰 COST AGENT: Analyzing costs")
     
-    cost_options = []
+    lots = state["lots_join"]
+    unit_costs = np.array([lot_info["cost_usd"] for lot_info in lots], dtype=np.float64)
+    totals = unit_costs * state["requested_quantity"]
     
-    for doc in state["catalog_candidates"]:
-        sku = doc.metadata.get("sku")
-        lots = INVENTORY.get(sku, [])
-        
-        for lot_info in lots:
-            if lot_info["stock"] > 0:
-                total_cost = lot_info["cost_usd"] * state["requested_quantity"]
-                cost_options.append({
-                    "sku": sku,
-                    "warehouse": lot_info["warehouse"],
-                    "unit_cost": lot_info["cost_usd"],
-                    "total_cost": total_cost
-                })
+    # Partial sort: only the K cheapest lots are ordered. Every lot tied with
+    # the K-th cost is kept so the stable sort matches a full sort's order.
+    if len(unit_costs) > COST_TOP_K:
+        kth_cost = np.partition(unit_costs, COST_TOP_K - 1)[COST_TOP_K - 1]
+        idx = np.flatnonzero(unit_costs <= kth_cost)
+    else:
+        idx = np.arange(len(unit_costs))
+    top_idx = idx[np.argsort(unit_costs[idx], kind="stable")][:COST_TOP_K]
     
-    # Sort by cost
-    cost_options.sort(key=lambda x: x["unit_cost"])
+    cost_options = [
+        {
+            "sku": lots[i]["sku"],
+            "warehouse": lots[i]["warehouse"],
+            "unit_cost": lots[i]["cost_usd"],
+            "total_cost": float(totals[i])
+        }
+        for i in top_idx
+    ]
     
-    state["cost_result"] = {
+    cost_result = {
         "cheapest_unit": cost_options[0]["unit_cost"] if cost_options else 0,
-        "options": cost_options[:5]
+        "options": cost_options
     }
     
-    print(f"   ✓ Lowest cost: ${state['cost_result']['cheapest_unit']:.2f}/unit\n")
-    return state
+    logger.info("   ✓ Lowest cost: $%.2f/unit", cost_result["cheapest_unit"])
+    return {"cost_result": cost_result}
 
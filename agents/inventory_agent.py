@@ -2,44 +2,43 @@
 Inventory Agent - Verifies stock availability
 """
 
-from data import INVENTORY
+import logging
+from typing import Any, Dict
 from models import State
 
+logger = logging.getLogger(__name__)
 
-def inventory_agent(state: State) -> State:
+
+def inventory_agent(state: State) -> Dict[str, Any]:
     """
     INVENTORY AGENT: Verifies stock availability
+
+    Runs in parallel with the other specialized agents, so it returns only
+    the state key it owns.
     """
-    print(f"📦 INVENTORY AGENT: Checking available stock")
+    logger.info("📦 INVENTORY AGENT: Checking available stock")
     
     country = state["requested_country"]
     strategy = state["strategy"]
     
-    available_inventory = []
-    
-    for doc in state["catalog_candidates"]:
-        sku = doc.metadata.get("sku")
-        lots = INVENTORY.get(sku, [])
-        
-        for lot_info in lots:
-            # In "fast" strategy, only consider local warehouses
-            if strategy == "fast" and lot_info["country"] != country:
-                continue
-            
-            if lot_info["stock"] > 0:
-                available_inventory.append({
-                    "sku": sku,
-                    "warehouse": lot_info["warehouse"],
-                    "stock": lot_info["stock"],
-                    "lot": lot_info["lot"],
-                    "expiry": lot_info["expiry"]
-                })
+    # In "fast" strategy, only consider local warehouses
+    available_inventory = [
+        {
+            "sku": lot_info["sku"],
+            "warehouse": lot_info["warehouse"],
+            "stock": lot_info["stock"],
+            "lot": lot_info["lot"],
+            "expiry": lot_info["expiry"]
+        }
+        for lot_info in state["lots_join"]
+        if strategy != "fast" or lot_info["country"] == country
+    ]
     
-    state["inventory_result"] = {
+    inventory_result = {
         "available_count": len(available_inventory),
         "inventory": available_inventory
     }
     
-    print(f"   ✓ {len(available_inventory)} lots with stock\n")
-    return state
+    logger.info("   ✓ %d lots with stock", len(available_inventory))
+    return {"inventory_result": inventory_result}
 
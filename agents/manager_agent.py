@@ -2,55 +2,130 @@
 Manager Agent - Analyzes request and decides optimal strategy
 """
 
+import logging
+import math
+from collections import OrderedDict
+from typing import Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from config import llm
 from models import State
 
+logger = logging.getLogger(__name__)
 
-def manager_agent(state: State) -> State:
+# Quantity from which the exhaustive (global) search is used
+EXHAUSTIVE_MIN_QUANTITY = 5000
+
+# Max number of cached strategy explanations (LRU)
+STRATEGY_CACHE_SIZE = 1024
+
+MANAGER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are a Manager Agent expert in pharmaceutical logistics. "
+     "The available strategies are: "
+     "'fast' (priority on speed, local warehouses only), "
+     "'balanced' (balance between cost/speed), or "
+     "'exhaustive' (exhaustive global search, including special imports)."),
+    ("user",
+     "Product: {item}\n"
+     "Country: {country}\n"
+     "Quantity: {quantity}\n"
+     "Urgency: {urgency}\n"
+     "Selected strategy: {strategy}\n\n"
+     "Briefly explain why this strategy fits the request.")
+])
+
+manager_chain = MANAGER_PROMPT | llm
+
+# (item, country, urgency, quantity bucket, strategy) -> explanation
+_strategy_cache: "OrderedDict[Tuple[str, str, str, int, str], str]" = OrderedDict()
+
+
+def _pick_strategy(urgency: str, quantity: int) -> str:
+    """
+    Rule table for the search strategy
+
+    Args:
+        urgency: Request urgency
+        quantity: Requested quantity
+
+    Returns:
+        "fast" for high/critical urgency, "exhaustive" for low urgency or
+        large orders, otherwise "balanced"
+    """
+    if urgency in ("high", "critical"):
+        return "fast"
+    if urgency == "low" or quantity >= EXHAUSTIVE_MIN_QUANTITY:
+        return "exhaustive"
+    return "balanced"
+
+
+def _quantity_bucket(quantity: int) -> int:
+    """Order of magnitude of the quantity (1-9 -> 0, 10-99 -> 1, ...)"""
+    return int(math.log10(max(quantity, 1)))
+
+
+async def _explain_strategy(item: str, country: str, urgency: str, quantity: int, strategy: str) -> Tuple[str, bool]:
+    """
+    Ask the LLM to justify the selected strategy, reusing explanations for similar requests
+
+    Args:
+        item: Requested product
+        country: Destination country code
+        urgency: Request urgency
+        quantity: Requested quantity (cached by order of magnitude)
+        strategy: Strategy chosen by the rule table
+
+    Returns:
+        Tuple of (explanation, cache_hit)
+    """
+    key = (item.strip().lower(), country, urgency, _quantity_bucket(quantity), strategy)
+    cached = _strategy_cache.get(key)
+    if cached is not None:
+        _strategy_cache.move_to_end(key)
+        return cached, True
+
+    response = (await manager_chain.ainvoke({
+        "item": item,
+        "country": country,
+        "quantity": quantity,
+        "urgency": urgency,
+        "strategy": strategy
+    })).content
+
+    _strategy_cache[key] = response
+    if len(_strategy_cache) > STRATEGY_CACHE_SIZE:
+        _strategy_cache.popitem(last=False)
+    return response, False
+
+
+async def manager_agent(state: State) -> State:
     """
     MANAGER AGENT: Analyzes request and decides optimal strategy
+
+    The strategy comes from a rule table; the LLM is only called when the
+    caller asked for an explanation (explain_strategy).
     """
-    print("=" * 80)
-    print("🎯 MANAGER AGENT: Analyzing request and defining strategy")
-    print("=" * 80)
-    
+    logger.info("🎯 MANAGER AGENT: Analyzing request and defining strategy")
+
     urgency = state.get("urgency", "medium")
     quantity = state["requested_quantity"]
-    
-    # Use LLM to decide strategy
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", 
-         "You are a Manager Agent expert in pharmaceutical logistics. "
-         "Analyze the request and decide the best strategy: "
-         "'fast' (priority on speed, local warehouses only), "
-         "'balanced' (balance between cost/speed), or "
-         "'exhaustive' (exhaustive global search, including special imports)."),
-        ("user", 
-         f"Product: {state['requested_item']}\n"
-         f"Country: {state['requested_country']}\n"
-         f"Quantity: {quantity}\n"
-         f"Urgency: {urgency}\n\n"
-         "Decide the strategy and briefly explain why.")
-    ])
-    
-    chain = prompt | llm
-    response = chain.invoke({}).content
-    
-    # Extract strategy from response
-    if "fast" in response.lower():
-        strategy = "fast"
-    elif "exhaustive" in response.lower():
-        strategy = "exhaustive"
-    else:
-        strategy = "balanced"
-    
+
+    strategy = _pick_strategy(urgency, quantity)
     state["strategy"] = strategy
-    
-    print(f"📊 Urgency: {urgency}")
-    print(f"🎯 Selected strategy: {strategy.upper()}")
-    print(f"💬 Reasoning: {response[:200]}...")
-    print()
-    
-    return state
 
+    logger.info("📊 Urgency: %s", urgency)
+    logger.info("🎯 Selected strategy: %s", strategy.upper())
+
+    if state.get("explain_strategy"):
+        # Cached per item/country/urgency/quantity magnitude/strategy
+        reasoning, cache_hit = await _explain_strategy(
+            state["requested_item"],
+            state["requested_country"],
+            urgency,
+            quantity,
+            strategy
+        )
+        state["strategy_reasoning"] = reasoning
+        logger.info("💬 Reasoning%s: %.200s...", " (cached)" if cache_hit else "", reasoning)
+
+    return state
@@ -2,57 +2,177 @@
 Recommendation Agent - Makes final decision with negotiation between criteria
 """
 
+import json
+import logging
+import re
+from operator import itemgetter
+from typing import Any, Dict
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.utils.json import parse_json_markdown
 from config import llm
 from models import State, AgentDecision
 
+logger = logging.getLogger(__name__)
 
-def recommendation_agent(state: State) -> State:
+RECOMMENDATION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are the RECOMMENDATION AGENT MEDIATOR and an expert in regulated pharmaceutical supplies. "
+     "Listen to the arguments from specialized agents and make the final decision. "
+     "You must balance: speed (Speed Agent), cost (Cost Agent), compliance (Compliance Agent). "
+     "Then write a professional executive report explaining the recommendations. "
+     "Respond with a single JSON object and nothing else."),
+    ("user",
+     "REQUEST:\n"
+     "Product: {item}\n"
+     "Country: {country}\n"
+     "Quantity: {quantity}\n"
+     "Urgency: {urgency}\n"
+     "Applied strategy: {strategy}\n\n"
+     "ALTERNATIVES:\n{candidates_text}\n\n"
+     "AGENT ARGUMENTS:\n{speed_advocate}\n{cost_advocate}\n{compliance_advocate}\n\n"
+     "ACTION: {suggested_action}\n\n"
+     "Return JSON with these keys, in this order:\n"
+     "- \"negotiation_summary\": which alternative you recommend as first option and why (2-3 sentences)\n"
+     "- \"top_choice_sku\": the SKU of that alternative\n"
+     "- \"executive_report\": an executive report of 3-4 paragraphs")
+])
+
+recommendation_chain = RECOMMENDATION_PROMPT | llm
+
+# Custom event carrying executive report text as it is generated
+REPORT_STREAM_EVENT = "final_report_delta"
+
+# Start of the executive report string value in the model's JSON answer
+_REPORT_START = re.compile(r'"executive_report"\s*:\s*"')
+
+# Chars kept when searching for _REPORT_START again (it may span chunks)
+_REPORT_START_LOOKBACK = 64
+
+# Longest run of complete JSON string content: plain chars and full escapes.
+# A high surrogate escape only matches together with its low surrogate, so
+# a pair split across chunks is held back until both halves arrived.
+_JSON_STRING_PART = re.compile(
+    r'(?:[^"\\]'
+    r'|\\["\\/bfnrt]'
+    r'|\\u[dD][89abAB][0-9a-fA-F]{2}\\u[0-9a-fA-F]{4}'
+    r'|\\u(?![dD][89abAB])[0-9a-fA-F]{4})*'
+)
+
+
+async def _generate_decision(prompt_values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the mediator/report prompt, streaming the executive report
+
+    Once the ``executive_report`` value has started, only the newly arrived
+    part of the string is decoded and dispatched as a REPORT_STREAM_EVENT
+    custom event; the whole answer is parsed once at the end.
+
+    Returns:
+        Parsed answer; if the model did not return JSON, the raw text is used
+        as the executive report
+    """
+    text = ""
+    streamed_report = ""
+    search_from = 0
+    report_pos = None  # Index in text up to which the report was decoded
+    report_done = False
+    async for chunk in recommendation_chain.astream(prompt_values):
+        if not isinstance(chunk.content, str):
+            continue
+        text += chunk.content
+        if report_done:
+            continue
+        if report_pos is None:
+            match = _REPORT_START.search(text, search_from)
+            if match is None:
+                search_from = max(0, len(text) - _REPORT_START_LOOKBACK)
+                continue
+            report_pos = match.end()
+        
+        part = _JSON_STRING_PART.match(text, report_pos)
+        if part.end() > report_pos:
+            delta = json.loads(f'"{part.group()}"', strict=False)
+            await adispatch_custom_event(REPORT_STREAM_EVENT, delta)
+            streamed_report += delta
+            report_pos = part.end()
+        # An unescaped quote closes the report string
+        report_done = text.startswith('"', report_pos)
+    
+    try:
+        decision = parse_json_markdown(text)
+    except Exception:
+        decision = None
+    if not isinstance(decision, dict) or not isinstance(decision.get("executive_report"), str):
+        logger.warning("⚠️  Recommendation LLM did not return the expected JSON, using raw text")
+        decision = {"negotiation_summary": "", "top_choice_sku": None, "executive_report": text}
+        if not streamed_report:
+            await adispatch_custom_event(REPORT_STREAM_EVENT, text)
+    return decision
+
+
+async def recommendation_agent(state: State) -> State:
     """
     RECOMMENDATION AGENT: Makes final decision considering "negotiation" between criteria
     """
-    print("=" * 80)
-    print("🤝 RECOMMENDATION AGENT: Negotiating final decision between criteria")
-    print("=" * 80)
+    logger.info("🤝 RECOMMENDATION AGENT: Negotiating final decision between criteria")
     
     if not state["compliant_substitutes"]:
         state["recommendations"] = []
         state["suggested_action"] = "WAIT_FOR_RESTOCK"
         state["final_report"] = "No substitutes found that meet regulatory and availability requirements."
-        print("   ❌ No recommendations possible\n")
+        logger.info("   ❌ No recommendations possible")
         return state
     
     # Simulate "negotiation" between agents using LLM
     top_candidates = state["compliant_substitutes"][:5]
+    cheapest = min(top_candidates, key=itemgetter("cost_usd"))
+    cheapest_cost = cheapest["cost_usd"]
     
     # Prepare arguments from each "specialist agent"
     speed_advocate = f"SPEED AGENT: Recommends {top_candidates[0]['sku']} for ETA of {top_candidates[0]['eta_days']} days"
-    cost_advocate = f"COST AGENT: Recommends cheapest option (${min([c['cost_usd'] for c in top_candidates]):.2f}/unit)"
+    cost_advocate = f"COST AGENT: Recommends cheapest option (${cheapest_cost:.2f}/unit)"
     compliance_advocate = f"COMPLIANCE AGENT: All candidates are compliant: {', '.join([c['sku'] for c in top_candidates[:3]])}"
     
-    # LLM acts as mediator
-    prompt = ChatPromptTemplate.from_messages([
-        ("system",
-         "You are the RECOMMENDATION AGENT MEDIATOR. "
-         "Listen to the arguments from specialized agents and make the final decision. "
-         "You must balance: speed (Speed Agent), cost (Cost Agent), compliance (Compliance Agent). "
-         f"The request urgency is: {state['urgency']}. "
-         f"The chosen strategy was: {state['strategy']}. "
-         "Decide the Top-3 and explain your reasoning in 2-3 sentences."),
-        ("user",
-         f"{speed_advocate}\n{cost_advocate}\n{compliance_advocate}\n\n"
-         f"Available candidates:\n" +
-         "\n".join([f"- {c['sku']}: Score={c['score']:.1f}, ETA={c['eta_days']}d, Cost=${c['cost_usd']:.2f}" 
-                    for c in top_candidates[:3]]) +
-         "\n\nWhich do you recommend as first option and why?")
+    # Top-3
+    recommendations = top_candidates[:3]
+    
+    # Determine action
+    if len(recommendations) == 1:
+        suggested_action = "SUBSTITUTE"
+    else:
+        warehouses = set(r["warehouse"] for r in recommendations)
+        suggested_action = "SPLIT_WAREHOUSE" if len(warehouses) > 1 else "SUBSTITUTE"
+    
+    # One LLM call acts as mediator and writes the executive report
+    candidates_text = "\n".join([
+        f"{i+1}. {r['sku']} - {r['product_name']}\n"
+        f"   Score: {r['score']:.1f}/100\n"
+        f"   {r['justification']}\n"
+        f"   Compliance: {', '.join(r['compliance_rules'])}"
+        for i, r in enumerate(recommendations)
     ])
     
-    chain = prompt | llm
-    negotiation_result = chain.invoke({}).content
+    decision = await _generate_decision({
+        "item": state["requested_item"],
+        "country": state["requested_country"],
+        "quantity": state["requested_quantity"],
+        "urgency": state["urgency"],
+        "strategy": state["strategy"],
+        "speed_advocate": speed_advocate,
+        "cost_advocate": cost_advocate,
+        "compliance_advocate": compliance_advocate,
+        "candidates_text": candidates_text,
+        "suggested_action": suggested_action
+    })
+    negotiation_result = decision.get("negotiation_summary") or ""
     
-    print(f"💬 Negotiation between agents:")
-    print(f"   {negotiation_result[:150]}...")
-    print()
+    logger.info("💬 Negotiation between agents: %.150s...", negotiation_result)
+    
+    # The mediator's pick is only trusted if it is one of the recommendations
+    top_choice_sku = decision.get("top_choice_sku")
+    if top_choice_sku not in {r["sku"] for r in recommendations}:
+        top_choice_sku = recommendations[0]["sku"]
     
     # Generate agent decisions
     state["agent_decisions"] = [
@@ -64,8 +184,8 @@ def recommendation_agent(state: State) -> State:
         ),
         AgentDecision(
             agent_name="Cost Agent",
-            decision=min(top_candidates, key=lambda x: x["cost_usd"])["sku"],
-            priority_score=100.0 - min([c["cost_usd"] for c in top_candidates]) * 100,
+            decision=cheapest["sku"],
+            priority_score=100.0 - cheapest_cost * 100,
             reasoning="Minimize total cost"
         ),
         AgentDecision(
@@ -73,50 +193,22 @@ def recommendation_agent(state: State) -> State:
             decision=top_candidates[0]["sku"],
             priority_score=100.0,
             reasoning="All candidates comply with regulations"
+        ),
+        AgentDecision(
+            agent_name="Recommendation Agent",
+            decision=top_choice_sku,
+            priority_score=100.0,
+            reasoning=negotiation_result
         )
     ]
     
-    # Top-3
-    state["recommendations"] = top_candidates[:3]
-    
-    # Determine action
-    if len(state["recommendations"]) == 1:
-        state["suggested_action"] = "SUBSTITUTE"
-    else:
-        warehouses = set(r["warehouse"] for r in state["recommendations"])
-        state["suggested_action"] = "SPLIT_WAREHOUSE" if len(warehouses) > 1 else "SUBSTITUTE"
-    
-    # Final executive report
-    candidates_text = "\n".join([
-        f"{i+1}. {r['sku']} - {r['product_name']}\n"
-        f"   Score: {r['score']:.1f}/100\n"
-        f"   {r['justification']}\n"
-        f"   Compliance: {', '.join(r['compliance_rules'])}"
-        for i, r in enumerate(state["recommendations"])
-    ])
-    
-    report_prompt = ChatPromptTemplate.from_messages([
-        ("system", 
-         "You are an expert assistant in regulated pharmaceutical supplies. "
-         "Generate a professional executive report explaining the recommendations."),
-        ("user", 
-         f"REQUEST:\n"
-         f"Product: {state['requested_item']}\n"
-         f"Country: {state['requested_country']}\n"
-         f"Quantity: {state['requested_quantity']}\n"
-         f"Urgency: {state['urgency']}\n"
-         f"Applied strategy: {state['strategy']}\n\n"
-         f"ALTERNATIVES:\n{candidates_text}\n\n"
-         f"AGENT ANALYSIS:\n{negotiation_result}\n\n"
-         f"ACTION: {state['suggested_action']}\n\n"
-         "Generate an executive report of 3-4 paragraphs.")
-    ])
-    
-    report = (report_prompt | llm).invoke({}).content
-    state["final_report"] = report
+    state["recommendations"] = recommendations
+    state["suggested_action"] = suggested_action
+    state["negotiation_summary"] = negotiation_result
+    state["final_report"] = decision["executive_report"]
     
-    print(f"   ✅ Final decision: {state['suggested_action']}")
-    print(f"   ✅ Top recommendation: {state['recommendations'][0]['sku']}\n")
+    logger.info("   ✅ Final decision: %s", state["suggested_action"])
+    logger.info("   ✅ Top recommendation: %s", state["recommendations"][0]["sku"])
     
     return state
 
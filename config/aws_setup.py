@@ -4,21 +4,32 @@ LLM and Embeddings setup for the multi-agent system
 """
 
 import boto3
+from botocore.config import Config
 from langchain_aws import ChatBedrock, BedrockEmbeddings
 
 # Initialize AWS session
 session = boto3.Session()
 
+# Bedrock runtime client shared by the LLM and embeddings. The pool is sized
+# for the parallel agent fan-out across concurrent requests (botocore's default
+# is 10 connections); adaptive retries back off on throttling.
+bedrock_config = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+bedrock_client = session.client("bedrock-runtime", config=bedrock_config)
+
 # Configure LLM (Language Model)
 llm = ChatBedrock(
     model_id="us.amazon.nova-micro-v1:0",
-    client=session.client("bedrock-runtime"),
+    client=bedrock_client,
     temperature=0.2,
 )
 
 # Configure Embeddings
 embeddings = BedrockEmbeddings(
     model_id="amazon.titan-embed-text-v2:0",
-    client=session.client("bedrock-runtime")
+    client=bedrock_client
 )
 
@@ -1,14 +1,22 @@
-from .catalog import catalog_docs, vectorstore, search_catalog
-from .inventory import INVENTORY
-from .regulations import REGULATIONS
-from .logistics import LOGISTICS_ETA
+from .catalog import catalog_docs, vectorstore, search_catalog, refresh_vectorstore, search_cache, catalog_lock
+from .inventory import INVENTORY, IN_STOCK_LOTS
+from .regulations import REGULATIONS, REGISTERED_SETS
+from .logistics import LOGISTICS_ETA, ETA_MATRIX, W_IDX, C_IDX
 
 __all__ = [
     "catalog_docs",
     "vectorstore",
     "search_catalog",
+    "refresh_vectorstore",
+    "search_cache",
+    "catalog_lock",
     "INVENTORY",
+    "IN_STOCK_LOTS",
     "REGULATIONS",
+    "REGISTERED_SETS",
     "LOGISTICS_ETA",
+    "ETA_MATRIX",
+    "W_IDX",
+    "C_IDX",
 ]
 
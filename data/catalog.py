@@ -2,43 +2,268 @@
 Master Catalog - Pharmaceutical/medical products with metadata
 """
 
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from config import embeddings
 
+try:
+    from langchain_classic.embeddings import CacheBackedEmbeddings
+    from langchain_classic.storage import LocalFileStore
+except ImportError:  # langchain < 1.0
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
+
+logger = logging.getLogger(__name__)
+
+# On-disk caches so process start does not re-embed the catalog
+EMBEDDINGS_CACHE_DIR = os.environ.get("EMBEDDINGS_CACHE_DIR", "./embeddings_cache")
+FAISS_INDEX_DIR = os.environ.get("FAISS_INDEX_DIR", "./faiss_index")
+
+# Names of the per-fingerprint index directories under FAISS_INDEX_DIR
+_FINGERPRINT_DIR = re.compile(r"[0-9a-f]{16}")
+
+# Semantic cache settings for catalog searches
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_TTL_HOURS = 24
+SEMANTIC_CACHE_MAX_ENTRIES = 1024
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
 # Master catalog of pharmaceutical products
 catalog_docs = [
     Document(
         page_content="Paracetamol 500mg - ATC Code: N02BE01 - Analgesic/Antipyretic - Cold chain: NO - Shelf life: 36 months - Packaging: Blister x30",
-        metadata={"sku": "PARA-500", "atc": "N02BE01", "cold_chain": False, "shelf_life_months": 36}
+        metadata={"sku": "PARA-500", "product_name": "Paracetamol 500mg", "atc": "N02BE01", "cold_chain": False, "shelf_life_months": 36}
     ),
     Document(
         page_content="Ibuprofen 400mg - ATC Code: M01AE01 - Anti-inflammatory - Cold chain: NO - Shelf life: 24 months - Packaging: Blister x20",
-        metadata={"sku": "IBU-400", "atc": "M01AE01", "cold_chain": False, "shelf_life_months": 24}
+        metadata={"sku": "IBU-400", "product_name": "Ibuprofen 400mg", "atc": "M01AE01", "cold_chain": False, "shelf_life_months": 24}
     ),
     Document(
         page_content="Amoxicillin 500mg - ATC Code: J01CA04 - Antibiotic - Cold chain: NO - Shelf life: 24 months - Packaging: Blister x21",
-        metadata={"sku": "AMOX-500", "atc": "J01CA04", "cold_chain": False, "shelf_life_months": 24}
+        metadata={"sku": "AMOX-500", "product_name": "Amoxicillin 500mg", "atc": "J01CA04", "cold_chain": False, "shelf_life_months": 24}
     ),
     Document(
         page_content="Insulin Glargine 100UI/ml - ATC Code: A10AE04 - Antidiabetic - Cold chain: YES (2-8°C) - Shelf life: 30 months - Packaging: 3ml Cartridge",
-        metadata={"sku": "INSUL-GLAR", "atc": "A10AE04", "cold_chain": True, "shelf_life_months": 30}
+        metadata={"sku": "INSUL-GLAR", "product_name": "Insulin Glargine 100UI/ml", "atc": "A10AE04", "cold_chain": True, "shelf_life_months": 30}
     ),
     Document(
         page_content="Omeprazole 20mg - ATC Code: A02BC01 - Proton pump inhibitor - Cold chain: NO - Shelf life: 36 months - Packaging: Blister x28",
-        metadata={"sku": "OMEP-20", "atc": "A02BC01", "cold_chain": False, "shelf_life_months": 36}
+        metadata={"sku": "OMEP-20", "product_name": "Omeprazole 20mg", "atc": "A02BC01", "cold_chain": False, "shelf_life_months": 36}
     ),
     Document(
         page_content="Losartan 50mg - ATC Code: C09CA01 - Antihypertensive - Cold chain: NO - Shelf life: 24 months - Packaging: Blister x30",
-        metadata={"sku": "LOSAR-50", "atc": "C09CA01", "cold_chain": False, "shelf_life_months": 24}
+        metadata={"sku": "LOSAR-50", "product_name": "Losartan 50mg", "atc": "C09CA01", "cold_chain": False, "shelf_life_months": 24}
     ),
 ]
 
+# Serializes catalog changes: append, index rebuild and vectorstore rebind
+catalog_lock = threading.RLock()
+
+# Document embeddings are cached on disk, keyed by model and text
+cached_embeddings = CacheBackedEmbeddings.from_bytes_store(
+    embeddings,
+    LocalFileStore(EMBEDDINGS_CACHE_DIR),
+    namespace=getattr(embeddings, "model_id", None) or "titan-v2"
+)
+
+
+def _catalog_fingerprint(docs: List[Document]) -> str:
+    """Hash of the catalog contents, used to name the persisted index"""
+    payload = json.dumps(
+        [[doc.page_content, doc.metadata] for doc in docs],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _prune_old_indexes(keep: str) -> None:
+    """Delete persisted indexes of other catalog versions; only the current one is ever loaded"""
+    try:
+        names = os.listdir(FAISS_INDEX_DIR)
+    except OSError:
+        return
+    for name in names:
+        if name != keep and _FINGERPRINT_DIR.fullmatch(name):
+            shutil.rmtree(os.path.join(FAISS_INDEX_DIR, name), ignore_errors=True)
+
+
+def _build_vectorstore(docs: List[Document]) -> FAISS:
+    """
+    Load the FAISS index for this catalog from disk, or build and persist it
+
+    Args:
+        docs: Catalog documents to index
+
+    Returns:
+        FAISS vector store over ``docs``
+    """
+    fingerprint = _catalog_fingerprint(docs)
+    index_path = os.path.join(FAISS_INDEX_DIR, fingerprint)
+    if os.path.exists(os.path.join(index_path, "index.faiss")):
+        try:
+            # The index is written by this service only, so unpickling the docstore is safe
+            return FAISS.load_local(index_path, cached_embeddings, allow_dangerous_deserialization=True)
+        except Exception as e:
+            logger.warning("⚠️  Could not load FAISS index from %s, rebuilding: %s", index_path, e)
+
+    # One embed_documents call for the whole catalog; cached texts are not re-embedded
+    texts = [doc.page_content for doc in docs]
+    vectors = cached_embeddings.embed_documents(texts)
+    store = FAISS.from_embeddings(
+        list(zip(texts, vectors)),
+        cached_embeddings,
+        metadatas=[doc.metadata for doc in docs]
+    )
+    try:
+        store.save_local(index_path)
+    except OSError as e:
+        logger.warning("⚠️  Could not persist FAISS index to %s: %s", index_path, e)
+    else:
+        _prune_old_indexes(keep=fingerprint)
+    return store
+
+
 # Initialize vector store with embeddings
-vectorstore = FAISS.from_documents(catalog_docs, embeddings)
+vectorstore = _build_vectorstore(catalog_docs)
+
+
+class SemanticCache:
+    """
+    Cache of catalog search results keyed on the query embedding.
+
+    A query whose embedding has cosine similarity >= ``similarity_threshold``
+    with a cached query (searched with the same ``k``) reuses its results,
+    skipping the FAISS search. Entries expire after ``ttl_hours``.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl_hours: float = SEMANTIC_CACHE_TTL_HOURS,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Bumped by clear(); results of searches started before it are not stored
+        self.generation = 0
+        # k -> (index of past query vectors, [(created_at, docs)] aligned with the index)
+        self._buckets: Dict[int, Tuple[faiss.IndexFlatIP, List[Tuple[float, List[Document]]]]] = {}
+
+    def get(self, q_vec: np.ndarray, k: int):
+        """
+        Return cached documents for a similar query, or None on a miss
+
+        Args:
+            q_vec: Normalized query embedding, shape (1, dim)
+            k: Number of results the query asked for
+        """
+        with self._lock:
+            bucket = self._buckets.get(k)
+            if bucket is None or bucket[0].ntotal == 0:
+                return None
+            index, entries = bucket
+            scores, ids = index.search(q_vec, 1)
+            qid = int(ids[0][0])
+            if qid < 0 or scores[0][0] < self.similarity_threshold:
+                return None
+            created_at, docs = entries[qid]
+            if time.time() - created_at > self.ttl_seconds:
+                return None
+            return list(docs)
+
+    def put(self, q_vec: np.ndarray, k: int, docs: List[Document], generation: int = None) -> None:
+        """
+        Store the results of a query
+
+        Args:
+            generation: Value of ``generation`` when the search started; the
+                results are dropped if the cache was cleared since
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if k not in self._buckets:
+                self._buckets[k] = (faiss.IndexFlatIP(q_vec.shape[1]), [])
+            index, entries = self._buckets[k]
+            if len(entries) >= self.max_entries:
+                index, entries = self._compact(index, entries)
+                self._buckets[k] = (index, entries)
+            index.add(q_vec)
+            entries.append((time.time(), list(docs)))
+
+    def _compact(self, index: faiss.IndexFlatIP, entries: List[Tuple[float, List[Document]]]):
+        """Drop expired entries (or the oldest half) and rebuild the index"""
+        now = time.time()
+        keep = [i for i, (created_at, _) in enumerate(entries) if now - created_at <= self.ttl_seconds]
+        if len(keep) >= self.max_entries:
+            keep = keep[len(keep) // 2:]
+        new_index = faiss.IndexFlatIP(index.d)
+        if keep:
+            new_index.add(index.reconstruct_batch(np.asarray(keep, dtype=np.int64)))
+        return new_index, [entries[i] for i in keep]
+
+    def clear(self) -> None:
+        """Drop every cached result (e.g. after the catalog changes)"""
+        with self._lock:
+            self._buckets.clear()
+            self.generation += 1
+
+
+search_cache = SemanticCache()
+
+
+@lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+def _embed_query(query: str) -> Tuple[List[float], np.ndarray]:
+    """
+    Embed a query; identical repeats skip the embeddings call
+
+    Returns:
+        The raw embedding and its L2-normalized copy (read-only) for the cache
+    """
+    embedding = embeddings.embed_query(query)
+    q_vec = np.asarray([embedding], dtype=np.float32)
+    faiss.normalize_L2(q_vec)
+    q_vec.flags.writeable = False
+    return embedding, q_vec
 
 
 def search_catalog(query: str, k: int = 5):
     """Search for similar products in catalog using embeddings"""
-    return vectorstore.similarity_search(query, k=k)
+    embedding, q_vec = _embed_query(query)
+    generation = search_cache.generation
+    docs = search_cache.get(q_vec, k)
+    if docs is None:
+        docs = vectorstore.similarity_search_by_vector(embedding, k=k)
+        search_cache.put(q_vec, k, docs, generation=generation)
+    return docs
+
+
+def refresh_vectorstore():
+    """
+    Rebuild the vector store from catalog_docs and invalidate cached searches
+
+    Returns:
+        The new FAISS vector store
+    """
+    global vectorstore
+    with catalog_lock:
+        vectorstore = _build_vectorstore(catalog_docs)
+        search_cache.clear()
+        return vectorstore
 
@@ -3,6 +3,8 @@ Simulated Inventory Data
 Inventory by warehouse/lot/country
 """
 
+from datetime import datetime
+
 INVENTORY = {
     "PARA-500": [
         {"warehouse": "BOG-01", "country": "CO", "lot": "L2024-001", "stock": 1500, "expiry": "2026-12-01", "cost_usd": 0.15},
@@ -25,3 +27,13 @@ INVENTORY = {
     ],
 }
 
+
+# Lots with stock > 0 per SKU, with the expiry date parsed once at import
+IN_STOCK_LOTS = {
+    sku: tuple(
+        {**lot, "expiry_dt": datetime.strptime(lot["expiry"], "%Y-%m-%d")}
+        for lot in lots
+        if lot["stock"] > 0
+    )
+    for sku, lots in INVENTORY.items()
+}
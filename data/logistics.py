@@ -3,6 +3,8 @@ Logistics and ETA Data
 ETA (days) between warehouses and destination
 """
 
+import numpy as np
+
 LOGISTICS_ETA = {
     ("BOG-01", "CO"): 2,
     ("LIM-01", "PE"): 2,
@@ -13,3 +15,16 @@ LOGISTICS_ETA = {
     ("MEX-01", "PE"): 12,
 }
 
+
+# Dense ETA lookup: ETA_MATRIX[W_IDX[warehouse], C_IDX[country]].
+# The extra last row/column is all 999, so unknown warehouses or countries
+# can use index -1.
+WAREHOUSES = sorted({warehouse for warehouse, _ in LOGISTICS_ETA})
+COUNTRIES = sorted({country for _, country in LOGISTICS_ETA})
+W_IDX = {warehouse: i for i, warehouse in enumerate(WAREHOUSES)}
+C_IDX = {country: i for i, country in enumerate(COUNTRIES)}
+
+ETA_MATRIX = np.full((len(WAREHOUSES) + 1, len(COUNTRIES) + 1), 999, dtype=np.int16)
+for (warehouse, country), eta_days in LOGISTICS_ETA.items():
+    ETA_MATRIX[W_IDX[warehouse], C_IDX[country]] = eta_days
+ETA_MATRIX.flags.writeable = False
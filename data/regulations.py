@@ -20,3 +20,9 @@ REGULATIONS = {
     },
 }
 
+
+# Registered SKUs per country as sets for O(1) membership checks
+REGISTERED_SETS = {
+    country: frozenset(rules["registered_skus"])
+    for country, rules in REGULATIONS.items()
+}
@@ -2,6 +2,7 @@
 Multi-Agent Orchestrator System using LangGraph
 """
 
+import logging
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 
@@ -18,6 +19,8 @@ from agents import (
 )
 from observability.agent_wrapper import with_observability
 
+logger = logging.getLogger(__name__)
+
 # Wrap agents with observability tracking
 manager_agent_wrapped = with_observability("manager_agent")(manager_agent)
 catalog_search_wrapped = with_observability("catalog_search")(catalog_search_node)
@@ -38,7 +41,7 @@ graph.add_node("manager", manager_agent_wrapped)
 # 2. Catalog search (with observability)
 graph.add_node("catalog_search", catalog_search_wrapped)
 
-# 3. SPECIALIZED AGENTS - Execute sequentially (with observability)
+# 3. SPECIALIZED AGENTS - Execute in parallel (with observability)
 graph.add_node("compliance_agent", compliance_agent_wrapped)
 graph.add_node("inventory_agent", inventory_agent_wrapped)
 graph.add_node("logistics_agent", logistics_agent_wrapped)
@@ -53,15 +56,15 @@ graph.add_node("recommendation", recommendation_agent_wrapped)
 # Graph connections
 graph.add_edge("manager", "catalog_search")
 
-# After catalog_search, execute specialized agents sequentially
-# (This avoids convergence issues in LangGraph)
-graph.add_edge("catalog_search", "compliance_agent")
-graph.add_edge("compliance_agent", "inventory_agent")
-graph.add_edge("inventory_agent", "logistics_agent")
-graph.add_edge("logistics_agent", "cost_agent")
+# After catalog_search, fan out to the specialized agents. They only read
+# catalog_candidates and each writes its own result key, so they can run
+# concurrently without conflicting state updates.
+SPECIALIST_NODES = ["compliance_agent", "inventory_agent", "logistics_agent", "cost_agent"]
+for node in SPECIALIST_NODES:
+    graph.add_edge("catalog_search", node)
 
-# Cost agent (last agent) passes to coordinator
-graph.add_edge("cost_agent", "coordinator")
+# Fan in: coordinator waits for all specialized agents to finish
+graph.add_edge(SPECIALIST_NODES, "coordinator")
 
 # Coordinator passes to recommendation
 graph.add_edge("coordinator", "recommendation")
@@ -73,6 +76,6 @@ graph.add_edge("recommendation", END)
 memory = MemorySaver()
 app = graph.compile(checkpointer=memory)
 
-print("✅ Multi-Agent System Graph compiled successfully!")
-print("   Architecture: Manager → Catalog → Compliance → Inventory → Logistics → Cost → Coordinator → Recommendation")
+logger.info("✅ Multi-Agent System Graph compiled successfully!")
+logger.info("   Architecture: Manager → Catalog → [Compliance | Inventory | Logistics | Cost] → Coordinator → Recommendation")
 
@@ -3,34 +3,121 @@ Multi-Agent Regulated Substitute Recommender System - REST API
 FastAPI service for pharmaceutical substitute recommendations
 """
 
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional, Dict, Any, Tuple
 import uvicorn
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
+import asyncio
+import hashlib
+import logging
 import os
+import time
+import numpy as np
+import orjson
 
-from services import add_product_to_catalog, bulk_add_products, recommend_substitute
+class ORJSONLogFormatter(logging.Formatter):
+    """One JSON object per log line, serialized with orjson (LOG_FORMAT=json)"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+JSON_LOGS = os.environ.get("LOG_FORMAT", "").lower() == "json"
+
+_log_handler = logging.StreamHandler()
+if JSON_LOGS:
+    _log_handler.setFormatter(ORJSONLogFormatter())
+
+# Agent/service progress is logged at INFO; set LOG_LEVEL=WARNING in production
+logging.basicConfig(
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    handlers=[_log_handler]
+)
+
+from services import add_product_to_catalog, bulk_add_products, arecommend_substitute, astream_recommendation
 from observability.middleware import get_observability_middleware
 
 # Import CloudWatch dashboard manager
 try:
-    from observability.cloudwatch_dashboard import CloudWatchDashboard, setup_cloudwatch_observability
+    from observability.cloudwatch_dashboard import setup_cloudwatch_observability
     CLOUDWATCH_AVAILABLE = True
 except ImportError:
     CLOUDWATCH_AVAILABLE = False
 
+# OpenAPI schema and docs are only served outside production (ENV=prod)
+IS_PROD = os.environ.get("ENV", "").lower() == "prod"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the OpenAPI schema at startup so the first /docs hit doesn't pay for it"""
+    if app.openapi_url:
+        app.openapi()
+    yield
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Multi-Agent Pharmaceutical Substitute Recommender",
     description="REST API for intelligent pharmaceutical substitute recommendations using multi-agent AI system",
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
+    openapi_url=None if IS_PROD else "/openapi.json",
+    docs_url=None if IS_PROD else "/docs",
+    redoc_url=None if IS_PROD else "/redoc",
+    lifespan=lifespan
 )
 
+# Compress large JSON bodies (observability listings, reports).
+# Starlette skips text/event-stream, so SSE frames are not buffered.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson can't serialize natively (numpy scalars/arrays it rejects, sets)"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes with orjson, including numpy values"""
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson
+    
+    Used for endpoints that return plain dicts. Endpoints with a response_model
+    keep FastAPI's default class, which serializes straight to bytes with
+    Pydantic (FastAPI's own ORJSONResponse is deprecated for that reason).
+    Numpy values (e.g. from the drift detector) are serialized natively.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
 
 # ============================================================
 # REQUEST/RESPONSE MODELS
@@ -38,64 +125,53 @@ app = FastAPI(
 
 class ProductRequest(BaseModel):
     """Request model for adding a single product"""
-    product_description: str = Field(..., description="Full product description")
-    sku: str = Field(..., description="Stock Keeping Unit identifier")
-    atc_code: str = Field(..., description="Anatomical Therapeutic Chemical code")
+    product_description: str = Field(
+        ...,
+        description="Full product description",
+        examples=["Atorvastatin 20mg - ATC Code: C10AA05 - Lipid-lowering agent - Cold chain: NO - Shelf life: 24 months"]
+    )
+    sku: str = Field(..., description="Stock Keeping Unit identifier", examples=["ATOR-20"])
+    atc_code: str = Field(..., description="Anatomical Therapeutic Chemical code", examples=["C10AA05"])
     cold_chain: bool = Field(default=False, description="Requires cold chain storage")
     shelf_life_months: int = Field(default=24, description="Shelf life in months")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "product_description": "Atorvastatin 20mg - ATC Code: C10AA05 - Lipid-lowering agent - Cold chain: NO - Shelf life: 24 months",
-                "sku": "ATOR-20",
-                "atc_code": "C10AA05",
-                "cold_chain": False,
-                "shelf_life_months": 24
-            }
-        }
+
+class ProductItem(BaseModel):
+    """One product in a bulk upload (keys match services.bulk_add_products)"""
+    description: str = Field(
+        ...,
+        description="Full product description",
+        examples=["Metformin 850mg - ATC Code: A10BA02 - Oral antidiabetic"]
+    )
+    sku: str = Field(..., description="Stock Keeping Unit identifier", examples=["METF-850"])
+    atc: str = Field(..., description="Anatomical Therapeutic Chemical code", examples=["A10BA02"])
+    cold_chain: bool = Field(default=False, description="Requires cold chain storage")
+    shelf_life_months: int = Field(default=24, description="Shelf life in months", examples=[36])
 
 
 class BulkProductRequest(BaseModel):
     """Request model for adding multiple products"""
-    products: List[Dict[str, Any]] = Field(..., description="List of products to add")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "products": [
-                    {
-                        "description": "Metformin 850mg - ATC Code: A10BA02 - Oral antidiabetic",
-                        "sku": "METF-850",
-                        "atc": "A10BA02",
-                        "cold_chain": False,
-                        "shelf_life_months": 36
-                    }
-                ]
-            }
-        }
+    products: List[ProductItem] = Field(..., description="List of products to add")
+
+
+Urgency = Literal["low", "medium", "high", "critical"]
 
 
 class RecommendationRequest(BaseModel):
     """Request model for substitute recommendations"""
-    requested_item: str = Field(..., description="Name of the unavailable product")
-    country: str = Field(..., description="Destination country code (CO, PE, MX, etc.)")
-    quantity: int = Field(default=100, description="Required quantity", ge=1)
-    urgency: str = Field(default="medium", description="Urgency level: low, medium, high, or critical")
+    requested_item: str = Field(..., description="Name of the unavailable product", examples=["Aspirin 500mg for headache"])
+    country: str = Field(..., description="Destination country code (CO, PE, MX, etc.)", examples=["CO"])
+    quantity: int = Field(default=100, description="Required quantity", ge=1, examples=[200])
+    urgency: Urgency = Field(default="medium", description="Urgency level: low, medium, high, or critical", examples=["high"])
     enable_observability: bool = Field(default=True, description="Enable observability tracking")
     enable_ai_analysis: bool = Field(default=False, description="Enable AI analysis of outputs (more expensive)")
+    explain_strategy: bool = Field(default=False, description="Ask the LLM to justify the selected strategy (adds one LLM call)")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "requested_item": "Aspirin 500mg for headache",
-                "country": "CO",
-                "quantity": 200,
-                "urgency": "high",
-                "enable_observability": True,
-                "enable_ai_analysis": False
-            }
-        }
+    @field_validator("urgency", mode="before")
+    @classmethod
+    def _lowercase_urgency(cls, v: Any) -> Any:
+        """Accept urgency in any case ("HIGH", "High", ...)"""
+        return v.lower() if isinstance(v, str) else v
 
 
 class ProductResponse(BaseModel):
@@ -130,6 +206,7 @@ class RecommendationResponse(BaseModel):
     quantity: int
     urgency: str
     strategy: str
+    strategy_reasoning: Optional[str] = None
     recommendations: List[SubstituteCandidateResponse]
     suggested_action: str
     final_report: str
@@ -137,47 +214,109 @@ class RecommendationResponse(BaseModel):
     observability: Optional[Dict[str, Any]] = None
 
 
+# ============================================================
+# ERROR HANDLING
+# ============================================================
+
+# Endpoint function name -> prefix of the 500 error detail
+_ERROR_MESSAGES: Dict[str, str] = {
+    "create_product": "Failed to add product",
+    "get_recommendations": "Recommendation system error",
+    "get_observability_summary": "Failed to retrieve observability summary",
+    "get_recent_metrics": "Failed to retrieve metrics",
+    "get_metrics_by_id": "Failed to retrieve metrics",
+    "get_drift_alerts": "Failed to retrieve drift alerts",
+    "get_drift_history": "Failed to retrieve drift history",
+    "get_recent_analyses": "Failed to retrieve analyses",
+    "set_drift_baseline": "Failed to set baseline",
+    "setup_cloudwatch": "Failed to setup CloudWatch",
+    "test_cloudwatch": "CloudWatch connection test failed",
+    "cloudwatch_status": "Failed to get CloudWatch status",
+}
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """
+    Turn any unexpected endpoint error into a 500 with an endpoint-specific message
+    
+    HTTPException and validation errors keep FastAPI's own handlers; endpoints
+    only raise HTTPException for expected client errors.
+    """
+    endpoint = getattr(request.scope.get("endpoint"), "__name__", "")
+    prefix = _ERROR_MESSAGES.get(endpoint, "Internal server error")
+    return ORJSONResponse(
+        {"detail": f"{prefix}: {str(exc)}"},
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+    )
+
+
 # ============================================================
 # API ENDPOINTS
 # ============================================================
 
-@app.get("/", tags=["Root"])
+# Static part of the root response; only the timestamp changes per request
+_ROOT_INFO: Dict[str, Any] = {
+    "service": "Multi-Agent Pharmaceutical Substitute Recommender",
+    "version": "1.0.0",
+    "status": "operational",
+    "timestamp": None,
+    "endpoints": {
+        "health": "/health",
+        "docs": "/docs",
+        "add_product": "POST /api/v1/products",
+        "bulk_add_products": "POST /api/v1/products/bulk",
+        "get_recommendations": "POST /api/v1/recommendations",
+        "stream_recommendations": "POST /api/v1/recommendations/stream",
+        "observability_summary": "GET /api/v1/observability/summary",
+        "observability_metrics": "GET /api/v1/observability/metrics/recent",
+        "drift_alerts": "GET /api/v1/observability/drift/alerts",
+        "cloudwatch_setup": "POST /api/v1/observability/cloudwatch/setup",
+        "cloudwatch_test": "GET /api/v1/observability/cloudwatch/test"
+    },
+    "features": {
+        "multi_agent_system": True,
+        "observability": True,
+        "ai_analysis": True,
+        "drift_detection": True
+    }
+}
+
+# [epoch seconds when formatted, ISO timestamp]
+_TS_CACHE: List[Any] = [0.0, ""]
+
+
+def _current_timestamp() -> str:
+    """UTC ISO timestamp, re-formatted at most once per second"""
+    now = time.time()
+    if now - _TS_CACHE[0] >= 1.0:
+        _TS_CACHE[:] = [now, datetime.utcnow().isoformat()]
+    return _TS_CACHE[1]
+
+
+@app.get("/", tags=["Root"], response_class=ORJSONResponse)
 async def root():
     """Root endpoint with API information"""
-    return {
-        "service": "Multi-Agent Pharmaceutical Substitute Recommender",
-        "version": "1.0.0",
-        "status": "operational",
-        "timestamp": datetime.utcnow().isoformat(),
-        "endpoints": {
-            "health": "/health",
-            "docs": "/docs",
-            "add_product": "POST /api/v1/products",
-            "bulk_add_products": "POST /api/v1/products/bulk",
-            "get_recommendations": "POST /api/v1/recommendations",
-            "observability_summary": "GET /api/v1/observability/summary",
-            "observability_metrics": "GET /api/v1/observability/metrics/recent",
-            "drift_alerts": "GET /api/v1/observability/drift/alerts",
-            "cloudwatch_setup": "POST /api/v1/observability/cloudwatch/setup",
-            "cloudwatch_test": "GET /api/v1/observability/cloudwatch/test"
-        },
-        "features": {
-            "multi_agent_system": True,
-            "observability": True,
-            "ai_analysis": True,
-            "drift_detection": True
-        }
-    }
+    info = dict(_ROOT_INFO)
+    info["timestamp"] = _current_timestamp()
+    return info
+
 
+# [timestamp, serialized /health body]; re-rendered only when the timestamp changes
+_HEALTH_CACHE: List[Any] = ["", b""]
 
-@app.get("/health", tags=["Health"])
+
+@app.get("/health", tags=["Health"], response_class=ORJSONResponse)
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "multi-agent-recommender"
-    }
+    timestamp = _current_timestamp()
+    if timestamp != _HEALTH_CACHE[0]:
+        _HEALTH_CACHE[:] = [timestamp, _dumps({
+            "status": "healthy",
+            "timestamp": timestamp,
+            "service": "multi-agent-recommender"
+        })]
+    return Response(content=_HEALTH_CACHE[1], media_type="application/json")
 
 
 @app.post(
@@ -193,29 +332,26 @@ async def create_product(product: ProductRequest):
     This endpoint allows adding pharmaceutical products to the searchable catalog.
     The product will be indexed and available for substitute recommendations.
     """
-    try:
-        add_product_to_catalog(
-            product_description=product.product_description,
-            sku=product.sku,
-            atc_code=product.atc_code,
-            cold_chain=product.cold_chain,
-            shelf_life_months=product.shelf_life_months
-        )
-        
-        return ProductResponse(
-            success=True,
-            message=f"Product {product.sku} successfully added to catalog",
-            sku=product.sku
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to add product: {str(e)}"
-        )
+    # Embedding + index rebuild is blocking I/O; keep it off the event loop
+    await run_in_threadpool(
+        add_product_to_catalog,
+        product_description=product.product_description,
+        sku=product.sku,
+        atc_code=product.atc_code,
+        cold_chain=product.cold_chain,
+        shelf_life_months=product.shelf_life_months
+    )
+    
+    return ProductResponse(
+        success=True,
+        message=f"Product {product.sku} successfully added to catalog",
+        sku=product.sku
+    )
 
 @app.post(
     "/api/v1/recommendations",
-    response_model=RecommendationResponse,
+    response_class=ORJSONResponse,
+    responses={200: {"model": RecommendationResponse}},
     tags=["Recommendations"]
 )
 async def get_recommendations(request: RecommendationRequest):
@@ -234,64 +370,168 @@ async def get_recommendations(request: RecommendationRequest):
     - **medium**: Balanced strategy (regional search)
     - **low**: Exhaustive strategy (global search)
     """
-    try:
-        # Validate urgency level
-        valid_urgency_levels = ["low", "medium", "high", "critical"]
-        if request.urgency.lower() not in valid_urgency_levels:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid urgency level. Must be one of: {', '.join(valid_urgency_levels)}"
-            )
-        
-        # Call the multi-agent recommendation system
-        result = recommend_substitute(
-            requested_item=request.requested_item,
-            country=request.country,
-            quantity=request.quantity,
-            urgency=request.urgency.lower(),
-            enable_observability=request.enable_observability,
-            enable_ai_analysis=request.enable_ai_analysis
-        )
-        
-        # Transform recommendations to response format
-        recommendations = [
-            SubstituteCandidateResponse(**rec)
-            for rec in result.get("recommendations", [])
-        ]
-        # Ensure observability payload is fully JSON-serializable (handles numpy types, etc.)
-        observability_payload = None
-        if result.get("observability") is not None:
-            observability_payload = jsonable_encoder(result.get("observability"))
-        
-        return RecommendationResponse(
-            success=True,
+    # Call the multi-agent recommendation system (identical in-flight requests share one run)
+    result = await _coalesced_recommendation(request)
+    
+    return ORJSONResponse(_build_recommendation_payload(request, result))
+
+
+@app.post("/api/v1/recommendations/stream", tags=["Recommendations"])
+async def stream_recommendations(request: RecommendationRequest):
+    """
+    Get substitute recommendations as a Server-Sent Events stream
+    
+    Same pipeline as POST /api/v1/recommendations, but the executive report is
+    streamed while it is generated:
+    - **report_delta**: a chunk of the final report text (JSON string)
+    - **result**: the complete RecommendationResponse payload
+    - **error**: error message if the pipeline fails mid-stream
+    """
+    async def event_stream():
+        try:
+            async for event in astream_recommendation(
+                requested_item=request.requested_item,
+                country=request.country,
+                quantity=request.quantity,
+                urgency=request.urgency,
+                enable_observability=request.enable_observability,
+                enable_ai_analysis=request.enable_ai_analysis,
+                explain_strategy=request.explain_strategy
+            ):
+                if event["event"] == "result":
+                    data = _dumps(_build_recommendation_payload(request, event["data"])).decode()
+                else:
+                    data = _dumps(event["data"]).decode()
+                yield f"event: {event['event']}\ndata: {data}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {orjson.dumps(f'Recommendation system error: {str(e)}').decode()}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+# Request hash -> running pipeline task, for identical concurrent requests
+_inflight: Dict[bytes, asyncio.Task] = {}
+
+
+async def _coalesced_recommendation(request: RecommendationRequest) -> Dict[str, Any]:
+    """
+    Run the recommendation pipeline, joining an identical request already in flight
+    
+    The pipeline runs in its own task and callers await it through
+    asyncio.shield(), so a disconnecting client doesn't cancel it for the others.
+    """
+    key = hashlib.blake2b(orjson.dumps(request.model_dump()), digest_size=16).digest()
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(arecommend_substitute(
             requested_item=request.requested_item,
             country=request.country,
             quantity=request.quantity,
             urgency=request.urgency,
-            strategy=result.get("strategy", "unknown"),
-            recommendations=recommendations,
-            suggested_action=result.get("suggested_action", ""),
-            final_report=result.get("final_report", ""),
-            coordinator_synthesis=result.get("coordinator_synthesis"),
-            observability=observability_payload
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Recommendation system error: {str(e)}"
-        )
+            enable_observability=request.enable_observability,
+            enable_ai_analysis=request.enable_ai_analysis,
+            explain_strategy=request.explain_strategy
+        ))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def _build_recommendation_payload(request: RecommendationRequest, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the RecommendationResponse payload as a plain dict
+    
+    The candidates come from the coordinator already in the
+    SubstituteCandidateResponse shape, so they are passed through without
+    re-validation; the dict (including numpy values in the observability
+    report) is serialized directly with orjson.
+    """
+    return {
+        "success": True,
+        "requested_item": request.requested_item,
+        "country": request.country,
+        "quantity": request.quantity,
+        "urgency": request.urgency,
+        "strategy": result.get("strategy") or "unknown",
+        "strategy_reasoning": result.get("strategy_reasoning"),
+        "recommendations": result.get("recommendations", []),
+        "suggested_action": result.get("suggested_action", ""),
+        "final_report": result.get("final_report") or "",
+        "coordinator_synthesis": result.get("coordinator_synthesis"),
+        "observability": result.get("observability")
+    }
 
 
 # ============================================================
 # OBSERVABILITY ENDPOINTS
 # ============================================================
 
+# Read endpoints reuse storage results within this window (dashboard polling)
+OBSERVABILITY_CACHE_TTL_S = 5
+
+
+def _cache_bucket() -> int:
+    """Current time window index; part of the cache key so entries expire"""
+    return int(time.time() // OBSERVABILITY_CACHE_TTL_S)
+
+
+def _render_with_etag(payload: Any) -> Tuple[bytes, str]:
+    """Serialize a payload once and derive its (quoted) ETag from the bytes"""
+    body = _dumps(payload)
+    return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_response(request: Request, rendered: Tuple[bytes, str]) -> Response:
+    """
+    Return the pre-rendered body, or 304 Not Modified if the client already has it
+    
+    Args:
+        request: Incoming request (checked for If-None-Match)
+        rendered: (body, etag) from _render_with_etag()
+    
+    Returns:
+        304 response without body, or 200 JSON response with an ETag header
+    """
+    body, etag = rendered
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag})
+    return Response(content=body, media_type="application/json", headers={"etag": etag})
+
+
+# Storage reads are cached already rendered, so polling within a window only
+# costs an ETag comparison (or a bytes write)
+@lru_cache(maxsize=32)
+def _cached_summary(hours: int, bucket: int) -> Tuple[bytes, str]:
+    return _render_with_etag(get_observability_middleware().get_summary(hours=hours))
+
+
+@lru_cache(maxsize=32)
+def _cached_recent_metrics(limit: int, bucket: int) -> Tuple[bytes, str]:
+    metrics = get_observability_middleware().storage.get_recent_metrics(limit=limit)
+    return _render_with_etag({"count": len(metrics), "metrics": metrics})
+
+
+@lru_cache(maxsize=32)
+def _cached_drift_alerts(bucket: int) -> Tuple[bytes, str]:
+    alerts = get_observability_middleware().get_recent_drift_alerts()
+    return _render_with_etag({"count": len(alerts), "alerts": alerts})
+
+
+@lru_cache(maxsize=32)
+def _cached_drift_history(limit: int, bucket: int) -> Tuple[bytes, str]:
+    history = get_observability_middleware().storage.get_drift_history(limit=limit)
+    return _render_with_etag({"count": len(history), "history": history})
+
+
+@lru_cache(maxsize=32)
+def _cached_recent_analyses(limit: int, bucket: int) -> Tuple[bytes, str]:
+    analyses = get_observability_middleware().storage.get_recent_analyses(limit=limit)
+    return _render_with_etag({"count": len(analyses), "analyses": analyses})
+
+
 @app.get("/api/v1/observability/summary", tags=["Observability"])
-async def get_observability_summary(hours: int = 24):
+async def get_observability_summary(request: Request, hours: int = 24):
     """
     Get observability metrics summary
     
@@ -300,19 +540,11 @@ async def get_observability_summary(hours: int = 24):
     - Average execution time, tokens, and cost
     - Most used agents
     """
-    try:
-        observability = get_observability_middleware()
-        summary = observability.get_summary(hours=hours)
-        return JSONResponse(content=summary)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve observability summary: {str(e)}"
-        )
+    return _etag_response(request, _cached_summary(hours, _cache_bucket()))
 
 
 @app.get("/api/v1/observability/metrics/recent", tags=["Observability"])
-async def get_recent_metrics(limit: int = 50):
+async def get_recent_metrics(request: Request, limit: int = 50):
     """
     Get recent request metrics
     
@@ -321,15 +553,7 @@ async def get_recent_metrics(limit: int = 50):
     - Token usage and costs
     - Success/failure status
     """
-    try:
-        observability = get_observability_middleware()
-        metrics = observability.storage.get_recent_metrics(limit=limit)
-        return JSONResponse(content={"count": len(metrics), "metrics": metrics})
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve metrics: {str(e)}"
-        )
+    return _etag_response(request, _cached_recent_metrics(limit, _cache_bucket()))
 
 
 @app.get("/api/v1/observability/metrics/{request_id}", tags=["Observability"])
@@ -342,28 +566,20 @@ async def get_metrics_by_id(request_id: str):
     - Token counts and costs
     - Execution timeline
     """
-    try:
-        observability = get_observability_middleware()
-        metrics = observability.storage.get_metrics_by_request_id(request_id)
-        
-        if not metrics:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"No metrics found for request ID: {request_id}"
-            )
-        
-        return JSONResponse(content=metrics)
-    except HTTPException:
-        raise
-    except Exception as e:
+    observability = get_observability_middleware()
+    metrics = observability.storage.get_metrics_by_request_id(request_id)
+    
+    if not metrics:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve metrics: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No metrics found for request ID: {request_id}"
         )
+    
+    return ORJSONResponse(metrics)
 
 
 @app.get("/api/v1/observability/drift/alerts", tags=["Observability"])
-async def get_drift_alerts():
+async def get_drift_alerts(request: Request):
     """
     Get recent drift detection alerts
     
@@ -372,22 +588,11 @@ async def get_drift_alerts():
     - Specific indicators of drift
     - Recommendations for action
     """
-    try:
-        observability = get_observability_middleware()
-        alerts = observability.get_recent_drift_alerts()
-        return JSONResponse(content={
-            "count": len(alerts),
-            "alerts": alerts
-        })
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve drift alerts: {str(e)}"
-        )
+    return _etag_response(request, _cached_drift_alerts(_cache_bucket()))
 
 
 @app.get("/api/v1/observability/drift/history", tags=["Observability"])
-async def get_drift_history(limit: int = 20):
+async def get_drift_history(request: Request, limit: int = 20):
     """
     Get drift detection history
     
@@ -396,22 +601,11 @@ async def get_drift_history(limit: int = 20):
     - Kolmogorov-Smirnov test results
     - Statistical summaries
     """
-    try:
-        observability = get_observability_middleware()
-        history = observability.storage.get_drift_history(limit=limit)
-        return JSONResponse(content={
-            "count": len(history),
-            "history": history
-        })
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve drift history: {str(e)}"
-        )
+    return _etag_response(request, _cached_drift_history(limit, _cache_bucket()))
 
 
 @app.get("/api/v1/observability/analyses/recent", tags=["Observability"])
-async def get_recent_analyses(limit: int = 20):
+async def get_recent_analyses(request: Request, limit: int = 20):
     """
     Get recent AI analysis results
     
@@ -423,18 +617,7 @@ async def get_recent_analyses(limit: int = 20):
     
     Note: Only available for requests with AI analysis enabled
     """
-    try:
-        observability = get_observability_middleware()
-        analyses = observability.storage.get_recent_analyses(limit=limit)
-        return JSONResponse(content={
-            "count": len(analyses),
-            "analyses": analyses
-        })
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve analyses: {str(e)}"
-        )
+    return _etag_response(request, _cached_recent_analyses(limit, _cache_bucket()))
 
 
 @app.post("/api/v1/observability/drift/set-baseline", tags=["Observability"])
@@ -445,30 +628,22 @@ async def set_drift_baseline(num_samples: int = 100):
     Uses recent historical data to establish a new baseline for drift detection.
     Useful after system updates or when establishing initial baseline.
     """
-    try:
-        observability = get_observability_middleware()
-        recent_metrics = observability.storage.get_recent_metrics(limit=num_samples)
-        
-        if len(recent_metrics) < 2:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Insufficient data for baseline. Need at least 2 samples, have {len(recent_metrics)}"
-            )
-        
-        observability.drift_detector.set_baseline(recent_metrics)
-        
-        return JSONResponse(content={
-            "success": True,
-            "message": f"Baseline set using {len(recent_metrics)} samples",
-            "samples_used": len(recent_metrics)
-        })
-    except HTTPException:
-        raise
-    except Exception as e:
+    observability = get_observability_middleware()
+    recent_metrics = observability.storage.get_recent_metrics(limit=num_samples)
+    
+    if len(recent_metrics) < 2:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to set baseline: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Insufficient data for baseline. Need at least 2 samples, have {len(recent_metrics)}"
         )
+    
+    observability.drift_detector.set_baseline(recent_metrics)
+    
+    return ORJSONResponse({
+        "success": True,
+        "message": f"Baseline set using {len(recent_metrics)} samples",
+        "samples_used": len(recent_metrics)
+    })
 
 
 # ============================================================
@@ -496,39 +671,30 @@ async def setup_cloudwatch(
             detail="CloudWatch integration not available. Install boto3 to enable."
         )
     
-    try:
-        success = setup_cloudwatch_observability(
-            region_name=region_name,
-            create_dashboard=create_dashboard,
-            create_alarms=create_alarms
-        )
+    success = setup_cloudwatch_observability(
+        region_name=region_name,
+        create_dashboard=create_dashboard,
+        create_alarms=create_alarms
+    )
+    
+    if success:
+        dashboard_name = "LangChainService-Observability"
+        region = region_name or os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
+        dashboard_url = f"https://{region}.console.aws.amazon.com/cloudwatch/home?region={region}#dashboards:name={dashboard_name}"
         
-        if success:
-            dashboard_name = "LangChainService-Observability"
-            region = region_name or os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-            dashboard_url = f"https://{region}.console.aws.amazon.com/cloudwatch/home?region={region}#dashboards:name={dashboard_name}"
-            
-            return JSONResponse(content={
-                "success": True,
-                "message": "CloudWatch observability setup completed",
-                "dashboard_name": dashboard_name,
-                "dashboard_url": dashboard_url,
-                "region": region,
-                "dashboard_created": create_dashboard,
-                "alarms_created": create_alarms
-            })
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to setup CloudWatch observability. Check logs for details."
-            )
-            
-    except HTTPException:
-        raise
-    except Exception as e:
+        return ORJSONResponse({
+            "success": True,
+            "message": "CloudWatch observability setup completed",
+            "dashboard_name": dashboard_name,
+            "dashboard_url": dashboard_url,
+            "region": region,
+            "dashboard_created": create_dashboard,
+            "alarms_created": create_alarms
+        })
+    else:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to setup CloudWatch: {str(e)}"
+            detail="Failed to setup CloudWatch observability. Check logs for details."
         )
 
 
@@ -546,30 +712,23 @@ async def test_cloudwatch():
             detail="CloudWatch integration not available. Install boto3 to enable."
         )
     
-    try:
-        observability = get_observability_middleware()
-        
-        if not observability.storage.cloudwatch_publisher:
-            return JSONResponse(content={
-                "success": False,
-                "message": "CloudWatch publishing is not enabled",
-                "hint": "Set ENABLE_CLOUDWATCH_METRICS=true environment variable to enable"
-            })
-        
-        success = observability.storage.cloudwatch_publisher.test_connection()
-        
-        return JSONResponse(content={
-            "success": success,
-            "message": "CloudWatch connection test successful" if success else "CloudWatch connection test failed",
-            "region": observability.storage.cloudwatch_publisher.region_name,
-            "namespace": observability.storage.cloudwatch_publisher.namespace
+    observability = get_observability_middleware()
+    
+    if not observability.storage.cloudwatch_publisher:
+        return ORJSONResponse({
+            "success": False,
+            "message": "CloudWatch publishing is not enabled",
+            "hint": "Set ENABLE_CLOUDWATCH_METRICS=true environment variable to enable"
         })
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"CloudWatch connection test failed: {str(e)}"
-        )
+    
+    success = observability.storage.cloudwatch_publisher.test_connection()
+    
+    return ORJSONResponse({
+        "success": success,
+        "message": "CloudWatch connection test successful" if success else "CloudWatch connection test failed",
+        "region": observability.storage.cloudwatch_publisher.region_name,
+        "namespace": observability.storage.cloudwatch_publisher.namespace
+    })
 
 
 @app.get("/api/v1/observability/cloudwatch/status", tags=["CloudWatch"])
@@ -580,34 +739,27 @@ async def cloudwatch_status():
     Returns:
         Current CloudWatch configuration and status
     """
-    try:
-        observability = get_observability_middleware()
-        
-        is_enabled = observability.storage.cloudwatch_publisher is not None
-        region = None
-        namespace = None
-        
-        if is_enabled:
-            region = observability.storage.cloudwatch_publisher.region_name
-            namespace = observability.storage.cloudwatch_publisher.namespace
-        
-        return JSONResponse(content={
-            "cloudwatch_available": CLOUDWATCH_AVAILABLE,
-            "cloudwatch_enabled": is_enabled,
-            "region": region,
-            "namespace": namespace,
-            "configuration": {
-                "env_var": "ENABLE_CLOUDWATCH_METRICS",
-                "region_env_var": "us-east-1",
-                "current_env_value": os.environ.get('ENABLE_CLOUDWATCH_METRICS', 'false')
-            }
-        })
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get CloudWatch status: {str(e)}"
-        )
+    observability = get_observability_middleware()
+    
+    is_enabled = observability.storage.cloudwatch_publisher is not None
+    region = None
+    namespace = None
+    
+    if is_enabled:
+        region = observability.storage.cloudwatch_publisher.region_name
+        namespace = observability.storage.cloudwatch_publisher.namespace
+    
+    return ORJSONResponse({
+        "cloudwatch_available": CLOUDWATCH_AVAILABLE,
+        "cloudwatch_enabled": is_enabled,
+        "region": region,
+        "namespace": namespace,
+        "configuration": {
+            "env_var": "ENABLE_CLOUDWATCH_METRICS",
+            "region_env_var": "us-east-1",
+            "current_env_value": os.environ.get('ENABLE_CLOUDWATCH_METRICS', 'false')
+        }
+    })
 
 
 # ============================================================
@@ -627,9 +779,19 @@ if __name__ == "__main__":
     print("\n🌐 Server starting on: http://localhost:8000")
     print("=" * 80 + "\n")
     
+    workers = int(os.environ.get("UVICORN_WORKERS", "1"))
+    
+    # loop/http "auto" pick uvloop and httptools when installed.
+    # workers > 1 requires the import-string form of the app.
     uvicorn.run(
-        app,
+        "main:app" if workers > 1 else app,
         host="0.0.0.0",
         port=8001,
-        log_level="info"
+        workers=workers,
+        loop="auto",
+        http="auto",
+        log_level=os.environ.get("LOG_LEVEL", "INFO").lower(),
+        # JSON mode: let uvicorn's loggers propagate to the root JSON handler
+        log_config=None if JSON_LOGS else uvicorn.config.LOGGING_CONFIG,
+        access_log=False
     )
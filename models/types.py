@@ -38,11 +38,14 @@ class State(TypedDict):
     requested_quantity: int
     urgency: str  # "low", "medium", "high", "critical"
     observability_request_id: Optional[str]
+    explain_strategy: bool  # Ask the manager for an LLM justification of the strategy
     
     # Manager routing
     strategy: Optional[str]  # "fast", "balanced", "exhaustive"
+    strategy_reasoning: Optional[str]
     
-    # Parallel agent results
+    # Parallel agent results (each key is written by exactly one
+    # specialized agent, so concurrent updates never collide)
     compliance_result: Optional[Dict[str, Any]]
     inventory_result: Optional[Dict[str, Any]]
     logistics_result: Optional[Dict[str, Any]]
@@ -50,11 +53,13 @@ class State(TypedDict):
     
     # Processing
     catalog_candidates: List[Document]
+    lots_join: List[Dict[str, Any]]  # In-stock lots of the candidates, enriched once by catalog search
     agent_decisions: List[AgentDecision]
     compliant_substitutes: List[SubstituteCandidate]
     
     # Coordination
     coordinator_synthesis: Optional[str]
+    negotiation_summary: Optional[str]
     
     # Output
     recommendations: List[SubstituteCandidate]
@@ -2,6 +2,7 @@
 Agent Wrapper - Wraps agents with automatic observability tracking
 """
 
+import inspect
 import time
 from typing import Callable
 from functools import wraps
@@ -9,88 +10,180 @@ from models import State
 from .middleware import get_observability_middleware
 
 
+# Request fields recorded as the agent input
+_INPUT_KEYS = ("requested_item", "requested_country", "urgency", "strategy")
+
+# State keys never reported as agent output
+_IGNORED_OUTPUT_KEYS = frozenset({"observability_request_id"})
+
+# Output formatters by value type
+_FORMATTERS = {
+    str: lambda v: f"{v[:200]}..." if len(v) > 200 else v,
+    list: lambda v: f"[{len(v)} items]",
+    dict: lambda v: "{...}",
+}
+
+
+def _format_value(value) -> str:
+    """Compact representation of a state value"""
+    formatter = _FORMATTERS.get(type(value))
+    if formatter is None:
+        # Subclasses (e.g. str enums) take the slow path
+        formatter = next((f for t, f in _FORMATTERS.items() if isinstance(value, t)), str)
+    return formatter(value)
+
+
+def _serialize_input(state: State) -> str:
+    """Serialize the relevant request fields of the state"""
+    return ", ".join(f"{k}={v}" for k in _INPUT_KEYS if (v := state.get(k)))
+
+
+def _serialize_output(state: State, result: State) -> str:
+    """Serialize the keys the agent added or changed"""
+    # Detect what changed or was added: new keys by set difference, then
+    # one comparison per shared key
+    result_keys = result.keys() - _IGNORED_OUTPUT_KEYS
+    state_keys = state.keys()
+    diff_keys = (result_keys - state_keys) | {
+        key for key in result_keys & state_keys if result[key] != state[key]
+    }
+    if not diff_keys:
+        return "State updated"
+    # Keep the result's key order so the text is stable across runs
+    output_parts = [f"{key}={_format_value(result[key])}" for key in result if key in diff_keys]
+    return ", ".join(output_parts)
+
+
+def _track_failure(
+    collector, request_id: str, agent_name: str, model_name: str, input_text: str, start_ns: int, error: Exception
+) -> None:
+    """Queue a failed agent execution without masking the original error"""
+    try:
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e6
+        collector.enqueue_agent_execution(
+            agent_name=agent_name,
+            input_text=input_text,
+            output_text="",
+            execution_time_ms=execution_time,
+            model_name=model_name,
+            success=False,
+            error_message=str(error),
+            request_id=request_id
+        )
+    except:
+        pass  # Don't fail if observability tracking fails
+
+
 def with_observability(agent_name: str, model_name: str = "us.amazon.nova-micro-v1:0"):
     """
     Decorator to add observability tracking to agents
-    
+
+    Supports both regular and ``async`` agents.
+
     Usage:
         @with_observability("manager_agent")
         def manager_agent(state: State) -> State:
             ...
     """
     def decorator(func: Callable[[State], State]) -> Callable[[State], State]:
+        # Metrics collector of the global middleware, resolved on first tracked call
+        # (the middleware is created by the service with its own settings)
+        _cached = {}
+
+        def _collector():
+            collector = _cached.get("collector")
+            if collector is None:
+                collector = _cached["collector"] = get_observability_middleware().metrics_collector
+            return collector
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(state: State) -> State:
+                # Skip if observability is not enabled for this request
+                request_id = state.get("observability_request_id")
+                if not request_id:
+                    return await func(state)
+
+                # Nothing to serialize when metrics collection is switched off
+                collector = _collector()
+                if not collector.enabled:
+                    return await func(state)
+
+                input_text = "Error before input capture"
+                start_ns = time.perf_counter_ns()
+                try:
+                    input_text = _serialize_input(state)
+
+                    # Track execution time
+                    start_ns = time.perf_counter_ns()
+
+                    # Execute agent
+                    result = await func(state)
+
+                    execution_time = (time.perf_counter_ns() - start_ns) / 1e6
+
+                    # Queue the metrics; token counting runs off the request path
+                    collector.enqueue_agent_execution(
+                        agent_name=agent_name,
+                        input_text=input_text,
+                        output_text=_serialize_output(state, result),
+                        execution_time_ms=execution_time,
+                        model_name=model_name,
+                        success=True,
+                        request_id=request_id
+                    )
+
+                    return result
+
+                except Exception as e:
+                    # Track failure if observability is active
+                    _track_failure(collector, request_id, agent_name, model_name, input_text, start_ns, e)
+                    raise  # Re-raise the original exception
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(state: State) -> State:
             # Skip if observability is not enabled for this request
-            if not state.get("observability_request_id"):
+            request_id = state.get("observability_request_id")
+            if not request_id:
+                return func(state)
+
+            # Nothing to serialize when metrics collection is switched off
+            collector = _collector()
+            if not collector.enabled:
                 return func(state)
-            
+
+            input_text = "Error before input capture"
+            start_ns = time.perf_counter_ns()
             try:
-                observability = get_observability_middleware()
-                
-                # Serialize input
-                input_parts = []
-                for key in ["requested_item", "requested_country", "urgency", "strategy"]:
-                    if key in state and state[key]:
-                        input_parts.append(f"{key}={state[key]}")
-                input_text = ", ".join(input_parts)
-                
+                input_text = _serialize_input(state)
+
                 # Track execution time
-                start_time = time.time()
-                
+                start_ns = time.perf_counter_ns()
+
                 # Execute agent
                 result = func(state)
-                
-                execution_time = (time.time() - start_time) * 1000
-                
-                # Serialize output
-                output_parts = []
-                # Detect what changed or was added
-                for key in result:
-                    if key not in ["observability_request_id"] and (key not in state or result[key] != state.get(key)):
-                        value = result[key]
-                        if isinstance(value, str) and len(value) > 200:
-                            output_parts.append(f"{key}={value[:200]}...")
-                        elif isinstance(value, list):
-                            output_parts.append(f"{key}=[{len(value)} items]")
-                        elif isinstance(value, dict):
-                            output_parts.append(f"{key}={{...}}")
-                        else:
-                            output_parts.append(f"{key}={value}")
-                
-                output_text = ", ".join(output_parts) if output_parts else "State updated"
-                
-                # Track metrics
-                observability.metrics_collector.track_agent_execution(
+
+                execution_time = (time.perf_counter_ns() - start_ns) / 1e6
+
+                # Queue the metrics; token counting runs off the request path
+                collector.enqueue_agent_execution(
                     agent_name=agent_name,
                     input_text=input_text,
-                    output_text=output_text,
+                    output_text=_serialize_output(state, result),
                     execution_time_ms=execution_time,
                     model_name=model_name,
-                    success=True
+                    success=True,
+                    request_id=request_id
                 )
-                
+
                 return result
-                
+
             except Exception as e:
                 # Track failure if observability is active
-                try:
-                    execution_time = (time.time() - start_time) * 1000
-                    observability = get_observability_middleware()
-                    observability.metrics_collector.track_agent_execution(
-                        agent_name=agent_name,
-                        input_text=input_text if 'input_text' in locals() else "Error before input capture",
-                        output_text="",
-                        execution_time_ms=execution_time,
-                        model_name=model_name,
-                        success=False,
-                        error_message=str(e)
-                    )
-                except:
-                    pass  # Don't fail if observability tracking fails
-                
+                _track_failure(collector, request_id, agent_name, model_name, input_text, start_ns, e)
                 raise  # Re-raise the original exception
-        
+
         return wrapper
     return decorator
-
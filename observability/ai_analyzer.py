@@ -2,10 +2,468 @@
 AI Observability Analyzer - Uses AI to analyze agent outputs, reasoning quality, and text quality
 """
 
-from typing import Dict, Any, List
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field
 from config import llm
 import json
+import orjson
+
+# Max number of cached text-quality / reasoning analyses (LRU)
+ANALYSIS_CACHE_SIZE = 256
+
+# Max concurrent LLM calls in the batch analysis methods
+ANALYSIS_BATCH_CONCURRENCY = 8
+
+# Outputs shorter than this (stripped) are rated without calling the LLM
+MIN_ANALYZED_TEXT_LENGTH = 20
+
+TEXT_QUALITY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", 
+     "You are an expert AI quality analyst. Analyze the quality of AI-generated text "
+     "and provide scores from 0-10 for the following dimensions:\n"
+     "- Coherence: How logically structured and consistent is the text?\n"
+     "- Completeness: Does it fully address the requirements?\n"
+     "- Clarity: How clear and understandable is it?\n"
+     "- Professional: Does it maintain appropriate professional tone?\n\n"
+     "Return ONLY a JSON object with this exact format:\n"
+     "{{\n"
+     '  "coherence_score": <0-10>,\n'
+     '  "completeness_score": <0-10>,\n'
+     '  "clarity_score": <0-10>,\n'
+     '  "professional_score": <0-10>,\n'
+     '  "overall_score": <0-10>,\n'
+     '  "issues": ["issue1", "issue2"],\n'
+     '  "strengths": ["strength1", "strength2"],\n'
+     '  "recommendation": "brief recommendation"\n'
+     "}}"),
+    ("user", 
+     "Context: {context}\n\n"
+     "Text to analyze:\n{text}\n\n"
+     "Provide your analysis in JSON format:")
+])
+
+REASONING_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", 
+     "You are an expert in analyzing AI reasoning and decision-making processes. "
+     "Evaluate the agent's reasoning quality based on:\n"
+     "- Logic: Is the reasoning logically sound?\n"
+     "- Appropriateness: Is the decision appropriate for the input?\n"
+     "- Justification: Is the reasoning well-explained?\n"
+     "- Consistency: Is the decision consistent with best practices?\n\n"
+     "Return ONLY a JSON object with this format:\n"
+     "{{\n"
+     '  "logic_score": <0-10>,\n'
+     '  "appropriateness_score": <0-10>,\n'
+     '  "justification_score": <0-10>,\n'
+     '  "consistency_score": <0-10>,\n'
+     '  "overall_reasoning_score": <0-10>,\n'
+     '  "reasoning_explanation": "brief explanation",\n'
+     '  "potential_issues": ["issue1", "issue2"],\n'
+     '  "confidence_level": "high|medium|low"\n'
+     "}}"),
+    ("user", 
+     "Agent: {agent_name}\n\n"
+     "Input:\n{input_data}\n\n"
+     "Output:\n{output_data}\n\n"
+     "Decision Made: {decision_made}\n\n"
+     "Analyze the reasoning quality in JSON format:")
+])
+
+PERFORMANCE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", 
+     "You are an expert in analyzing AI system performance. "
+     "Review the execution metrics and provide insights about:\n"
+     "- Performance bottlenecks\n"
+     "- Cost optimization opportunities\n"
+     "- Efficiency improvements\n"
+     "- Unusual patterns or anomalies\n\n"
+     "Return ONLY a JSON object:\n"
+     "{{\n"
+     '  "performance_score": <0-10>,\n'
+     '  "cost_efficiency_score": <0-10>,\n'
+     '  "bottlenecks": ["bottleneck1"],\n'
+     '  "optimization_suggestions": ["suggestion1"],\n'
+     '  "anomalies_detected": ["anomaly1"],\n'
+     '  "summary": "brief summary"\n'
+     "}}"),
+    ("user", 
+     "Request Metrics:\n"
+     "{request_summary}\n\n"
+     "Agent Executions:\n{agents_data}\n\n"
+     "Analyze in JSON format:")
+])
+
+REPORT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", 
+     "You are an AI Observability expert. Generate a comprehensive, actionable report "
+     "summarizing the AI system's performance, quality, and areas for improvement."),
+    ("user", 
+     "Generate an observability report for request {request_id}:\n\n"
+     "**Performance Metrics:**\n"
+     "- Total execution time: {total_time_ms:.0f}ms\n"
+     "- Total tokens used: {total_tokens}\n"
+     "- Total cost: ${total_cost_usd:.4f}\n"
+     "- Agents executed: {agents_executed}\n\n"
+     "**Quality Analysis:**\n"
+     "{text_quality_json}\n\n"
+     "**Reasoning Analysis:**\n"
+     "{reasoning_json}\n\n"
+     "**Performance Analysis:**\n"
+     "{performance_json}\n\n"
+     "Provide a clear, structured report with key findings and recommendations.")
+])
+
+# Single prompt for the text quality, reasoning and performance analyses.
+# The system message is static so provider-side prompt caching can reuse it;
+# every request-specific value is in the user message.
+BUNDLE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are an expert AI observability analyst. Analyze one agent execution "
+     "in three sections.\n\n"
+     "1. text_quality - scores from 0-10 for the generated text:\n"
+     "- Coherence: How logically structured and consistent is the text?\n"
+     "- Completeness: Does it fully address the requirements?\n"
+     "- Clarity: How clear and understandable is it?\n"
+     "- Professional: Does it maintain appropriate professional tone?\n\n"
+     "2. reasoning - scores from 0-10 for the agent's reasoning:\n"
+     "- Logic: Is the reasoning logically sound?\n"
+     "- Appropriateness: Is the decision appropriate for the input?\n"
+     "- Justification: Is the reasoning well-explained?\n"
+     "- Consistency: Is the decision consistent with best practices?\n\n"
+     "3. performance - insights about the request execution metrics:\n"
+     "- Performance bottlenecks\n"
+     "- Cost optimization opportunities\n"
+     "- Efficiency improvements\n"
+     "- Unusual patterns or anomalies\n\n"
+     "Return ONLY a JSON object with this exact format:\n"
+     "{{\n"
+     '  "text_quality": {{\n'
+     '    "coherence_score": <0-10>,\n'
+     '    "completeness_score": <0-10>,\n'
+     '    "clarity_score": <0-10>,\n'
+     '    "professional_score": <0-10>,\n'
+     '    "overall_score": <0-10>,\n'
+     '    "issues": ["issue1", "issue2"],\n'
+     '    "strengths": ["strength1", "strength2"],\n'
+     '    "recommendation": "brief recommendation"\n'
+     "  }},\n"
+     '  "reasoning": {{\n'
+     '    "logic_score": <0-10>,\n'
+     '    "appropriateness_score": <0-10>,\n'
+     '    "justification_score": <0-10>,\n'
+     '    "consistency_score": <0-10>,\n'
+     '    "overall_reasoning_score": <0-10>,\n'
+     '    "reasoning_explanation": "brief explanation",\n'
+     '    "potential_issues": ["issue1", "issue2"],\n'
+     '    "confidence_level": "high|medium|low"\n'
+     "  }},\n"
+     '  "performance": {{\n'
+     '    "performance_score": <0-10>,\n'
+     '    "cost_efficiency_score": <0-10>,\n'
+     '    "bottlenecks": ["bottleneck1"],\n'
+     '    "optimization_suggestions": ["suggestion1"],\n'
+     '    "anomalies_detected": ["anomaly1"],\n'
+     '    "summary": "brief summary"\n'
+     "  }}\n"
+     "}}"),
+    ("user",
+     "Context: {context}\n\n"
+     "Agent: {agent_name}\n\n"
+     "Input:\n{input_data}\n\n"
+     "Output (text to analyze):\n{output_data}\n\n"
+     "Decision Made: {decision_made}\n\n"
+     "Request Metrics:\n{request_summary}\n\n"
+     "Agent Executions:\n{agents_data}\n\n"
+     "Provide your analysis in JSON format:")
+])
+
+# Read-only result templates, copied per call: neutral scores when the
+# model's answer lacks a section, low scores when the call itself fails.
+# List values are shared between copies and must not be mutated.
+_TEXT_QUALITY_FALLBACK = MappingProxyType({
+    "coherence_score": 7,
+    "completeness_score": 7,
+    "clarity_score": 7,
+    "professional_score": 7,
+    "overall_score": 7,
+    "issues": ["Unable to fully analyze"],
+    "strengths": ["Response generated"],
+    "recommendation": "Manual review recommended"
+})
+_REASONING_FALLBACK = MappingProxyType({
+    "logic_score": 7,
+    "appropriateness_score": 7,
+    "justification_score": 7,
+    "consistency_score": 7,
+    "overall_reasoning_score": 7,
+    "reasoning_explanation": "Standard reasoning applied",
+    "potential_issues": [],
+    "confidence_level": "medium"
+})
+_PERFORMANCE_FALLBACK = MappingProxyType({
+    "performance_score": 7,
+    "cost_efficiency_score": 7,
+    "bottlenecks": [],
+    "optimization_suggestions": [],
+    "anomalies_detected": [],
+    "summary": "Standard performance"
+})
+_TEXT_QUALITY_ERROR = MappingProxyType({
+    "coherence_score": 5,
+    "completeness_score": 5,
+    "clarity_score": 5,
+    "professional_score": 5,
+    "overall_score": 5,
+    "issues": [],
+    "strengths": [],
+    "recommendation": "Error during analysis"
+})
+_REASONING_ERROR = MappingProxyType({
+    "logic_score": 5,
+    "appropriateness_score": 5,
+    "justification_score": 5,
+    "consistency_score": 5,
+    "overall_reasoning_score": 5,
+    "reasoning_explanation": "",
+    "potential_issues": ["Could not complete analysis"],
+    "confidence_level": "low"
+})
+_PERFORMANCE_ERROR = MappingProxyType({
+    "performance_score": 5,
+    "cost_efficiency_score": 5,
+    "bottlenecks": [],
+    "optimization_suggestions": [],
+    "anomalies_detected": [],
+    "summary": "Could not complete performance analysis"
+})
+
+# Precomputed results for inputs not worth an LLM call
+_TEXT_QUALITY_TRIVIAL = MappingProxyType({
+    "coherence_score": 0,
+    "completeness_score": 0,
+    "clarity_score": 0,
+    "professional_score": 0,
+    "overall_score": 0,
+    "issues": ["Output empty or too short to analyze"],
+    "strengths": [],
+    "recommendation": "Check why the agent produced little or no output"
+})
+_REASONING_NOOP = MappingProxyType({
+    "logic_score": 7,
+    "appropriateness_score": 7,
+    "justification_score": 7,
+    "consistency_score": 7,
+    "overall_reasoning_score": 7,
+    "reasoning_explanation": "Agent output equals its input (no-op), nothing to analyze",
+    "potential_issues": [],
+    "confidence_level": "medium"
+})
+
+
+def _is_trivial_text(text: str) -> bool:
+    """Empty, whitespace-only or too short to be worth rating"""
+    return not text or len(text.strip()) < MIN_ANALYZED_TEXT_LENGTH
+
+
+def _text_quality_error(e: Exception) -> Dict[str, Any]:
+    result = dict(_TEXT_QUALITY_ERROR)
+    result["issues"] = [f"Analysis error: {e}"]
+    return result
+
+
+def _reasoning_error(e: Exception) -> Dict[str, Any]:
+    result = dict(_REASONING_ERROR)
+    result["reasoning_explanation"] = f"Analysis error: {e}"
+    return result
+
+
+def _performance_error(e: Exception) -> Dict[str, Any]:
+    result = dict(_PERFORMANCE_ERROR)
+    result["anomalies_detected"] = [f"Analysis error: {e}"]
+    return result
+
+
+class TextQualityResult(BaseModel):
+    """Structured output of the text quality analysis"""
+    coherence_score: float = Field(description="0-10")
+    completeness_score: float = Field(description="0-10")
+    clarity_score: float = Field(description="0-10")
+    professional_score: float = Field(description="0-10")
+    overall_score: float = Field(description="0-10")
+    issues: List[str] = []
+    strengths: List[str] = []
+    recommendation: str = ""
+
+
+class ReasoningResult(BaseModel):
+    """Structured output of the reasoning analysis"""
+    logic_score: float = Field(description="0-10")
+    appropriateness_score: float = Field(description="0-10")
+    justification_score: float = Field(description="0-10")
+    consistency_score: float = Field(description="0-10")
+    overall_reasoning_score: float = Field(description="0-10")
+    reasoning_explanation: str = ""
+    potential_issues: List[str] = []
+    confidence_level: str = Field(default="medium", description="high|medium|low")
+
+
+class PerformanceResult(BaseModel):
+    """Structured output of the request performance analysis"""
+    performance_score: float = Field(description="0-10")
+    cost_efficiency_score: float = Field(description="0-10")
+    bottlenecks: List[str] = []
+    optimization_suggestions: List[str] = []
+    anomalies_detected: List[str] = []
+    summary: str = ""
+
+
+class BundleResult(BaseModel):
+    """Structured output of the bundled analysis"""
+    text_quality: TextQualityResult
+    reasoning: ReasoningResult
+    performance: PerformanceResult
+
+
+def _structured_llm(model, schema: type):
+    """
+    Model stage returning `schema` instances, or the plain model when the
+    provider/model doesn't support structured output
+    """
+    try:
+        return model.with_structured_output(schema)
+    except (NotImplementedError, ValueError):
+        return model
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(response: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the JSON object starting at the first '{' of an LLM response
+    
+    Decodes in a single pass and ignores any prose after the object.
+    
+    Returns:
+        The parsed object, or None if there is no valid JSON object
+    """
+    start_idx = response.find('{')
+    if start_idx == -1:
+        return None
+    try:
+        return _JSON_DECODER.raw_decode(response, start_idx)[0]
+    except json.JSONDecodeError:
+        return None
+
+
+def _as_dict(response: Any) -> Optional[Dict[str, Any]]:
+    """Analysis result as a dict: structured output, or JSON parsed from a message"""
+    if isinstance(response, BaseMessage):
+        return _extract_json(response.content) if isinstance(response.content, str) else None
+    if isinstance(response, BaseModel):
+        return response.model_dump()
+    if isinstance(response, dict):
+        return response
+    return None
+
+
+def _digest(*parts: str) -> str:
+    """Stable content hash used in analysis cache keys"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# (name, time, tokens, cost) of an agent metrics dict
+_agent_row = itemgetter("agent_name", "execution_time_ms", "total_tokens", "estimated_cost_usd")
+
+
+def _request_summary(request_metrics: Dict[str, Any]) -> str:
+    """Request-level metrics as prompt lines"""
+    return (
+        f"- Total Time: {request_metrics.get('total_execution_time_ms', 0):.0f}ms\n"
+        f"- Total Tokens: {request_metrics.get('total_tokens', 0)}\n"
+        f"- Total Cost: ${request_metrics.get('total_cost_usd', 0):.4f}\n"
+        f"- Strategy: {request_metrics.get('strategy', 'unknown')}\n"
+        f"- Success: {request_metrics.get('success', False)}"
+    )
+
+
+def _agents_data(request_metrics: Dict[str, Any]) -> str:
+    """Per-agent metrics as prompt lines"""
+    return "\n".join([
+        f"- {name}: {time_ms:.0f}ms, {tokens} tokens, ${cost:.4f}"
+        for name, time_ms, tokens, cost in map(_agent_row, request_metrics.get("agent_metrics", ()))
+    ])
+
+
+def _reasoning_inputs(agent_name: str, input_data: str, output_data: str, decision_made: str) -> Dict[str, Any]:
+    return {
+        "agent_name": agent_name,
+        "input_data": input_data,
+        "output_data": output_data,
+        "decision_made": decision_made
+    }
+
+
+def _performance_inputs(request_metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "request_summary": _request_summary(request_metrics),
+        "agents_data": _agents_data(request_metrics)
+    }
+
+
+def _split_lookups(lookups: List[Tuple[Any, Optional[Dict[str, Any]]]]):
+    """Cache keys, known results (None for misses) and the indexes of the misses"""
+    keys = [key for key, _ in lookups]
+    results = [known for _, known in lookups]
+    misses = [i for i, known in enumerate(results) if known is None]
+    return keys, results, misses
+
+
+def _bundle_inputs(context, agent_name, input_data, output_data, decision_made, request_metrics) -> Dict[str, Any]:
+    return {
+        "context": context,
+        "agent_name": agent_name,
+        "input_data": input_data,
+        "output_data": output_data,
+        "decision_made": decision_made,
+        "request_summary": _request_summary(request_metrics),
+        "agents_data": _agents_data(request_metrics)
+    }
+
+
+def _bundle_error(e: Exception, quality, reasoning) -> Dict[str, Dict[str, Any]]:
+    """Error result of a failed bundled call, keeping sections that were cached"""
+    return {
+        "text_quality": quality or _text_quality_error(e),
+        "reasoning": reasoning or _reasoning_error(e),
+        "performance": _performance_error(e)
+    }
+
+
+def _report_inputs(request_metrics, text_quality_results, reasoning_results, performance_analysis) -> Dict[str, Any]:
+    # Compact JSON: the model doesn't need indentation, and whitespace is billed as prompt tokens
+    return {
+        "request_id": request_metrics.get('request_id', 'N/A'),
+        "total_time_ms": request_metrics.get('total_execution_time_ms', 0),
+        "total_tokens": request_metrics.get('total_tokens', 0),
+        "total_cost_usd": request_metrics.get('total_cost_usd', 0),
+        "agents_executed": len(request_metrics.get('agent_metrics', [])),
+        "text_quality_json": orjson.dumps(text_quality_results).decode(),
+        "reasoning_json": orjson.dumps(reasoning_results).decode(),
+        "performance_json": orjson.dumps(performance_analysis).decode(),
+    }
 
 
 class AIObservabilityAnalyzer:
@@ -21,7 +479,20 @@ class AIObservabilityAnalyzer:
     
     def __init__(self):
         self.llm = llm
+        # Analyses return validated objects when the model supports
+        # structured output; otherwise JSON is parsed out of the text
+        self.text_quality_chain = TEXT_QUALITY_PROMPT | _structured_llm(self.llm, TextQualityResult)
+        self.reasoning_chain = REASONING_PROMPT | _structured_llm(self.llm, ReasoningResult)
+        self.performance_chain = PERFORMANCE_PROMPT | _structured_llm(self.llm, PerformanceResult)
+        self.bundle_chain = BUNDLE_PROMPT | _structured_llm(self.llm, BundleResult)
+        self.report_chain = REPORT_PROMPT | self.llm
+        # ("text_quality", sha256(text), context) / ("reasoning", agent, sha256(input, output, decision)) -> analysis
+        self._cache: "OrderedDict[Tuple[str, ...], Dict[str, Any]]" = OrderedDict()
+        # Analyses run in to_thread workers too; OrderedDict reordering isn't thread-safe
+        self._cache_lock = threading.Lock()
         
+    # ---- sync API -------------------------------------------------------
+    
     def analyze_text_quality(self, text: str, context: str = "") -> Dict[str, Any]:
         """
         Analyze the quality of generated text
@@ -32,68 +503,15 @@ class AIObservabilityAnalyzer:
         - Clarity (0-10)
         - Professional tone (0-10)
         """
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", 
-             "You are an expert AI quality analyst. Analyze the quality of AI-generated text "
-             "and provide scores from 0-10 for the following dimensions:\n"
-             "- Coherence: How logically structured and consistent is the text?\n"
-             "- Completeness: Does it fully address the requirements?\n"
-             "- Clarity: How clear and understandable is it?\n"
-             "- Professional: Does it maintain appropriate professional tone?\n\n"
-             "Return ONLY a JSON object with this exact format:\n"
-             "{{\n"
-             '  "coherence_score": <0-10>,\n'
-             '  "completeness_score": <0-10>,\n'
-             '  "clarity_score": <0-10>,\n'
-             '  "professional_score": <0-10>,\n'
-             '  "overall_score": <0-10>,\n'
-             '  "issues": ["issue1", "issue2"],\n'
-             '  "strengths": ["strength1", "strength2"],\n'
-             '  "recommendation": "brief recommendation"\n'
-             "}}"),
-            ("user", 
-             f"Context: {context}\n\n"
-             f"Text to analyze:\n{text}\n\n"
-             "Provide your analysis in JSON format:")
-        ])
-        
+        key, known = self._text_quality_lookup(text, context)
+        if known is not None:
+            return known
         try:
-            chain = prompt | self.llm
-            response = chain.invoke({}).content
-            
-            # Extract JSON from response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                analysis = json.loads(json_str)
-            else:
-                # Fallback if JSON extraction fails
-                analysis = {
-                    "coherence_score": 7,
-                    "completeness_score": 7,
-                    "clarity_score": 7,
-                    "professional_score": 7,
-                    "overall_score": 7,
-                    "issues": ["Unable to fully analyze"],
-                    "strengths": ["Response generated"],
-                    "recommendation": "Manual review recommended"
-                }
-            
-            return analysis
-            
+            response = self.text_quality_chain.invoke({"context": context, "text": text})
         except Exception as e:
-            return {
-                "coherence_score": 5,
-                "completeness_score": 5,
-                "clarity_score": 5,
-                "professional_score": 5,
-                "overall_score": 5,
-                "issues": [f"Analysis error: {str(e)}"],
-                "strengths": [],
-                "recommendation": "Error during analysis"
-            }
+            return _text_quality_error(e)
+        # Fallback if JSON extraction fails
+        return self._cached_result(key, response, _TEXT_QUALITY_FALLBACK)
     
     def analyze_reasoning(self, agent_name: str, input_data: str, output_data: str, 
                          decision_made: str = "") -> Dict[str, Any]:
@@ -106,140 +524,112 @@ class AIObservabilityAnalyzer:
         - Reasoning explanation
         - Potential biases or issues
         """
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", 
-             "You are an expert in analyzing AI reasoning and decision-making processes. "
-             "Evaluate the agent's reasoning quality based on:\n"
-             "- Logic: Is the reasoning logically sound?\n"
-             "- Appropriateness: Is the decision appropriate for the input?\n"
-             "- Justification: Is the reasoning well-explained?\n"
-             "- Consistency: Is the decision consistent with best practices?\n\n"
-             "Return ONLY a JSON object with this format:\n"
-             "{{\n"
-             '  "logic_score": <0-10>,\n'
-             '  "appropriateness_score": <0-10>,\n'
-             '  "justification_score": <0-10>,\n'
-             '  "consistency_score": <0-10>,\n'
-             '  "overall_reasoning_score": <0-10>,\n'
-             '  "reasoning_explanation": "brief explanation",\n'
-             '  "potential_issues": ["issue1", "issue2"],\n'
-             '  "confidence_level": "high|medium|low"\n'
-             "}}"),
-            ("user", 
-             f"Agent: {agent_name}\n\n"
-             f"Input:\n{input_data}\n\n"
-             f"Output:\n{output_data}\n\n"
-             f"Decision Made: {decision_made}\n\n"
-             "Analyze the reasoning quality in JSON format:")
-        ])
-        
+        key, known = self._reasoning_lookup(agent_name, input_data, output_data, decision_made)
+        if known is not None:
+            return known
         try:
-            chain = prompt | self.llm
-            response = chain.invoke({}).content
-            
-            # Extract JSON
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                analysis = json.loads(json_str)
-            else:
-                analysis = {
-                    "logic_score": 7,
-                    "appropriateness_score": 7,
-                    "justification_score": 7,
-                    "consistency_score": 7,
-                    "overall_reasoning_score": 7,
-                    "reasoning_explanation": "Standard reasoning applied",
-                    "potential_issues": [],
-                    "confidence_level": "medium"
-                }
-            
-            return analysis
-            
+            response = self.reasoning_chain.invoke(
+                _reasoning_inputs(agent_name, input_data, output_data, decision_made)
+            )
         except Exception as e:
-            return {
-                "logic_score": 5,
-                "appropriateness_score": 5,
-                "justification_score": 5,
-                "consistency_score": 5,
-                "overall_reasoning_score": 5,
-                "reasoning_explanation": f"Analysis error: {str(e)}",
-                "potential_issues": ["Could not complete analysis"],
-                "confidence_level": "low"
-            }
+            return _reasoning_error(e)
+        return self._cached_result(key, response, _REASONING_FALLBACK)
+    
+    def analyze_text_quality_batch(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        analyze_text_quality() for several texts, with concurrent LLM calls
+        
+        Args:
+            items: (text, context) pairs
+        
+        Returns:
+            One result per item, in order
+        """
+        keys, results, misses = _split_lookups([self._text_quality_lookup(*item) for item in items])
+        if misses:
+            # Only items not answered by the trivial-text check or the cache
+            responses = self.text_quality_chain.batch(
+                [{"context": items[i][1], "text": items[i][0]} for i in misses],
+                config={"max_concurrency": ANALYSIS_BATCH_CONCURRENCY}, return_exceptions=True
+            )
+            self._fill_misses(results, keys, misses, responses, _TEXT_QUALITY_FALLBACK, _text_quality_error)
+        return results
+    
+    def analyze_reasoning_batch(self, items: List[Tuple[str, str, str, str]]) -> List[Dict[str, Any]]:
+        """
+        analyze_reasoning() for several agent decisions, with concurrent LLM calls
+        
+        Args:
+            items: (agent_name, input_data, output_data, decision_made) tuples
+        
+        Returns:
+            One result per item, in order
+        """
+        keys, results, misses = _split_lookups([self._reasoning_lookup(*item) for item in items])
+        if misses:
+            # Only decisions not answered by the no-op check or the cache
+            responses = self.reasoning_chain.batch(
+                [_reasoning_inputs(*items[i]) for i in misses],
+                config={"max_concurrency": ANALYSIS_BATCH_CONCURRENCY}, return_exceptions=True
+            )
+            self._fill_misses(results, keys, misses, responses, _REASONING_FALLBACK, _reasoning_error)
+        return results
     
     def analyze_request_performance(self, request_metrics: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze overall request performance and identify patterns or issues
         """
+        try:
+            response = self.performance_chain.invoke(_performance_inputs(request_metrics))
+            return _as_dict(response) or dict(_PERFORMANCE_FALLBACK)
+        except Exception as e:
+            return _performance_error(e)
+    
+    def analyze_bundle(
+        self,
+        text: str,
+        context: str,
+        agent_name: str,
+        input_data: str,
+        output_data: str,
+        decision_made: str,
+        request_metrics: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Text quality, reasoning and performance analysis in a single LLM call
         
-        agents_data = "\n".join([
-            f"- {am['agent_name']}: {am['execution_time_ms']:.0f}ms, "
-            f"{am['total_tokens']} tokens, ${am['estimated_cost_usd']:.4f}"
-            for am in request_metrics.get("agent_metrics", [])
-        ])
+        Text quality and reasoning results are cached by content hash; when
+        both are cached only the (per-request) performance analysis runs.
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", 
-             "You are an expert in analyzing AI system performance. "
-             "Review the execution metrics and provide insights about:\n"
-             "- Performance bottlenecks\n"
-             "- Cost optimization opportunities\n"
-             "- Efficiency improvements\n"
-             "- Unusual patterns or anomalies\n\n"
-             "Return ONLY a JSON object:\n"
-             "{{\n"
-             '  "performance_score": <0-10>,\n'
-             '  "cost_efficiency_score": <0-10>,\n'
-             '  "bottlenecks": ["bottleneck1"],\n'
-             '  "optimization_suggestions": ["suggestion1"],\n'
-             '  "anomalies_detected": ["anomaly1"],\n'
-             '  "summary": "brief summary"\n'
-             "}}"),
-            ("user", 
-             f"Request Metrics:\n"
-             f"- Total Time: {request_metrics.get('total_execution_time_ms', 0):.0f}ms\n"
-             f"- Total Tokens: {request_metrics.get('total_tokens', 0)}\n"
-             f"- Total Cost: ${request_metrics.get('total_cost_usd', 0):.4f}\n"
-             f"- Strategy: {request_metrics.get('strategy', 'unknown')}\n"
-             f"- Success: {request_metrics.get('success', False)}\n\n"
-             f"Agent Executions:\n{agents_data}\n\n"
-             "Analyze in JSON format:")
-        ])
+        Args:
+            text: Generated text to rate
+            context: Short context for the text quality analysis
+            agent_name: Agent that produced the output
+            input_data: Agent input
+            output_data: Agent output
+            decision_made: Decision taken by the agent
+            request_metrics: Request metrics dict (with agent_metrics)
         
-        try:
-            chain = prompt | self.llm
-            response = chain.invoke({}).content
-            
-            # Extract JSON
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                analysis = json.loads(json_str)
-            else:
-                analysis = {
-                    "performance_score": 7,
-                    "cost_efficiency_score": 7,
-                    "bottlenecks": [],
-                    "optimization_suggestions": [],
-                    "anomalies_detected": [],
-                    "summary": "Standard performance"
-                }
-            
-            return analysis
-            
-        except Exception as e:
+        Returns:
+            {"text_quality": {...}, "reasoning": {...}, "performance": {...}}
+            with the same keys as analyze_text_quality(), analyze_reasoning()
+            and analyze_request_performance()
+        """
+        keys, quality, reasoning = self._bundle_lookup(text, context, agent_name, input_data, output_data, decision_made)
+        if quality is not None and reasoning is not None:
             return {
-                "performance_score": 5,
-                "cost_efficiency_score": 5,
-                "bottlenecks": [],
-                "optimization_suggestions": [],
-                "anomalies_detected": [f"Analysis error: {str(e)}"],
-                "summary": "Could not complete performance analysis"
+                "text_quality": quality,
+                "reasoning": reasoning,
+                "performance": self.analyze_request_performance(request_metrics)
             }
+        
+        try:
+            response = self.bundle_chain.invoke(_bundle_inputs(
+                context, agent_name, input_data, output_data, decision_made, request_metrics
+            ))
+        except Exception as e:
+            return _bundle_error(e, quality, reasoning)
+        return self._bundle_result(response, keys, quality, reasoning)
     
     def generate_comprehensive_report(
         self,
@@ -251,38 +641,298 @@ class AIObservabilityAnalyzer:
         """
         Generate a comprehensive observability report using AI
         """
-        text_quality_json = json.dumps(text_quality_results, indent=2)
-        reasoning_json = json.dumps(reasoning_results, indent=2)
-        performance_json = json.dumps(performance_analysis, indent=2)
+        return "".join(self.stream_comprehensive_report(
+            request_metrics, text_quality_results, reasoning_results, performance_analysis
+        ))
+    
+    def stream_comprehensive_report(
+        self,
+        request_metrics: Dict[str, Any],
+        text_quality_results: List[Dict[str, Any]],
+        reasoning_results: List[Dict[str, Any]],
+        performance_analysis: Dict[str, Any]
+    ) -> Iterator[str]:
+        """
+        Streaming variant of generate_comprehensive_report()
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", 
-             "You are an AI Observability expert. Generate a comprehensive, actionable report "
-             "summarizing the AI system's performance, quality, and areas for improvement."),
-            ("user", 
-             f"Generate an observability report for request {request_metrics.get('request_id', 'N/A')}:\n\n"
-             f"**Performance Metrics:**\n"
-             f"- Total execution time: {request_metrics.get('total_execution_time_ms', 0):.0f}ms\n"
-             f"- Total tokens used: {request_metrics.get('total_tokens', 0)}\n"
-             f"- Total cost: ${request_metrics.get('total_cost_usd', 0):.4f}\n"
-             f"- Agents executed: {len(request_metrics.get('agent_metrics', []))}\n\n"
-             f"**Quality Analysis:**\n"
-             "{text_quality_json}\n\n"
-             f"**Reasoning Analysis:**\n"
-             "{reasoning_json}\n\n"
-             f"**Performance Analysis:**\n"
-             "{performance_json}\n\n"
-             "Provide a clear, structured report with key findings and recommendations.")
-        ])
+        Yields:
+            Report text chunks as the model produces them; an error message
+            if generation fails
+        """
+        try:
+            for chunk in self.report_chain.stream(_report_inputs(
+                request_metrics, text_quality_results, reasoning_results, performance_analysis
+            )):
+                yield chunk.content
+        except Exception as e:
+            yield f"Error generating comprehensive report: {str(e)}"
+    
+    def analyze_all(
+        self,
+        agent_name: str,
+        input_text: str,
+        output_text: str,
+        request_metrics: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Synchronous entry point for aanalyze_all()
         
+        Must not be called from a running event loop (the recommendation
+        service finalizes observability in a worker thread).
+        """
+        return asyncio.run(self.aanalyze_all(agent_name, input_text, output_text, request_metrics))
+    
+    # ---- async API ------------------------------------------------------
+    
+    async def aanalyze_text_quality(self, text: str, context: str = "") -> Dict[str, Any]:
+        """Async variant of analyze_text_quality()"""
+        key, known = self._text_quality_lookup(text, context)
+        if known is not None:
+            return known
         try:
-            chain = prompt | self.llm
-            response = chain.invoke({
-                "text_quality_json": text_quality_json,
-                "reasoning_json": reasoning_json,
-                "performance_json": performance_json,
-            }).content
-            return response
+            response = await self.text_quality_chain.ainvoke({"context": context, "text": text})
         except Exception as e:
-            return f"Error generating comprehensive report: {str(e)}"
-
+            return _text_quality_error(e)
+        return self._cached_result(key, response, _TEXT_QUALITY_FALLBACK)
+    
+    async def aanalyze_reasoning(self, agent_name: str, input_data: str, output_data: str,
+                                 decision_made: str = "") -> Dict[str, Any]:
+        """Async variant of analyze_reasoning()"""
+        key, known = self._reasoning_lookup(agent_name, input_data, output_data, decision_made)
+        if known is not None:
+            return known
+        try:
+            response = await self.reasoning_chain.ainvoke(
+                _reasoning_inputs(agent_name, input_data, output_data, decision_made)
+            )
+        except Exception as e:
+            return _reasoning_error(e)
+        return self._cached_result(key, response, _REASONING_FALLBACK)
+    
+    async def aanalyze_text_quality_batch(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Async variant of analyze_text_quality_batch()"""
+        keys, results, misses = _split_lookups([self._text_quality_lookup(*item) for item in items])
+        if misses:
+            responses = await self.text_quality_chain.abatch(
+                [{"context": items[i][1], "text": items[i][0]} for i in misses],
+                config={"max_concurrency": ANALYSIS_BATCH_CONCURRENCY}, return_exceptions=True
+            )
+            self._fill_misses(results, keys, misses, responses, _TEXT_QUALITY_FALLBACK, _text_quality_error)
+        return results
+    
+    async def aanalyze_reasoning_batch(self, items: List[Tuple[str, str, str, str]]) -> List[Dict[str, Any]]:
+        """Async variant of analyze_reasoning_batch()"""
+        keys, results, misses = _split_lookups([self._reasoning_lookup(*item) for item in items])
+        if misses:
+            responses = await self.reasoning_chain.abatch(
+                [_reasoning_inputs(*items[i]) for i in misses],
+                config={"max_concurrency": ANALYSIS_BATCH_CONCURRENCY}, return_exceptions=True
+            )
+            self._fill_misses(results, keys, misses, responses, _REASONING_FALLBACK, _reasoning_error)
+        return results
+    
+    async def aanalyze_request_performance(self, request_metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of analyze_request_performance()"""
+        try:
+            response = await self.performance_chain.ainvoke(_performance_inputs(request_metrics))
+            return _as_dict(response) or dict(_PERFORMANCE_FALLBACK)
+        except Exception as e:
+            return _performance_error(e)
+    
+    async def aanalyze_bundle(
+        self,
+        text: str,
+        context: str,
+        agent_name: str,
+        input_data: str,
+        output_data: str,
+        decision_made: str,
+        request_metrics: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Async variant of analyze_bundle()"""
+        keys, quality, reasoning = self._bundle_lookup(text, context, agent_name, input_data, output_data, decision_made)
+        if quality is not None and reasoning is not None:
+            return {
+                "text_quality": quality,
+                "reasoning": reasoning,
+                "performance": await self.aanalyze_request_performance(request_metrics)
+            }
+        
+        try:
+            response = await self.bundle_chain.ainvoke(_bundle_inputs(
+                context, agent_name, input_data, output_data, decision_made, request_metrics
+            ))
+        except Exception as e:
+            return _bundle_error(e, quality, reasoning)
+        return self._bundle_result(response, keys, quality, reasoning)
+    
+    async def agenerate_comprehensive_report(
+        self,
+        request_metrics: Dict[str, Any],
+        text_quality_results: List[Dict[str, Any]],
+        reasoning_results: List[Dict[str, Any]],
+        performance_analysis: Dict[str, Any]
+    ) -> str:
+        """Async variant of generate_comprehensive_report()"""
+        return "".join([chunk async for chunk in self.astream_comprehensive_report(
+            request_metrics, text_quality_results, reasoning_results, performance_analysis
+        )])
+    
+    async def astream_comprehensive_report(
+        self,
+        request_metrics: Dict[str, Any],
+        text_quality_results: List[Dict[str, Any]],
+        reasoning_results: List[Dict[str, Any]],
+        performance_analysis: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Async variant of stream_comprehensive_report()"""
+        try:
+            async for chunk in self.report_chain.astream(_report_inputs(
+                request_metrics, text_quality_results, reasoning_results, performance_analysis
+            )):
+                yield chunk.content
+        except Exception as e:
+            yield f"Error generating comprehensive report: {str(e)}"
+    
+    async def aanalyze_all(
+        self,
+        agent_name: str,
+        input_text: str,
+        output_text: str,
+        request_metrics: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Run every analysis for one agent execution, then the comprehensive report
+        
+        Independent analyses run concurrently: with input and output text the
+        bundled call covers all three; with only output text the text quality
+        and performance calls are gathered. The report needs their results, so
+        it runs last.
+        
+        Args:
+            agent_name: Agent whose execution is analyzed
+            input_text: Serialized agent input (may be empty)
+            output_text: Serialized agent output (may be empty)
+            request_metrics: Request metrics dict (with agent_metrics)
+        
+        Returns:
+            Dict with text_quality, reasoning_analysis, performance_analysis
+            and comprehensive_report
+        """
+        text_quality_results = []
+        reasoning_results = []
+        
+        if input_text and output_text:
+            bundle = await self.aanalyze_bundle(
+                text=output_text,
+                context=f"Agent: {agent_name}",
+                agent_name=agent_name,
+                input_data=input_text,
+                output_data=output_text,
+                decision_made="",
+                request_metrics=request_metrics
+            )
+            quality = bundle["text_quality"]
+            quality["agent_name"] = agent_name
+            text_quality_results.append(quality)
+            reasoning_results.append(bundle["reasoning"])
+            performance = bundle["performance"]
+        elif output_text:
+            quality, performance = await asyncio.gather(
+                self.aanalyze_text_quality(text=output_text, context=f"Agent: {agent_name}"),
+                self.aanalyze_request_performance(request_metrics)
+            )
+            quality["agent_name"] = agent_name
+            text_quality_results.append(quality)
+        else:
+            performance = await self.aanalyze_request_performance(request_metrics)
+        
+        report = await self.agenerate_comprehensive_report(
+            request_metrics=request_metrics,
+            text_quality_results=text_quality_results,
+            reasoning_results=reasoning_results,
+            performance_analysis=performance
+        )
+        
+        return {
+            "text_quality": text_quality_results,
+            "reasoning_analysis": reasoning_results,
+            "performance_analysis": performance,
+            "comprehensive_report": report
+        }
+    
+    # ---- cache helpers --------------------------------------------------
+    
+    def _cache_get(self, key: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+        return dict(cached)
+    
+    def _cache_put(self, key: Tuple[str, ...], analysis: Dict[str, Any]) -> None:
+        analysis = dict(analysis)
+        with self._cache_lock:
+            self._cache[key] = analysis
+            if len(self._cache) > ANALYSIS_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _text_quality_lookup(self, text: str, context: str):
+        """Cache key plus the result when known without an LLM call (trivial text or cache hit)"""
+        if _is_trivial_text(text):
+            return None, dict(_TEXT_QUALITY_TRIVIAL)
+        key = ("text_quality", _digest(text), context)
+        return key, self._cache_get(key)
+    
+    def _reasoning_lookup(self, agent_name: str, input_data: str, output_data: str, decision_made: str):
+        """Cache key plus the result when known without an LLM call (no-op agent or cache hit)"""
+        if input_data == output_data:
+            return None, dict(_REASONING_NOOP)
+        key = ("reasoning", agent_name, _digest(input_data, output_data, decision_made))
+        return key, self._cache_get(key)
+    
+    def _cached_result(self, key: Tuple[str, ...], response: Any, fallback) -> Dict[str, Any]:
+        """Parsed analysis, cached on success; the fallback (uncached) otherwise"""
+        result = _as_dict(response)
+        if result is None:
+            return dict(fallback)
+        self._cache_put(key, result)
+        return result
+    
+    def _fill_misses(self, results, keys, misses, responses, fallback, on_error) -> None:
+        """Fill the missed batch items from their responses (return_exceptions=True), caching them"""
+        for i, response in zip(misses, responses):
+            if isinstance(response, Exception):
+                results[i] = on_error(response)
+            else:
+                results[i] = self._cached_result(keys[i], response, fallback)
+    
+    def _bundle_lookup(self, text, context, agent_name, input_data, output_data, decision_made):
+        """Cache keys plus known (text quality, reasoning) results, None when missing"""
+        quality_key, quality = self._text_quality_lookup(text, context)
+        reasoning_key, reasoning = self._reasoning_lookup(agent_name, input_data, output_data, decision_made)
+        return (quality_key, reasoning_key), quality, reasoning
+    
+    def _bundle_result(self, response: Any, keys, quality, reasoning) -> Dict[str, Dict[str, Any]]:
+        """Split a bundled answer into its sections, caching the new ones"""
+        quality_key, reasoning_key = keys
+        bundle = _as_dict(response) or {}
+        
+        if quality is None:
+            quality = bundle.get("text_quality")
+            if isinstance(quality, dict):
+                self._cache_put(quality_key, quality)
+            else:
+                quality = dict(_TEXT_QUALITY_FALLBACK)
+        if reasoning is None:
+            reasoning = bundle.get("reasoning")
+            if isinstance(reasoning, dict):
+                self._cache_put(reasoning_key, reasoning)
+            else:
+                reasoning = dict(_REASONING_FALLBACK)
+        performance = bundle.get("performance")
+        if not isinstance(performance, dict):
+            performance = dict(_PERFORMANCE_FALLBACK)
+        
+        return {"text_quality": quality, "reasoning": reasoning, "performance": performance}
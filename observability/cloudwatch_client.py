@@ -0,0 +1,43 @@
+"""
+CloudWatch Client - Shared boto3 session and CloudWatch clients
+"""
+
+from functools import lru_cache
+
+import boto3
+from botocore.config import Config
+
+# Client settings: keep-alive connections for the publisher's frequent
+# put_metric_data calls, adaptive retries for CloudWatch throttling and gzip
+# request bodies (PutMetricData supports compression; batches of metric names
+# and dimensions compress well)
+CLOUDWATCH_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    tcp_keepalive=True,
+    disable_request_compression=False,
+    request_min_compression_size_bytes=1024
+)
+
+
+@lru_cache(maxsize=1)
+def _session() -> boto3.session.Session:
+    """Process-wide boto3 session, so service models are loaded once"""
+    return boto3.session.Session()
+
+
+@lru_cache(maxsize=None)
+def get_cloudwatch_client(region_name: str):
+    """
+    CloudWatch client for a region, shared by the whole process
+    
+    boto3 clients are thread-safe, so the publisher's worker and the
+    dashboard manager can use the same client and connection pool.
+    
+    Args:
+        region_name: AWS region
+        
+    Returns:
+        boto3 CloudWatch client
+    """
+    return _session().client('cloudwatch', region_name=region_name, config=CLOUDWATCH_CLIENT_CONFIG)
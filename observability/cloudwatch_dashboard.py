@@ -2,12 +2,155 @@
 CloudWatch Dashboard - Creates and manages CloudWatch dashboards for observability
 """
 
-import boto3
+import hashlib
 import json
+import logging
 import os
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from typing import Any, Iterator, List, Optional
 from botocore.exceptions import ClientError
 
+try:
+    from .cloudwatch_client import get_cloudwatch_client
+except ImportError:  # run as a script: python cloudwatch_dashboard.py
+    from cloudwatch_client import get_cloudwatch_client
+
+logger = logging.getLogger(__name__)
+
+# Native JSON encoder when available (DashboardBody must be a str)
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
+# Max concurrent put_metric_alarm calls in create_alarms()
+MAX_ALARM_WORKERS = 8
+
+# put_metric_alarm parameters shared by every alarm
+ALARM_COMMON_PARAMS = {
+    'Statistic': 'Average',
+    'Period': 300,  # 5 minutes
+    'ActionsEnabled': False  # Enable and configure SNS topics as needed
+}
+
+# Dashboard layout: (title, y, x, width, height, metric rows without the namespace)
+DASHBOARD_WIDGETS = (
+    # Row 1: Overview metrics
+    ("Request Success Rate", 0, 0, 8, 6, (
+        ("RequestSuccess", {"stat": "Average", "label": "Success Rate"}),
+    )),
+    ("Total Requests", 0, 8, 8, 6, (
+        ("RequestSuccess", {"stat": "SampleCount", "label": "Total Requests"}),
+    )),
+    ("Execution Time (p50, p90, p99)", 0, 16, 8, 6, (
+        ("ExecutionTime", {"stat": "p50", "label": "p50"}),
+        ("ExecutionTime", {"stat": "p90", "label": "p90"}),
+        ("ExecutionTime", {"stat": "p99", "label": "p99"}),
+    )),
+    # Row 2: Token and Cost metrics
+    ("Total Tokens Used", 6, 0, 8, 6, (
+        ("TotalTokens", {"stat": "Sum", "label": "Total Tokens"}),
+    )),
+    ("Average Tokens per Request", 6, 8, 8, 6, (
+        ("TotalTokens", {"stat": "Average", "label": "Avg Tokens"}),
+    )),
+    ("Total Cost (USD)", 6, 16, 8, 6, (
+        ("TotalCost", {"stat": "Sum", "label": "Total Cost"}),
+    )),
+    # Row 3: Agent-level metrics
+    ("Agent Execution Time by Agent", 12, 0, 12, 6, (
+        ("AgentExecutionTime", {"stat": "Average"}),
+    )),
+    ("Agent Success Rate", 12, 12, 12, 6, (
+        ("AgentSuccess", {"stat": "Average", "label": "Agent Success Rate"}),
+    )),
+    # Row 4: Recommendations and Agents
+    ("Recommendations Generated", 18, 0, 12, 6, (
+        ("RecommendationsCount", {"stat": "Sum", "label": "Total Recommendations"}),
+        ("RecommendationsCount", {"stat": "Average", "label": "Avg per Request"}),
+    )),
+    ("Agents Executed per Request", 18, 12, 12, 6, (
+        ("AgentsExecutedCount", {"stat": "Average", "label": "Avg Agents"}),
+    )),
+    # Row 5: Performance by Urgency
+    ("Execution Time by Urgency", 24, 0, 12, 6, (
+        ("ExecutionTime", "Urgency", "critical", {"stat": "Average", "label": "Critical"}),
+        ("ExecutionTime", "Urgency", "high", {"stat": "Average", "label": "High"}),
+        ("ExecutionTime", "Urgency", "medium", {"stat": "Average", "label": "Medium"}),
+        ("ExecutionTime", "Urgency", "low", {"stat": "Average", "label": "Low"}),
+    )),
+    ("Cost by Urgency", 24, 12, 12, 6, (
+        ("TotalCost", "Urgency", "critical", {"stat": "Sum", "label": "Critical"}),
+        ("TotalCost", "Urgency", "high", {"stat": "Sum", "label": "High"}),
+        ("TotalCost", "Urgency", "medium", {"stat": "Sum", "label": "Medium"}),
+        ("TotalCost", "Urgency", "low", {"stat": "Sum", "label": "Low"}),
+    )),
+    # Row 6: Drift Detection
+    ("Drift Detected", 30, 0, 8, 6, (
+        ("DriftDetected", {"stat": "Sum", "label": "Drift Events"}),
+    )),
+    ("Drift Severity", 30, 8, 8, 6, (
+        ("DriftSeverity", {"stat": "Maximum", "label": "Max Severity"}),
+    )),
+    ("Mean Execution Time (Drift Monitoring)", 30, 16, 8, 6, (
+        ("MeanExecutionTime", {"stat": "Average", "label": "Mean Exec Time"}),
+    )),
+    # Row 7: AI Analysis Quality Metrics
+    ("Text Quality Scores", 36, 0, 12, 6, (
+        ("TextClarityScore", {"stat": "Average", "label": "Clarity"}),
+        ("TextCompletenessScore", {"stat": "Average", "label": "Completeness"}),
+        ("TextOverallScore", {"stat": "Average", "label": "Overall"}),
+    )),
+    ("Efficiency Score", 36, 12, 12, 6, (
+        ("EfficiencyScore", {"stat": "Average", "label": "Efficiency"}),
+    )),
+)
+
+
+# Properties shared by every widget (metrics, region and title are added per widget)
+_WIDGET_PROPERTIES = {
+    "period": 300,
+    "stat": "Average",
+    "yAxis": {
+        "left": {
+            "showUnits": False
+        }
+    },
+    "view": "timeSeries",
+    "stacked": False
+}
+
+
+def _body_digest(body: str) -> bytes:
+    return hashlib.blake2b(body.encode(), digest_size=16).digest()
+
+
+@lru_cache(maxsize=4)
+def _dashboard_body(namespace: str, region_name: str) -> str:
+    """Serialized dashboard body, built once per namespace/region"""
+    return _dumps({
+        "widgets": [
+            {
+                "type": "metric",
+                "x": x_pos,
+                "y": y_pos,
+                "width": width,
+                "height": height,
+                "properties": {
+                    "metrics": [[namespace, *row] for row in rows],
+                    **_WIDGET_PROPERTIES,
+                    "region": region_name,
+                    "title": title
+                }
+            }
+            for title, y_pos, x_pos, width, height, rows in DASHBOARD_WIDGETS
+        ]
+    })
+
 
 class CloudWatchDashboard:
     """
@@ -29,13 +172,22 @@ class CloudWatchDashboard:
         self.dashboard_name = dashboard_name
         self.region_name = region_name or os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
         self.namespace = "LangChainService/Observability"
-        
-        try:
-            self.cloudwatch = boto3.client('cloudwatch', region_name=self.region_name)
-            print(f"✅ CloudWatch dashboard manager initialized for region: {self.region_name}")
-        except Exception as e:
-            print(f"⚠️  Warning: Could not initialize CloudWatch client: {e}")
-            raise
+        # boto3 client, created on first use (loading the service model is slow)
+        self._cloudwatch = None
+        # blake2b digest of the body last uploaded or found up to date
+        self._uploaded_digest: Optional[bytes] = None
+    
+    @property
+    def cloudwatch(self):
+        """CloudWatch client, created on first access"""
+        if self._cloudwatch is None:
+            try:
+                self._cloudwatch = get_cloudwatch_client(self.region_name)
+                logger.info("✅ CloudWatch dashboard manager initialized for region: %s", self.region_name)
+            except Exception as e:
+                logger.warning("⚠️  Warning: Could not initialize CloudWatch client: %s", e)
+                raise
+        return self._cloudwatch
     
     def create_comprehensive_dashboard(self) -> bool:
         """
@@ -45,275 +197,41 @@ class CloudWatchDashboard:
             True if successful, False otherwise
         """
         try:
-            dashboard_body = {
-                "widgets": [
-                    # Row 1: Overview metrics
-                    self._create_metric_widget(
-                        title="Request Success Rate",
-                        metrics=[
-                            [self.namespace, "RequestSuccess", {"stat": "Average", "label": "Success Rate"}]
-                        ],
-                        y_pos=0,
-                        x_pos=0,
-                        width=8,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Total Requests",
-                        metrics=[
-                            [self.namespace, "RequestSuccess", {"stat": "SampleCount", "label": "Total Requests"}]
-                        ],
-                        y_pos=0,
-                        x_pos=8,
-                        width=8,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Execution Time (p50, p90, p99)",
-                        metrics=[
-                            [self.namespace, "ExecutionTime", {"stat": "p50", "label": "p50"}],
-                            [self.namespace, "ExecutionTime", {"stat": "p90", "label": "p90"}],
-                            [self.namespace, "ExecutionTime", {"stat": "p99", "label": "p99"}]
-                        ],
-                        y_pos=0,
-                        x_pos=16,
-                        width=8,
-                        height=6
-                    ),
-                    
-                    # Row 2: Token and Cost metrics
-                    self._create_metric_widget(
-                        title="Total Tokens Used",
-                        metrics=[
-                            [self.namespace, "TotalTokens", {"stat": "Sum", "label": "Total Tokens"}]
-                        ],
-                        y_pos=6,
-                        x_pos=0,
-                        width=8,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Average Tokens per Request",
-                        metrics=[
-                            [self.namespace, "TotalTokens", {"stat": "Average", "label": "Avg Tokens"}]
-                        ],
-                        y_pos=6,
-                        x_pos=8,
-                        width=8,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Total Cost (USD)",
-                        metrics=[
-                            [self.namespace, "TotalCost", {"stat": "Sum", "label": "Total Cost"}]
-                        ],
-                        y_pos=6,
-                        x_pos=16,
-                        width=8,
-                        height=6
-                    ),
-                    
-                    # Row 3: Agent-level metrics
-                    self._create_metric_widget(
-                        title="Agent Execution Time by Agent",
-                        metrics=[
-                            [self.namespace, "AgentExecutionTime", {"stat": "Average"}]
-                        ],
-                        y_pos=12,
-                        x_pos=0,
-                        width=12,
-                        height=6,
-                        period=300
-                    ),
-                    self._create_metric_widget(
-                        title="Agent Success Rate",
-                        metrics=[
-                            [self.namespace, "AgentSuccess", {"stat": "Average", "label": "Agent Success Rate"}]
-                        ],
-                        y_pos=12,
-                        x_pos=12,
-                        width=12,
-                        height=6
-                    ),
-                    
-                    # Row 4: Recommendations and Agents
-                    self._create_metric_widget(
-                        title="Recommendations Generated",
-                        metrics=[
-                            [self.namespace, "RecommendationsCount", {"stat": "Sum", "label": "Total Recommendations"}],
-                            [self.namespace, "RecommendationsCount", {"stat": "Average", "label": "Avg per Request"}]
-                        ],
-                        y_pos=18,
-                        x_pos=0,
-                        width=12,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Agents Executed per Request",
-                        metrics=[
-                            [self.namespace, "AgentsExecutedCount", {"stat": "Average", "label": "Avg Agents"}]
-                        ],
-                        y_pos=18,
-                        x_pos=12,
-                        width=12,
-                        height=6
-                    ),
-                    
-                    # Row 5: Performance by Urgency
-                    self._create_metric_widget(
-                        title="Execution Time by Urgency",
-                        metrics=[
-                            [self.namespace, "ExecutionTime", "Urgency", "critical", {"stat": "Average", "label": "Critical"}],
-                            [self.namespace, "ExecutionTime", "Urgency", "high", {"stat": "Average", "label": "High"}],
-                            [self.namespace, "ExecutionTime", "Urgency", "medium", {"stat": "Average", "label": "Medium"}],
-                            [self.namespace, "ExecutionTime", "Urgency", "low", {"stat": "Average", "label": "Low"}]
-                        ],
-                        y_pos=24,
-                        x_pos=0,
-                        width=12,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Cost by Urgency",
-                        metrics=[
-                            [self.namespace, "TotalCost", "Urgency", "critical", {"stat": "Sum", "label": "Critical"}],
-                            [self.namespace, "TotalCost", "Urgency", "high", {"stat": "Sum", "label": "High"}],
-                            [self.namespace, "TotalCost", "Urgency", "medium", {"stat": "Sum", "label": "Medium"}],
-                            [self.namespace, "TotalCost", "Urgency", "low", {"stat": "Sum", "label": "Low"}]
-                        ],
-                        y_pos=24,
-                        x_pos=12,
-                        width=12,
-                        height=6
-                    ),
-                    
-                    # Row 6: Drift Detection
-                    self._create_metric_widget(
-                        title="Drift Detected",
-                        metrics=[
-                            [self.namespace, "DriftDetected", {"stat": "Sum", "label": "Drift Events"}]
-                        ],
-                        y_pos=30,
-                        x_pos=0,
-                        width=8,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Drift Severity",
-                        metrics=[
-                            [self.namespace, "DriftSeverity", {"stat": "Maximum", "label": "Max Severity"}]
-                        ],
-                        y_pos=30,
-                        x_pos=8,
-                        width=8,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Mean Execution Time (Drift Monitoring)",
-                        metrics=[
-                            [self.namespace, "MeanExecutionTime", {"stat": "Average", "label": "Mean Exec Time"}]
-                        ],
-                        y_pos=30,
-                        x_pos=16,
-                        width=8,
-                        height=6
-                    ),
-                    
-                    # Row 7: AI Analysis Quality Metrics
-                    self._create_metric_widget(
-                        title="Text Quality Scores",
-                        metrics=[
-                            [self.namespace, "TextClarityScore", {"stat": "Average", "label": "Clarity"}],
-                            [self.namespace, "TextCompletenessScore", {"stat": "Average", "label": "Completeness"}],
-                            [self.namespace, "TextOverallScore", {"stat": "Average", "label": "Overall"}]
-                        ],
-                        y_pos=36,
-                        x_pos=0,
-                        width=12,
-                        height=6
-                    ),
-                    self._create_metric_widget(
-                        title="Efficiency Score",
-                        metrics=[
-                            [self.namespace, "EfficiencyScore", {"stat": "Average", "label": "Efficiency"}]
-                        ],
-                        y_pos=36,
-                        x_pos=12,
-                        width=12,
-                        height=6
-                    )
-                ]
-            }
+            dashboard_body = _dashboard_body(self.namespace, self.region_name)
+            digest = _body_digest(dashboard_body)
             
-            # Create or update the dashboard
-            self.cloudwatch.put_dashboard(
-                DashboardName=self.dashboard_name,
-                DashboardBody=json.dumps(dashboard_body)
-            )
+            # Create or update the dashboard, unless it already has this body
+            if digest == self._uploaded_digest or self._remote_digest() == digest:
+                logger.info("✅ CloudWatch dashboard is up to date: %s", self.dashboard_name)
+            else:
+                self.cloudwatch.put_dashboard(
+                    DashboardName=self.dashboard_name,
+                    DashboardBody=dashboard_body
+                )
+                logger.info("✅ CloudWatch dashboard created successfully!")
+            self._uploaded_digest = digest
             
             dashboard_url = f"https://{self.region_name}.console.aws.amazon.com/cloudwatch/home?region={self.region_name}#dashboards:name={self.dashboard_name}"
             
-            print(f"✅ CloudWatch dashboard created successfully!")
-            print(f"📊 Dashboard name: {self.dashboard_name}")
-            print(f"🔗 Dashboard URL: {dashboard_url}")
+            logger.info("📊 Dashboard name: %s", self.dashboard_name)
+            logger.info("🔗 Dashboard URL: %s", dashboard_url)
             
             return True
             
         except ClientError as e:
-            print(f"❌ Error creating CloudWatch dashboard: {e}")
+            logger.error("❌ Error creating CloudWatch dashboard: %s", e)
             return False
         except Exception as e:
-            print(f"❌ Unexpected error creating CloudWatch dashboard: {e}")
+            logger.error("❌ Unexpected error creating CloudWatch dashboard: %s", e)
             return False
     
-    def _create_metric_widget(
-        self,
-        title: str,
-        metrics: List[List],
-        y_pos: int,
-        x_pos: int,
-        width: int = 12,
-        height: int = 6,
-        period: int = 300,
-        stat: str = None
-    ) -> Dict[str, Any]:
-        """
-        Create a metric widget configuration
-        
-        Args:
-            title: Widget title
-            metrics: List of metric specifications
-            y_pos: Y position in dashboard grid
-            x_pos: X position in dashboard grid
-            width: Widget width
-            height: Widget height
-            period: Metric period in seconds
-            stat: Default statistic (if not specified in metrics)
-            
-        Returns:
-            Widget configuration dictionary
-        """
-        return {
-            "type": "metric",
-            "x": x_pos,
-            "y": y_pos,
-            "width": width,
-            "height": height,
-            "properties": {
-                "metrics": metrics,
-                "period": period,
-                "stat": stat or "Average",
-                "region": self.region_name,
-                "title": title,
-                "yAxis": {
-                    "left": {
-                        "showUnits": False
-                    }
-                },
-                "view": "timeSeries",
-                "stacked": False
-            }
-        }
+    def _remote_digest(self) -> Optional[bytes]:
+        """Digest of the deployed dashboard body, None if it doesn't exist"""
+        try:
+            response = self.cloudwatch.get_dashboard(DashboardName=self.dashboard_name)
+        except ClientError:
+            return None
+        return _body_digest(response.get('DashboardBody', ''))
     
     def delete_dashboard(self) -> bool:
         """
@@ -326,41 +244,54 @@ class CloudWatchDashboard:
             self.cloudwatch.delete_dashboards(
                 DashboardNames=[self.dashboard_name]
             )
-            print(f"✅ Dashboard '{self.dashboard_name}' deleted successfully")
+            self._uploaded_digest = None
+            logger.info("✅ Dashboard '%s' deleted successfully", self.dashboard_name)
             return True
             
         except ClientError as e:
             if e.response['Error']['Code'] == 'ResourceNotFound':
-                print(f"Dashboard '{self.dashboard_name}' does not exist")
+                logger.info("Dashboard '%s' does not exist", self.dashboard_name)
             else:
-                print(f"❌ Error deleting dashboard: {e}")
+                logger.error("❌ Error deleting dashboard: %s", e)
             return False
         except Exception as e:
-            print(f"❌ Unexpected error deleting dashboard: {e}")
+            logger.error("❌ Unexpected error deleting dashboard: %s", e)
             return False
     
+    def iter_dashboards(self) -> Iterator[str]:
+        """
+        Iterate over CloudWatch dashboard names, fetching pages on demand
+        
+        Yields:
+            Dashboard names
+        """
+        paginator = self.cloudwatch.get_paginator('list_dashboards')
+        for page in paginator.paginate():
+            for entry in page.get('DashboardEntries', []):
+                yield entry['DashboardName']
+    
     def list_dashboards(self) -> List[str]:
         """
-        List all CloudWatch dashboards
+        List all CloudWatch dashboards (every page)
         
         Returns:
             List of dashboard names
         """
         try:
-            response = self.cloudwatch.list_dashboards()
-            dashboards = [d['DashboardName'] for d in response.get('DashboardEntries', [])]
+            dashboards = list(self.iter_dashboards())
             
             if dashboards:
-                print(f"📊 Found {len(dashboards)} dashboard(s):")
-                for name in dashboards:
-                    print(f"   • {name}")
+                logger.info("📊 Found %d dashboard(s):", len(dashboards))
+                if logger.isEnabledFor(logging.INFO):
+                    for name in dashboards:
+                        logger.info("   • %s", name)
             else:
-                print("No dashboards found")
+                logger.info("No dashboards found")
             
             return dashboards
             
         except Exception as e:
-            print(f"❌ Error listing dashboards: {e}")
+            logger.error("❌ Error listing dashboards: %s", e)
             return []
     
     def create_alarms(self) -> bool:
@@ -406,27 +337,25 @@ class CloudWatchDashboard:
                 }
             ]
             
-            for alarm_config in alarms:
-                self.cloudwatch.put_metric_alarm(
-                    AlarmName=alarm_config['AlarmName'],
-                    MetricName=alarm_config['MetricName'],
-                    Namespace=self.namespace,
-                    Statistic='Average',
-                    Period=300,  # 5 minutes
-                    EvaluationPeriods=alarm_config['EvaluationPeriods'],
-                    Threshold=alarm_config['Threshold'],
-                    ComparisonOperator=alarm_config['ComparisonOperator'],
-                    AlarmDescription=alarm_config['AlarmDescription'],
-                    ActionsEnabled=False  # Enable and configure SNS topics as needed
-                )
-                print(f"✅ Created alarm: {alarm_config['AlarmName']}")
+            # Alarm configs use the API parameter names; shared parameters are bound once
+            put_alarm = partial(self.cloudwatch.put_metric_alarm, Namespace=self.namespace, **ALARM_COMMON_PARAMS)
             
-            print(f"\n✅ Created {len(alarms)} CloudWatch alarms")
-            print("⚠️  Note: Alarms are created but not enabled. Configure SNS topics to receive notifications.")
+            # The API calls are independent network round-trips (boto3 clients are thread-safe)
+            with ThreadPoolExecutor(max_workers=min(MAX_ALARM_WORKERS, len(alarms))) as executor:
+                futures = {
+                    executor.submit(put_alarm, **alarm_config): alarm_config['AlarmName']
+                    for alarm_config in alarms
+                }
+                for future in as_completed(futures):
+                    future.result()
+                    logger.info("✅ Created alarm: %s", futures[future])
+            
+            logger.info("✅ Created %d CloudWatch alarms", len(alarms))
+            logger.warning("⚠️  Note: Alarms are created but not enabled. Configure SNS topics to receive notifications.")
             return True
             
         except Exception as e:
-            print(f"❌ Error creating alarms: {e}")
+            logger.error("❌ Error creating alarms: %s", e)
             return False
 
 
@@ -452,17 +381,17 @@ def setup_cloudwatch_observability(
         success = True
         
         if create_dashboard:
-            print("\n📊 Creating CloudWatch Dashboard...")
+            logger.info("📊 Creating CloudWatch Dashboard...")
             success = dashboard_manager.create_comprehensive_dashboard() and success
         
         if create_alarms:
-            print("\n🚨 Creating CloudWatch Alarms...")
+            logger.info("🚨 Creating CloudWatch Alarms...")
             success = dashboard_manager.create_alarms() and success
         
         return success
         
     except Exception as e:
-        print(f"❌ Error setting up CloudWatch observability: {e}")
+        logger.error("❌ Error setting up CloudWatch observability: %s", e)
         return False
 
 
@@ -470,11 +399,13 @@ if __name__ == "__main__":
     # CLI for dashboard management
     import sys
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     if len(sys.argv) > 1:
         command = sys.argv[1].lower()
         
         if command == "create":
-            print("🚀 Setting up CloudWatch observability...")
+            logger.info("🚀 Setting up CloudWatch observability...")
             success = setup_cloudwatch_observability(create_dashboard=True, create_alarms=True)
             sys.exit(0 if success else 1)
         
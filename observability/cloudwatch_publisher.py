@@ -2,12 +2,263 @@
 CloudWatch Publisher - Publishes observability metrics to AWS CloudWatch
 """
 
-import boto3
+import atexit
+import json
+import logging
 import os
+import queue
+import time
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from pathlib import Path
 import threading
-from botocore.exceptions import ClientError, BotoCoreError
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Max pending publish calls; further metrics are dropped (and counted) when full
+METRIC_QUEUE_SIZE = 10_000
+
+# Datums per put_metric_data call (CloudWatch limit: 1000)
+PUT_METRIC_DATA_BATCH_SIZE = 1000
+
+# Max distinct values in one aggregated datum (CloudWatch limit: 150)
+MAX_VALUES_PER_DATUM = 150
+
+# Max time (ms) queued metrics wait to be coalesced before they are sent
+FLUSH_PERIOD_MS = 500
+
+# Samples of one metric from which values are counted with NumPy
+NUMPY_AGGREGATION_MIN_SAMPLES = 32
+
+# Max seconds spent publishing queued metrics at interpreter exit; what is
+# left afterwards is saved to the publisher's pending file
+SHUTDOWN_FLUSH_TIMEOUT_S = 5.0
+
+# Approximate payload cap per put_metric_data call (CloudWatch limit: 1 MB)
+PUT_METRIC_DATA_MAX_BYTES = 900_000
+
+# Dimensions shared by every datum (read-only: datums reference these objects)
+_SERVICE_DIMENSION = {'Name': 'Service', 'Value': 'LangChainRecommender'}
+_DRIFT_DIMENSIONS = [_SERVICE_DIMENSION, {'Name': 'MetricType', 'Value': 'DriftDetection'}]
+_AI_ANALYSIS_DIMENSIONS = [_SERVICE_DIMENSION, {'Name': 'MetricType', 'Value': 'AIAnalysis'}]
+
+# Optional metrics: (source key, metric name, unit, conversion to float or None)
+REQUEST_METRICS = (
+    ('total_execution_time_ms', 'ExecutionTime', 'Milliseconds', None),
+    ('total_tokens', 'TotalTokens', 'Count', float),
+    ('total_cost_usd', 'TotalCost', 'None', None),
+    ('final_recommendations_count', 'RecommendationsCount', 'Count', float),
+)
+AGENT_METRICS = (
+    ('execution_time_ms', 'AgentExecutionTime', 'Milliseconds', None),
+    ('total_tokens', 'AgentTokens', 'Count', float),
+    ('estimated_cost_usd', 'AgentCost', 'None', None),
+)
+DRIFT_METRICS = (
+    ('mean_execution_time', 'MeanExecutionTime', 'Milliseconds', None),
+    ('mean_tokens', 'MeanTokens', 'Count', None),
+    ('mean_cost', 'MeanCost', 'None', None),
+)
+TEXT_QUALITY_METRICS = (
+    ('clarity_score', 'TextClarityScore', 'None', None),
+    ('completeness_score', 'TextCompletenessScore', 'None', None),
+    ('overall_score', 'TextOverallScore', 'None', None),
+)
+PERFORMANCE_METRICS = (
+    ('efficiency_score', 'EfficiencyScore', 'None', None),
+)
+
+# Drift severity -> DriftSeverity value
+DRIFT_SEVERITY_LEVELS = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+
+
+@lru_cache(maxsize=4096)
+def _dim(name: str, value: str) -> Dict[str, str]:
+    """Shared dimension dict for a name/value pair (read-only, never mutate)"""
+    return {'Name': name, 'Value': value}
+
+
+def _datum(
+    name: str, dimensions: List[Dict[str, str]], value: float, unit: str, timestamp: Optional[datetime]
+) -> Dict[str, Any]:
+    datum = {
+        'MetricName': name,
+        'Dimensions': dimensions,
+        'Value': value,
+        'Unit': unit
+    }
+    if timestamp is not None:
+        datum['Timestamp'] = timestamp
+    return datum
+
+
+def _emit(metric_data: List[Dict[str, Any]], spec, source: Dict[str, Any], dimensions, timestamp: Optional[datetime]) -> None:
+    """Append a datum for every metric of `spec` present in `source`"""
+    for key, name, unit, coerce in spec:
+        if key in source:
+            value = source[key]
+            # Conversions produce floats: values that already are skip the call
+            if coerce is not None and type(value) is not float:
+                value = coerce(value)
+            metric_data.append(_datum(name, dimensions, value, unit, timestamp))
+
+
+def _request_datums(metrics: Dict[str, Any], timestamp: Optional[datetime]) -> List[Dict[str, Any]]:
+    """Request-level datums"""
+    # Common dimensions
+    dimensions = [
+        _SERVICE_DIMENSION,
+        _dim('Urgency', metrics.get('urgency', 'unknown')),
+        _dim('Strategy', metrics.get('strategy', 'unknown')),
+        _dim('Country', metrics.get('country', 'unknown'))
+    ]
+    
+    # Request success/failure
+    metric_data = [_datum('RequestSuccess', dimensions, 1.0 if metrics.get('success', True) else 0.0, 'None', timestamp)]
+    _emit(metric_data, REQUEST_METRICS, metrics, dimensions, timestamp)
+    
+    # Number of agents executed
+    metric_data.append(_datum(
+        'AgentsExecutedCount', dimensions, float(len(metrics.get('agents_executed', []))), 'Count', timestamp
+    ))
+    return metric_data
+
+
+def _agent_datums(
+    agent_metrics: List[Dict[str, Any]], request_context: Dict[str, Any], timestamp: Optional[datetime]
+) -> List[Dict[str, Any]]:
+    """Agent-level datums, dimensioned by the request's urgency and strategy"""
+    metric_data = []
+    
+    # Same for every agent of the request
+    urgency_dimension = _dim('Urgency', request_context.get('urgency', 'unknown'))
+    strategy_dimension = _dim('Strategy', request_context.get('strategy', 'unknown'))
+    
+    for agent_metric in agent_metrics:
+        dimensions = [
+            _SERVICE_DIMENSION,
+            _dim('AgentName', agent_metric.get('agent_name', 'unknown')),
+            urgency_dimension,
+            strategy_dimension
+        ]
+        
+        _emit(metric_data, AGENT_METRICS, agent_metric, dimensions, timestamp)
+        
+        # Agent success
+        metric_data.append(_datum(
+            'AgentSuccess', dimensions, 1.0 if agent_metric.get('success', True) else 0.0, 'None', timestamp
+        ))
+    return metric_data
+
+
+def _drift_datums(drift_analysis: Dict[str, Any], timestamp: Optional[datetime]) -> List[Dict[str, Any]]:
+    """Drift detection datums"""
+    dimensions = _DRIFT_DIMENSIONS
+    
+    # Drift detected flag
+    drift_detected = drift_analysis.get('drift_detected', False)
+    metric_data = [_datum('DriftDetected', dimensions, 1.0 if drift_detected else 0.0, 'None', timestamp)]
+    
+    # Drift severity (if drift detected)
+    if drift_detected:
+        severity_value = DRIFT_SEVERITY_LEVELS.get(drift_analysis.get('severity', 'low'), 0)
+        metric_data.append(_datum('DriftSeverity', dimensions, float(severity_value), 'None', timestamp))
+    
+    # Statistical metrics
+    _emit(metric_data, DRIFT_METRICS, drift_analysis.get('statistical_summary', {}), dimensions, timestamp)
+    return metric_data
+
+
+def _ai_analysis_datums(ai_analysis: Dict[str, Any], timestamp: Optional[datetime]) -> List[Dict[str, Any]]:
+    """AI analysis score datums"""
+    metric_data = []
+    dimensions = _AI_ANALYSIS_DIMENSIONS
+    
+    # Text quality scores
+    for quality in ai_analysis.get('text_quality', []):
+        agent_dimensions = dimensions + [_dim('AgentName', quality.get('agent_name', 'unknown'))]
+        _emit(metric_data, TEXT_QUALITY_METRICS, quality, agent_dimensions, timestamp)
+    
+    # Performance analysis
+    performance = ai_analysis.get('performance_analysis', {})
+    _emit(metric_data, PERFORMANCE_METRICS, performance, dimensions, timestamp)
+    
+    if 'bottlenecks' in performance:
+        metric_data.append(_datum(
+            'BottleneckCount', dimensions, float(len(performance['bottlenecks'])), 'Count', timestamp
+        ))
+    return metric_data
+
+
+def _aggregate(metric_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge datums of the same metric, dimensions, unit and minute into one
+    
+    Merged datums carry Values/Counts arrays rather than a StatisticSet, so
+    CloudWatch can still compute percentiles (the dashboard plots p50/p90/p99).
+    Single samples are passed through unchanged.
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for datum in metric_data:
+        timestamp = datum.get('Timestamp')
+        key = (
+            datum['MetricName'],
+            datum['Unit'],
+            tuple((d['Name'], d['Value']) for d in datum['Dimensions']),
+            timestamp.replace(second=0, microsecond=0) if timestamp is not None else None
+        )
+        groups.setdefault(key, []).append(datum)
+    
+    aggregated = []
+    for datums in groups.values():
+        if len(datums) == 1:
+            aggregated.append(datums[0])
+            continue
+        if len(datums) >= NUMPY_AGGREGATION_MIN_SAMPLES:
+            unique, unique_counts = np.unique(
+                np.fromiter((datum['Value'] for datum in datums), dtype=np.float64, count=len(datums)),
+                return_counts=True
+            )
+            values = unique.tolist()
+            counts = unique_counts.astype(np.float64).tolist()
+        else:
+            value_counts: Dict[float, int] = {}
+            for datum in datums:
+                value_counts[datum['Value']] = value_counts.get(datum['Value'], 0) + 1
+            values = list(value_counts)
+            counts = [float(c) for c in value_counts.values()]
+        first = datums[0]
+        # PutMetricData accepts at most MAX_VALUES_PER_DATUM distinct values per datum
+        for i in range(0, len(values), MAX_VALUES_PER_DATUM):
+            merged = {
+                'MetricName': first['MetricName'],
+                'Dimensions': first['Dimensions'],
+                'Values': values[i:i + MAX_VALUES_PER_DATUM],
+                'Counts': counts[i:i + MAX_VALUES_PER_DATUM],
+                'Unit': first['Unit']
+            }
+            if 'Timestamp' in first:
+                merged['Timestamp'] = first['Timestamp']
+            aggregated.append(merged)
+    return aggregated
+
+
+def _batches(metric_data: List[Dict[str, Any]]):
+    """Split metric data into batches within the datum-count and payload limits"""
+    batch: List[Dict[str, Any]] = []
+    batch_bytes = 0
+    for datum in metric_data:
+        datum_bytes = len(str(datum))
+        if batch and (len(batch) == PUT_METRIC_DATA_BATCH_SIZE or batch_bytes + datum_bytes > PUT_METRIC_DATA_MAX_BYTES):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(datum)
+        batch_bytes += datum_bytes
+    if batch:
+        yield batch
 
 
 class CloudWatchPublisher:
@@ -25,7 +276,10 @@ class CloudWatchPublisher:
         self,
         namespace: str = "LangChainService/Observability",
         region_name: str = None,
-        enabled: bool = True
+        enabled: bool = True,
+        flush_period_ms: int = FLUSH_PERIOD_MS,
+        include_timestamp: bool = True,
+        pending_path: Optional[str] = None
     ):
         """
         Initialize CloudWatch publisher
@@ -34,32 +288,63 @@ class CloudWatchPublisher:
             namespace: CloudWatch namespace for metrics
             region_name: AWS region (defaults to AWS_DEFAULT_REGION env var or us-east-1)
             enabled: Whether CloudWatch publishing is enabled
+            flush_period_ms: Max time queued metrics are held to be coalesced
+                with later ones (a full batch is sent immediately)
+            include_timestamp: Stamp datums when they are published; when False
+                CloudWatch uses the time it receives them
+            pending_path: JSONL file that metrics still queued at shutdown are
+                saved to, and re-queued from on the next start (None: not kept)
         """
         self.namespace = namespace
-        self.enabled = enabled
+        self._enabled = bool(enabled)
+        self.flush_period_s = flush_period_ms / 1000
+        self.include_timestamp = include_timestamp
+        # (epoch second, timestamp) of the last publish call
+        self._last_timestamp: tuple = (None, None)
+        self.pending_path = Path(pending_path) if pending_path is not None else None
         
-        if not self.enabled:
-            print("CloudWatch publishing is disabled")
+        if not self._enabled:
+            logger.info("CloudWatch publishing is disabled")
             return
         
         # Get region from environment or use default
         self.region_name = region_name or os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
         
         try:
+            # boto3/botocore are imported only when publishing is enabled
+            from botocore.exceptions import ClientError, BotoCoreError
+            from .cloudwatch_client import get_cloudwatch_client
+            
+            # Errors of the CloudWatch API the worker reports and survives
+            self._api_errors = (ClientError, BotoCoreError)
+            
             # Initialize CloudWatch client
-            self.cloudwatch = boto3.client('cloudwatch', region_name=self.region_name)
-            print(f"✅ CloudWatch publisher initialized for region: {self.region_name}")
+            self.cloudwatch = get_cloudwatch_client(self.region_name)
+            logger.info("✅ CloudWatch publisher initialized for region: %s", self.region_name)
         except Exception as e:
-            print(f"⚠️  Warning: Could not initialize CloudWatch client: {e}")
-            print("   Metrics will not be published to CloudWatch")
-            self.enabled = False
+            logger.warning("⚠️  Warning: Could not initialize CloudWatch client: %s - metrics will not be published to CloudWatch", e)
+            self._enabled = False
+            return
         
-        # Thread lock for concurrent access
-        self.lock = threading.Lock()
+        # Metric data queued by the publish_* methods, sent by a single
+        # background worker so callers never wait on the CloudWatch API
+        self._queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue(maxsize=METRIC_QUEUE_SIZE)
+        self.dropped_metrics = 0
+        self._worker = threading.Thread(target=self._drain, name="cloudwatch-publisher", daemon=True)
+        self._worker.start()
         
-        # Batch metrics for efficiency
-        self.metric_buffer: List[Dict[str, Any]] = []
-        self.max_buffer_size = 20  # CloudWatch limit is 1000, but we keep it smaller
+        self._restore_pending()
+        atexit.register(self.close, SHUTDOWN_FLUSH_TIMEOUT_S)
+    
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether metrics are published
+        
+        Callers can check this before assembling the metrics they would pass
+        to the publish_* methods.
+        """
+        return self._enabled
     
     def publish_request_metrics(self, metrics: Dict[str, Any]) -> bool:
         """
@@ -71,86 +356,10 @@ class CloudWatchPublisher:
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled:
+        if not self._enabled:
             return False
         
-        try:
-            metric_data = []
-            timestamp = datetime.utcnow()
-            
-            # Common dimensions
-            dimensions = [
-                {'Name': 'Service', 'Value': 'LangChainRecommender'},
-                {'Name': 'Urgency', 'Value': metrics.get('urgency', 'unknown')},
-                {'Name': 'Strategy', 'Value': metrics.get('strategy', 'unknown')},
-                {'Name': 'Country', 'Value': metrics.get('country', 'unknown')}
-            ]
-            
-            # Request success/failure
-            metric_data.append({
-                'MetricName': 'RequestSuccess',
-                'Dimensions': dimensions,
-                'Value': 1.0 if metrics.get('success', True) else 0.0,
-                'Unit': 'None',
-                'Timestamp': timestamp
-            })
-            
-            # Total execution time
-            if 'total_execution_time_ms' in metrics:
-                metric_data.append({
-                    'MetricName': 'ExecutionTime',
-                    'Dimensions': dimensions,
-                    'Value': metrics['total_execution_time_ms'],
-                    'Unit': 'Milliseconds',
-                    'Timestamp': timestamp
-                })
-            
-            # Total tokens
-            if 'total_tokens' in metrics:
-                metric_data.append({
-                    'MetricName': 'TotalTokens',
-                    'Dimensions': dimensions,
-                    'Value': float(metrics['total_tokens']),
-                    'Unit': 'Count',
-                    'Timestamp': timestamp
-                })
-            
-            # Total cost
-            if 'total_cost_usd' in metrics:
-                metric_data.append({
-                    'MetricName': 'TotalCost',
-                    'Dimensions': dimensions,
-                    'Value': metrics['total_cost_usd'],
-                    'Unit': 'None',
-                    'Timestamp': timestamp
-                })
-            
-            # Number of recommendations
-            if 'final_recommendations_count' in metrics:
-                metric_data.append({
-                    'MetricName': 'RecommendationsCount',
-                    'Dimensions': dimensions,
-                    'Value': float(metrics['final_recommendations_count']),
-                    'Unit': 'Count',
-                    'Timestamp': timestamp
-                })
-            
-            # Number of agents executed
-            agents_count = len(metrics.get('agents_executed', []))
-            metric_data.append({
-                'MetricName': 'AgentsExecutedCount',
-                'Dimensions': dimensions,
-                'Value': float(agents_count),
-                'Unit': 'Count',
-                'Timestamp': timestamp
-            })
-            
-            # Publish metrics
-            return self._publish_metrics(metric_data)
-            
-        except Exception as e:
-            print(f"Error publishing request metrics to CloudWatch: {e}")
-            return False
+        return self._publish_metrics(_request_datums(metrics, self._timestamp()))
     
     def publish_agent_metrics(self, agent_metrics: List[Dict[str, Any]], request_context: Dict[str, Any]) -> bool:
         """
@@ -163,68 +372,10 @@ class CloudWatchPublisher:
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled or not agent_metrics:
+        if not self._enabled or not agent_metrics:
             return False
         
-        try:
-            metric_data = []
-            timestamp = datetime.utcnow()
-            
-            for agent_metric in agent_metrics:
-                agent_name = agent_metric.get('agent_name', 'unknown')
-                
-                dimensions = [
-                    {'Name': 'Service', 'Value': 'LangChainRecommender'},
-                    {'Name': 'AgentName', 'Value': agent_name},
-                    {'Name': 'Urgency', 'Value': request_context.get('urgency', 'unknown')},
-                    {'Name': 'Strategy', 'Value': request_context.get('strategy', 'unknown')}
-                ]
-                
-                # Agent execution time
-                if 'execution_time_ms' in agent_metric:
-                    metric_data.append({
-                        'MetricName': 'AgentExecutionTime',
-                        'Dimensions': dimensions,
-                        'Value': agent_metric['execution_time_ms'],
-                        'Unit': 'Milliseconds',
-                        'Timestamp': timestamp
-                    })
-                
-                # Agent tokens
-                if 'total_tokens' in agent_metric:
-                    metric_data.append({
-                        'MetricName': 'AgentTokens',
-                        'Dimensions': dimensions,
-                        'Value': float(agent_metric['total_tokens']),
-                        'Unit': 'Count',
-                        'Timestamp': timestamp
-                    })
-                
-                # Agent cost
-                if 'estimated_cost_usd' in agent_metric:
-                    metric_data.append({
-                        'MetricName': 'AgentCost',
-                        'Dimensions': dimensions,
-                        'Value': agent_metric['estimated_cost_usd'],
-                        'Unit': 'None',
-                        'Timestamp': timestamp
-                    })
-                
-                # Agent success
-                metric_data.append({
-                    'MetricName': 'AgentSuccess',
-                    'Dimensions': dimensions,
-                    'Value': 1.0 if agent_metric.get('success', True) else 0.0,
-                    'Unit': 'None',
-                    'Timestamp': timestamp
-                })
-            
-            # Publish in batches (CloudWatch max is 1000 per call)
-            return self._publish_metrics(metric_data)
-            
-        except Exception as e:
-            print(f"Error publishing agent metrics to CloudWatch: {e}")
-            return False
+        return self._publish_metrics(_agent_datums(agent_metrics, request_context, self._timestamp()))
     
     def publish_drift_metrics(self, drift_analysis: Dict[str, Any]) -> bool:
         """
@@ -236,77 +387,10 @@ class CloudWatchPublisher:
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled:
+        if not self._enabled:
             return False
         
-        try:
-            metric_data = []
-            timestamp = datetime.utcnow()
-            
-            dimensions = [
-                {'Name': 'Service', 'Value': 'LangChainRecommender'},
-                {'Name': 'MetricType', 'Value': 'DriftDetection'}
-            ]
-            
-            # Drift detected flag
-            drift_detected = drift_analysis.get('drift_detected', False)
-            metric_data.append({
-                'MetricName': 'DriftDetected',
-                'Dimensions': dimensions,
-                'Value': 1.0 if drift_detected else 0.0,
-                'Unit': 'None',
-                'Timestamp': timestamp
-            })
-            
-            # Drift severity (if drift detected)
-            if drift_detected:
-                severity_map = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
-                severity = drift_analysis.get('severity', 'low')
-                severity_value = severity_map.get(severity, 0)
-                
-                metric_data.append({
-                    'MetricName': 'DriftSeverity',
-                    'Dimensions': dimensions,
-                    'Value': float(severity_value),
-                    'Unit': 'None',
-                    'Timestamp': timestamp
-                })
-            
-            # Statistical metrics
-            stats = drift_analysis.get('statistical_summary', {})
-            
-            if 'mean_execution_time' in stats:
-                metric_data.append({
-                    'MetricName': 'MeanExecutionTime',
-                    'Dimensions': dimensions,
-                    'Value': stats['mean_execution_time'],
-                    'Unit': 'Milliseconds',
-                    'Timestamp': timestamp
-                })
-            
-            if 'mean_tokens' in stats:
-                metric_data.append({
-                    'MetricName': 'MeanTokens',
-                    'Dimensions': dimensions,
-                    'Value': stats['mean_tokens'],
-                    'Unit': 'Count',
-                    'Timestamp': timestamp
-                })
-            
-            if 'mean_cost' in stats:
-                metric_data.append({
-                    'MetricName': 'MeanCost',
-                    'Dimensions': dimensions,
-                    'Value': stats['mean_cost'],
-                    'Unit': 'None',
-                    'Timestamp': timestamp
-                })
-            
-            return self._publish_metrics(metric_data)
-            
-        except Exception as e:
-            print(f"Error publishing drift metrics to CloudWatch: {e}")
-            return False
+        return self._publish_metrics(_drift_datums(drift_analysis, self._timestamp()))
     
     def publish_ai_analysis_metrics(self, ai_analysis: Dict[str, Any]) -> bool:
         """
@@ -318,123 +402,203 @@ class CloudWatchPublisher:
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled:
+        if not self._enabled:
             return False
         
-        try:
-            metric_data = []
-            timestamp = datetime.utcnow()
-            
-            dimensions = [
-                {'Name': 'Service', 'Value': 'LangChainRecommender'},
-                {'Name': 'MetricType', 'Value': 'AIAnalysis'}
-            ]
-            
-            # Text quality scores
-            text_quality = ai_analysis.get('text_quality', [])
-            for quality in text_quality:
-                agent_name = quality.get('agent_name', 'unknown')
-                agent_dimensions = dimensions + [{'Name': 'AgentName', 'Value': agent_name}]
-                
-                if 'clarity_score' in quality:
-                    metric_data.append({
-                        'MetricName': 'TextClarityScore',
-                        'Dimensions': agent_dimensions,
-                        'Value': quality['clarity_score'],
-                        'Unit': 'None',
-                        'Timestamp': timestamp
-                    })
-                
-                if 'completeness_score' in quality:
-                    metric_data.append({
-                        'MetricName': 'TextCompletenessScore',
-                        'Dimensions': agent_dimensions,
-                        'Value': quality['completeness_score'],
-                        'Unit': 'None',
-                        'Timestamp': timestamp
-                    })
-                
-                if 'overall_score' in quality:
-                    metric_data.append({
-                        'MetricName': 'TextOverallScore',
-                        'Dimensions': agent_dimensions,
-                        'Value': quality['overall_score'],
-                        'Unit': 'None',
-                        'Timestamp': timestamp
-                    })
-            
-            # Performance analysis
-            performance = ai_analysis.get('performance_analysis', {})
-            
-            if 'efficiency_score' in performance:
-                metric_data.append({
-                    'MetricName': 'EfficiencyScore',
-                    'Dimensions': dimensions,
-                    'Value': performance['efficiency_score'],
-                    'Unit': 'None',
-                    'Timestamp': timestamp
-                })
-            
-            if 'bottlenecks' in performance:
-                bottleneck_count = len(performance['bottlenecks'])
-                metric_data.append({
-                    'MetricName': 'BottleneckCount',
-                    'Dimensions': dimensions,
-                    'Value': float(bottleneck_count),
-                    'Unit': 'Count',
-                    'Timestamp': timestamp
-                })
-            
-            return self._publish_metrics(metric_data)
+        return self._publish_metrics(_ai_analysis_datums(ai_analysis, self._timestamp()))
+    
+    def publish_all(
+        self,
+        request_metrics: Dict[str, Any],
+        drift_analysis: Optional[Dict[str, Any]] = None,
+        ai_analysis: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Publish every metric of a request as one unit
+        
+        Equivalent to the individual publish_* calls (agent metrics are taken
+        from request_metrics['agent_metrics']), but the datums are queued
+        together and therefore sent in the same put_metric_data call.
+        
+        Args:
+            request_metrics: Request metrics dictionary
+            drift_analysis: Drift analysis results, if drift was checked
+            ai_analysis: AI analysis results, if the request was analyzed
             
-        except Exception as e:
-            print(f"Error publishing AI analysis metrics to CloudWatch: {e}")
+        Returns:
+            True if queued, False otherwise
+        """
+        if not self._enabled:
             return False
+        
+        timestamp = self._timestamp()
+        metric_data = _request_datums(request_metrics, timestamp)
+        agent_metrics = request_metrics.get('agent_metrics')
+        if agent_metrics:
+            metric_data += _agent_datums(agent_metrics, request_metrics, timestamp)
+        if drift_analysis:
+            metric_data += _drift_datums(drift_analysis, timestamp)
+        if ai_analysis:
+            metric_data += _ai_analysis_datums(ai_analysis, timestamp)
+        
+        return self._publish_metrics(metric_data)
+    
+    def _timestamp(self) -> Optional[datetime]:
+        """
+        Timestamp shared by the datums of one publish call, None to let CloudWatch stamp them
+        
+        Whole seconds (CloudWatch's resolution), so calls within the same
+        second reuse one datetime.
+        """
+        if not self.include_timestamp:
+            return None
+        now = int(time.time())
+        last = self._last_timestamp
+        if last[0] != now:
+            last = self._last_timestamp = (now, datetime.fromtimestamp(now, timezone.utc))
+        return last[1]
     
     def _publish_metrics(self, metric_data: List[Dict[str, Any]]) -> bool:
         """
-        Internal method to publish metrics to CloudWatch
+        Queue metrics for the background worker to publish to CloudWatch
         
         Args:
             metric_data: List of metric data dictionaries
             
         Returns:
-            True if successful, False otherwise
+            True if queued, False if skipped or dropped (queue full)
         """
-        if not self.enabled:
-            print("[CloudWatchPublisher] Publish skipped - publisher disabled")
+        if not self._enabled:
+            logger.debug("Publish skipped - publisher disabled")
             return False
         
         if not metric_data:
-            print("[CloudWatchPublisher] Publish skipped - no metric data provided")
+            logger.debug("Publish skipped - no metric data provided")
             return False
         
         try:
-            print(f"[CloudWatchPublisher] Preparing to publish {len(metric_data)} metric(s) to namespace {self.namespace}")
-            with self.lock:
-                # CloudWatch allows max 1000 metrics per call, but we batch smaller
-                batch_size = 20
-                for i in range(0, len(metric_data), batch_size):
-                    batch = metric_data[i:i + batch_size]
-                    batch_number = (i // batch_size) + 1
-                    print(f"[CloudWatchPublisher] Publishing batch {batch_number} with {len(batch)} metric(s)")
-                    
-                    try:
-                        self.cloudwatch.put_metric_data(
-                            Namespace=self.namespace,
-                            MetricData=batch
-                        )
-                        print(f"[CloudWatchPublisher] Batch {batch_number} published successfully")
-                    except (ClientError, BotoCoreError) as e:
-                        print(f"Error publishing metrics batch to CloudWatch: {e}")
-                        return False
-            
-            print("[CloudWatchPublisher] All metric batches published successfully")
-            return True
-            
-        except Exception as e:
-            print(f"Unexpected error publishing metrics to CloudWatch: {e}")
+            self._queue.put_nowait(metric_data)
+        except queue.Full:
+            self.dropped_metrics += len(metric_data)
+            logger.warning("Publish queue full - dropped %d metric(s)", len(metric_data))
             return False
+        return True
+    
+    def _drain(self) -> None:
+        """
+        Background worker: coalesce queued metrics and send them in batches
+        
+        Metrics are sent once a full batch is pending or flush_period_s after
+        the first of them was taken, whichever comes first.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = list(item)
+            stop = False
+            deadline = time.monotonic() + self.flush_period_s
+            while len(pending) < PUT_METRIC_DATA_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                pending.extend(item)
+            try:
+                self._send(pending)
+            except Exception:
+                # A malformed datum must not stop the worker for every later metric
+                logger.exception("Unexpected error publishing metrics to CloudWatch")
+            if stop:
+                return
+    
+    def _send(self, metric_data: List[Dict[str, Any]]) -> bool:
+        """
+        Send metrics to CloudWatch (worker thread only)
+        
+        Returns:
+            True if every batch was published, False otherwise
+        """
+        metric_data = _aggregate(metric_data)
+        logger.debug("Preparing to publish %d metric(s) to namespace %s", len(metric_data), self.namespace)
+        for batch_number, batch in enumerate(_batches(metric_data), 1):
+            logger.debug("Publishing batch %d (%d metrics)", batch_number, len(batch))
+            
+            try:
+                self.cloudwatch.put_metric_data(
+                    Namespace=self.namespace,
+                    MetricData=batch
+                )
+                logger.debug("Batch %d published successfully", batch_number)
+            except self._api_errors as e:
+                logger.warning("Error publishing metrics batch to CloudWatch: %s", e)
+                return False
+        
+        logger.debug("All metric batches published successfully")
+        return True
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Publish everything already queued and stop the background worker
+        
+        Args:
+            timeout: Max seconds to wait for the worker (None waits until done)
+        """
+        if not self._enabled or not self._worker.is_alive():
+            return
+        self._queue.put(None)
+        self._worker.join(timeout)
+        # Anything the worker did not get to is kept for the next process
+        self._save_pending()
+    
+    def _save_pending(self) -> None:
+        """Append metrics still queued to pending_path"""
+        if self.pending_path is None:
+            return
+        
+        pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                pending.append(item)
+        if not pending:
+            return
+        
+        try:
+            with open(self.pending_path, 'a') as f:
+                for metric_data in pending:
+                    f.write(json.dumps(metric_data, default=datetime.isoformat) + '\n')
+        except (OSError, TypeError) as e:
+            logger.warning("Could not save %d pending metric batch(es) to %s: %s", len(pending), self.pending_path, e)
+            return
+        logger.info("Saved %d pending metric batch(es) to %s", len(pending), self.pending_path)
+    
+    def _restore_pending(self) -> None:
+        """Queue the metrics a previous process saved to pending_path"""
+        if self.pending_path is None or not self.pending_path.exists():
+            return
+        
+        try:
+            with open(self.pending_path) as f:
+                pending = [json.loads(line) for line in f if line.strip()]
+            self.pending_path.unlink()
+        except (OSError, ValueError) as e:
+            logger.warning("Could not restore pending metrics from %s: %s", self.pending_path, e)
+            return
+        
+        for metric_data in pending:
+            for datum in metric_data:
+                if 'Timestamp' in datum:
+                    datum['Timestamp'] = datetime.fromisoformat(datum['Timestamp'])
+            self._publish_metrics(metric_data)
+        logger.info("Restored %d pending metric batch(es) from %s", len(pending), self.pending_path)
     
     def test_connection(self) -> bool:
         """
@@ -443,15 +607,15 @@ class CloudWatchPublisher:
         Returns:
             True if connection works, False otherwise
         """
-        if not self.enabled:
-            print("CloudWatch publishing is disabled")
+        if not self._enabled:
+            logger.info("CloudWatch publishing is disabled")
             return False
         
         try:
             test_metric = [{
                 'MetricName': 'ConnectionTest',
                 'Dimensions': [
-                    {'Name': 'Service', 'Value': 'LangChainRecommender'},
+                    _SERVICE_DIMENSION,
                     {'Name': 'Type', 'Value': 'Test'}
                 ],
                 'Value': 1.0,
@@ -464,10 +628,10 @@ class CloudWatchPublisher:
                 MetricData=test_metric
             )
             
-            print(f"✅ CloudWatch connection test successful (Namespace: {self.namespace})")
+            logger.info("✅ CloudWatch connection test successful (Namespace: %s)", self.namespace)
             return True
             
         except Exception as e:
-            print(f"❌ CloudWatch connection test failed: {e}")
+            logger.error("❌ CloudWatch connection test failed: %s", e)
             return False
 
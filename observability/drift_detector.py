@@ -7,7 +7,47 @@ from typing import List, Dict, Any, Optional
 from collections import Counter
 from scipy import stats
 from datetime import datetime, timedelta
-import math
+
+
+def _shannon_entropy(counts: np.ndarray) -> float:
+    """Shannon entropy (bits) of a distribution given by its counts"""
+    counts = counts[counts > 0]
+    if counts.size == 0:
+        return 0.0
+    probabilities = counts / counts.sum()
+    return float(-(probabilities * np.log2(probabilities)).sum())
+
+
+def _counter_entropy(counts: Counter) -> float:
+    """Shannon entropy (bits) of the distribution held in a Counter"""
+    return _shannon_entropy(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+
+
+
+def _ks_result(statistic: float, p_value: float) -> Dict[str, Any]:
+    """Result dict of a two-sample KS test"""
+    # Convert numpy types to native Python types
+    statistic = float(statistic)
+    p_value = float(p_value)
+    drift_detected = bool(p_value < 0.05)  # 95% confidence - convert to native bool
+    
+    return {
+        "statistic": statistic,
+        "p_value": p_value,
+        "drift_detected": drift_detected,
+        "message": "Significant drift detected" if drift_detected else "No significant drift",
+        "confidence": "high" if p_value < 0.01 else "medium" if p_value < 0.05 else "low"
+    }
+
+
+def _ks_error(error: Exception) -> Dict[str, Any]:
+    """Result dict of a KS test that could not be computed"""
+    return {
+        "statistic": 0.0,
+        "p_value": 1.0,
+        "drift_detected": False,
+        "message": f"KS test error: {str(error)}"
+    }
 
 
 class DriftDetector:
@@ -29,6 +69,18 @@ class DriftDetector:
         self.baseline_metrics: Optional[Dict[str, List[float]]] = None
         self.baseline_text_samples: List[str] = []
         
+        # Character/word counts and entropies of baseline_text_samples, kept
+        # up to date by add_baseline_samples() so drift checks don't rescan them
+        self._baseline_char_counts: Counter = Counter()
+        self._baseline_word_counts: Counter = Counter()
+        self._baseline_entropy = 0.0
+        self._baseline_word_entropy = 0.0
+        
+        # Baseline execution times, token counts and costs as sorted rows of
+        # one array (KS tests against it run in a single call), and their means
+        self._baseline_sorted = np.empty((3, 0))
+        self._baseline_means = np.full(3, np.nan)
+        
     def set_baseline(self, historical_metrics: List[Dict[str, Any]]) -> None:
         """
         Set baseline from historical metrics
@@ -43,6 +95,7 @@ class DriftDetector:
             "quality_scores": []
         }
         
+        text_samples = []
         for metric in historical_metrics:
             self.baseline_metrics["execution_times"].append(
                 metric.get("total_execution_time_ms", 0)
@@ -57,7 +110,35 @@ class DriftDetector:
             # Extract text from agent outputs
             for agent_metric in metric.get("agent_metrics", []):
                 if agent_metric.get("output_text"):
-                    self.baseline_text_samples.append(agent_metric["output_text"])
+                    text_samples.append(agent_metric["output_text"])
+        
+        self.add_baseline_samples(text_samples)
+        
+        baseline = np.array([
+            self.baseline_metrics["execution_times"],
+            self.baseline_metrics["token_counts"],
+            self.baseline_metrics["costs"]
+        ], dtype=np.float64)
+        self._baseline_means = baseline.mean(axis=1)
+        self._baseline_sorted = np.sort(baseline, axis=1)
+    
+    def add_baseline_samples(self, text_samples: List[str]) -> None:
+        """
+        Add output texts to the baseline, updating its cached counts and entropies
+        
+        Args:
+            text_samples: Agent output texts
+        """
+        for text in text_samples:
+            if self.baseline_text_samples:
+                # calculate_entropy joins the samples with a space
+                self._baseline_char_counts[" "] += 1
+            self.baseline_text_samples.append(text)
+            self._baseline_char_counts.update(text)
+            self._baseline_word_counts.update(text.lower().split())
+        
+        self._baseline_entropy = _counter_entropy(self._baseline_char_counts)
+        self._baseline_word_entropy = _counter_entropy(self._baseline_word_counts)
     
     def calculate_entropy(self, text_samples: List[str]) -> float:
         """
@@ -69,18 +150,15 @@ class DriftDetector:
         if not text_samples:
             return 0.0
         
-        # Analyze character-level distribution
+        # Analyze character-level distribution (per code point)
         all_text = " ".join(text_samples)
-        char_counts = Counter(all_text)
-        total_chars = len(all_text)
-        
-        entropy = 0.0
-        for count in char_counts.values():
-            probability = count / total_chars
-            if probability > 0:
-                entropy -= probability * math.log2(probability)
+        if all_text.isascii():
+            char_counts = np.bincount(np.frombuffer(all_text.encode("ascii"), dtype=np.uint8))
+        else:
+            code_points = np.frombuffer(all_text.encode("utf-32-le"), dtype=np.uint32)
+            _, char_counts = np.unique(code_points, return_counts=True)
         
-        return entropy
+        return _shannon_entropy(char_counts)
     
     def calculate_word_entropy(self, text_samples: List[str]) -> float:
         """
@@ -89,25 +167,12 @@ class DriftDetector:
         if not text_samples:
             return 0.0
         
-        # Tokenize into words
-        all_words = []
+        # Tokenize into words, counting each sample's words as they are split
+        word_counts = Counter()
         for text in text_samples:
-            words = text.lower().split()
-            all_words.extend(words)
-        
-        if not all_words:
-            return 0.0
+            word_counts.update(text.lower().split())
         
-        word_counts = Counter(all_words)
-        total_words = len(all_words)
-        
-        entropy = 0.0
-        for count in word_counts.values():
-            probability = count / total_words
-            if probability > 0:
-                entropy -= probability * math.log2(probability)
-        
-        return entropy
+        return _counter_entropy(word_counts)
     
     def kolmogorov_smirnov_test(
         self,
@@ -133,26 +198,29 @@ class DriftDetector:
         try:
             # Perform two-sample KS test
             statistic, p_value = stats.ks_2samp(baseline_data, current_data)
-            
-            # Convert numpy types to native Python types
-            statistic = float(statistic)
-            p_value = float(p_value)
-            drift_detected = bool(p_value < 0.05)  # 95% confidence - convert to native bool
-            
-            return {
-                "statistic": statistic,
-                "p_value": p_value,
-                "drift_detected": drift_detected,
-                "message": "Significant drift detected" if drift_detected else "No significant drift",
-                "confidence": "high" if p_value < 0.01 else "medium" if p_value < 0.05 else "low"
-            }
+            return _ks_result(statistic, p_value)
         except Exception as e:
-            return {
-                "statistic": 0.0,
-                "p_value": 1.0,
-                "drift_detected": False,
-                "message": f"KS test error: {str(e)}"
-            }
+            return _ks_error(e)
+    
+    def _baseline_ks_tests(self, recent: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        KS tests of each baseline metric against the same row of `recent`
+        
+        Args:
+            recent: (3, n) array of execution times, token counts and costs
+        
+        Returns:
+            One kolmogorov_smirnov_test result per metric
+        """
+        if self._baseline_sorted.shape[1] < 2 or recent.shape[1] < 2:
+            return [self.kolmogorov_smirnov_test(b, r) for b, r in zip(self._baseline_sorted, recent)]
+        
+        try:
+            # Vectorized over the metric axis: one call for all three tests
+            statistics, p_values = stats.ks_2samp(self._baseline_sorted, recent, axis=-1)
+        except Exception as e:
+            return [_ks_error(e) for _ in range(len(recent))]
+        return [_ks_result(statistic, p_value) for statistic, p_value in zip(statistics, p_values)]
     
     def detect_drift(self, recent_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -178,20 +246,26 @@ class DriftDetector:
                 "recommendations": []
             }
         
-        # Extract recent data
-        recent_execution_times = [m.get("total_execution_time_ms", 0) for m in recent_metrics]
-        recent_token_counts = [m.get("total_tokens", 0) for m in recent_metrics]
-        recent_costs = [m.get("total_cost_usd", 0) for m in recent_metrics]
-        
+        # Extract recent data in one pass over the records
+        recent_values = []
         recent_text_samples = []
         for metric in recent_metrics:
-            for agent_metric in metric.get("agent_metrics", []):
-                if agent_metric.get("output_text"):
-                    recent_text_samples.append(agent_metric["output_text"])
+            recent_values.append((
+                metric.get("total_execution_time_ms", 0),
+                metric.get("total_tokens", 0),
+                metric.get("total_cost_usd", 0)
+            ))
+            for agent_metric in metric.get("agent_metrics", ()):
+                output_text = agent_metric.get("output_text")
+                if output_text:
+                    recent_text_samples.append(output_text)
+        # One (3, n) array; its rows are views used by the KS tests and means
+        recent = np.array(recent_values, dtype=np.float64).T
+        recent_execution_times, recent_token_counts, recent_costs = recent
         
         # Entropy Analysis
-        baseline_entropy = self.calculate_entropy(self.baseline_text_samples)
-        baseline_word_entropy = self.calculate_word_entropy(self.baseline_text_samples)
+        baseline_entropy = self._baseline_entropy
+        baseline_word_entropy = self._baseline_word_entropy
         
         recent_entropy = self.calculate_entropy(recent_text_samples)
         recent_word_entropy = self.calculate_word_entropy(recent_text_samples)
@@ -200,20 +274,8 @@ class DriftDetector:
         word_entropy_change = float(abs(recent_word_entropy - baseline_word_entropy) / baseline_word_entropy) if baseline_word_entropy > 0 else 0.0
         
         # KS Tests for numerical metrics
-        ks_execution_time = self.kolmogorov_smirnov_test(
-            self.baseline_metrics["execution_times"],
-            recent_execution_times
-        )
-        
-        ks_tokens = self.kolmogorov_smirnov_test(
-            self.baseline_metrics["token_counts"],
-            recent_token_counts
-        )
-        
-        ks_costs = self.kolmogorov_smirnov_test(
-            self.baseline_metrics["costs"],
-            recent_costs
-        )
+        ks_execution_time, ks_tokens, ks_costs = self._baseline_ks_tests(recent)
+        baseline_avg_time, baseline_avg_tokens, baseline_avg_cost = (float(m) for m in self._baseline_means)
         
         # Overall drift detection
         drift_indicators = []
@@ -249,7 +311,7 @@ class DriftDetector:
         
         if ks_execution_time["drift_detected"]:
             recent_avg = float(np.mean(recent_execution_times))
-            baseline_avg = float(np.mean(self.baseline_metrics["execution_times"]))
+            baseline_avg = baseline_avg_time
             if recent_avg > baseline_avg * 1.2:
                 recommendations.append(
                     f"⚠️ Performance degradation: Average execution time increased by "
@@ -258,7 +320,7 @@ class DriftDetector:
         
         if ks_costs["drift_detected"]:
             recent_avg = float(np.mean(recent_costs))
-            baseline_avg = float(np.mean(self.baseline_metrics["costs"]))
+            baseline_avg = baseline_avg_cost
             if recent_avg > baseline_avg * 1.2:
                 recommendations.append(
                     f"⚠️ Cost increase: Average cost increased by "
@@ -283,11 +345,11 @@ class DriftDetector:
                 "costs": ks_costs
             },
             "statistical_summary": {
-                "baseline_avg_time_ms": float(np.mean(self.baseline_metrics["execution_times"])),
+                "baseline_avg_time_ms": baseline_avg_time,
                 "recent_avg_time_ms": float(np.mean(recent_execution_times)),
-                "baseline_avg_tokens": float(np.mean(self.baseline_metrics["token_counts"])),
+                "baseline_avg_tokens": baseline_avg_tokens,
                 "recent_avg_tokens": float(np.mean(recent_token_counts)),
-                "baseline_avg_cost": float(np.mean(self.baseline_metrics["costs"])),
+                "baseline_avg_cost": baseline_avg_cost,
                 "recent_avg_cost": float(np.mean(recent_costs))
             },
             "recommendations": recommendations
@@ -2,12 +2,20 @@
 Metrics Collector - Tracks tokens, costs, response times, and agent execution
 """
 
+import queue
+import threading
 import time
 import tiktoken
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
+# Max queued agent executions processed per background drain pass
+AGENT_METRICS_BATCH_SIZE = 64
+
+# Seconds finalize_request waits for queued agent executions
+AGENT_METRICS_FLUSH_TIMEOUT_S = 5.0
+
 
 @dataclass
 class AgentMetrics:
@@ -79,24 +87,39 @@ class MetricsCollector:
         }
     }
     
-    def __init__(self):
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: When False, wrapped agents skip per-agent tracking entirely
+        """
+        self.enabled = enabled
         self.encoder = tiktoken.get_encoding("cl100k_base")
-        self.current_request_metrics: Optional[Dict[str, Any]] = None
-        self.agent_metrics_list: List[AgentMetrics] = []
+        # Requests being tracked, by request_id: concurrent requests overlap,
+        # so each keeps its own agent executions
+        self._requests: Dict[str, Dict[str, Any]] = {}
+        # Agent executions queued by enqueue_agent_execution(), recorded by a
+        # background thread; _unprocessed counts records not yet recorded
+        self._pending: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        self._unprocessed = 0
+        self._worker: Optional[threading.Thread] = None
         
     def start_request(self, request_id: str, requested_item: str, country: str, urgency: str) -> None:
         """Start tracking a new request"""
-        self.current_request_metrics = {
-            "request_id": request_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "requested_item": requested_item,
-            "country": country,
-            "urgency": urgency,
-            "start_time": time.time(),
-            "agents_executed": [],
-            "agent_metrics": []
-        }
-        self.agent_metrics_list = []
+        with self._lock:
+            self._requests[request_id] = {
+                "request_id": request_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "requested_item": requested_item,
+                "country": country,
+                "urgency": urgency,
+                "start_time": time.time(),
+                "agents_executed": [],
+                "agent_metrics": [],
+                # Queued executions of this request not yet recorded
+                "unprocessed": 0
+            }
         
     def count_tokens(self, text: str) -> int:
         """Count tokens in text using tiktoken"""
@@ -125,10 +148,138 @@ class MetricsCollector:
         execution_time_ms: float,
         model_name: str = "bedrock/us.anthropic.claude-3-5-sonnet-20241022-v2:0",
         success: bool = True,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        request_id: Optional[str] = None
     ) -> AgentMetrics:
-        """Track metrics for a single agent execution"""
+        """
+        Track metrics for a single agent execution
+        
+        The execution is added to request `request_id`; without one, to the
+        active request if exactly one is being tracked.
+        """
+        metrics = self._build_agent_metrics(
+            agent_name, input_text, output_text, execution_time_ms, model_name, success, error_message
+        )
+        with self._lock:
+            self._record(metrics, request_id)
+        return metrics
+    
+    def enqueue_agent_execution(
+        self,
+        agent_name: str,
+        input_text: str,
+        output_text: str,
+        execution_time_ms: float,
+        model_name: str = "bedrock/us.anthropic.claude-3-5-sonnet-20241022-v2:0",
+        success: bool = True,
+        error_message: Optional[str] = None,
+        request_id: Optional[str] = None
+    ) -> None:
+        """
+        Queue an agent execution to be tracked by a background thread
+        
+        Same arguments as track_agent_execution(); token counting and cost
+        estimation happen off the caller's path. finalize_request() waits
+        for queued executions before summing the request.
+        """
+        with self._lock:
+            self._unprocessed += 1
+            request_id = self._active_request_id(request_id)
+            request = self._requests.get(request_id)
+            if request is not None:
+                request["unprocessed"] += 1
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._drain_pending, name="agent-metrics", daemon=True
+                )
+                self._worker.start()
+        self._pending.put_nowait({
+            "agent_name": agent_name,
+            "input_text": input_text,
+            "output_text": output_text,
+            "execution_time_ms": execution_time_ms,
+            "model_name": model_name,
+            "success": success,
+            "error_message": error_message,
+            "request_id": request_id
+        })
+    
+    def track_agent_executions_bulk(self, records: List[Dict[str, Any]]) -> List[AgentMetrics]:
+        """Track several agent executions (track_agent_execution() keyword dicts) at once"""
+        tracked = []
+        for record in records:
+            record = dict(record)
+            request_id = record.pop("request_id", None)
+            tracked.append((request_id, self._build_agent_metrics(**record)))
+        with self._lock:
+            for request_id, metrics in tracked:
+                self._record(metrics, request_id)
+        return [metrics for _, metrics in tracked]
+    
+    def flush(self, timeout: float = AGENT_METRICS_FLUSH_TIMEOUT_S, request_id: Optional[str] = None) -> bool:
+        """
+        Wait until queued agent executions have been recorded
+        
+        Args:
+            timeout: Max seconds to wait
+            request_id: Only wait for this request's executions (None: all of them)
         
+        Returns:
+            False if the timeout expired first
+        """
+        if request_id is None:
+            drained = lambda: self._unprocessed == 0
+        else:
+            drained = lambda: self._requests.get(request_id, {}).get("unprocessed", 0) == 0
+        with self._drained:
+            return self._drained.wait_for(drained, timeout)
+    
+    def _drain_pending(self) -> None:
+        """Background thread: record queued executions in batches"""
+        while True:
+            batch = [self._pending.get()]
+            while len(batch) < AGENT_METRICS_BATCH_SIZE:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.track_agent_executions_bulk(batch)
+            except Exception:
+                pass  # Never let a bad record kill the drain thread
+            finally:
+                with self._drained:
+                    self._unprocessed -= len(batch)
+                    for record in batch:
+                        request = self._requests.get(record["request_id"])
+                        if request is not None:
+                            request["unprocessed"] -= 1
+                    self._drained.notify_all()
+    
+    def _active_request_id(self, request_id: Optional[str]) -> Optional[str]:
+        """`request_id`, or the only tracked request when None (caller holds the lock)"""
+        if request_id is None and len(self._requests) == 1:
+            return next(iter(self._requests))
+        return request_id
+    
+    def _record(self, metrics: AgentMetrics, request_id: Optional[str]) -> None:
+        """Append an execution to its request (caller holds the lock)"""
+        request = self._requests.get(self._active_request_id(request_id))
+        if request is None:
+            return  # Request already finalized or never started
+        request["agent_metrics"].append(metrics)
+        request["agents_executed"].append(metrics.agent_name)
+    
+    def _build_agent_metrics(
+        self,
+        agent_name: str,
+        input_text: str,
+        output_text: str,
+        execution_time_ms: float,
+        model_name: str,
+        success: bool,
+        error_message: Optional[str]
+    ) -> AgentMetrics:
         input_tokens = self.count_tokens(input_text)
         output_tokens = self.count_tokens(output_text)
         total_tokens = input_tokens + output_tokens
@@ -150,51 +301,61 @@ class MetricsCollector:
             error_message=error_message
         )
         
-        self.agent_metrics_list.append(metrics)
-        
-        if self.current_request_metrics:
-            self.current_request_metrics["agents_executed"].append(agent_name)
-            
         return metrics
     
     def finalize_request(
         self, 
         strategy: str, 
         recommendations_count: int,
-        success: bool = True
+        success: bool = True,
+        request_id: Optional[str] = None
     ) -> RequestMetrics:
-        """Finalize and return metrics for the entire request"""
+        """
+        Finalize and return metrics for the entire request
+        
+        Args:
+            request_id: Request to finalize (defaults to the only active request)
+        """
         
-        if not self.current_request_metrics:
+        with self._lock:
+            request_id = self._active_request_id(request_id)
+        # Wait for this request's queued executions only
+        self.flush(request_id=request_id)
+        
+        with self._lock:
+            request = self._requests.pop(request_id, None)
+        if request is None:
             raise ValueError("No active request to finalize")
         
         end_time = time.time()
-        total_execution_time = (end_time - self.current_request_metrics["start_time"]) * 1000
+        total_execution_time = (end_time - request["start_time"]) * 1000
         
-        total_tokens = sum(m.total_tokens for m in self.agent_metrics_list)
-        total_cost = sum(m.estimated_cost_usd for m in self.agent_metrics_list)
+        agent_metrics = request["agent_metrics"]
+        total_tokens = sum(m.total_tokens for m in agent_metrics)
+        total_cost = sum(m.estimated_cost_usd for m in agent_metrics)
         
-        request_metrics = RequestMetrics(
-            request_id=self.current_request_metrics["request_id"],
-            timestamp=self.current_request_metrics["timestamp"],
-            requested_item=self.current_request_metrics["requested_item"],
-            country=self.current_request_metrics["country"],
-            urgency=self.current_request_metrics["urgency"],
+        return RequestMetrics(
+            request_id=request["request_id"],
+            timestamp=request["timestamp"],
+            requested_item=request["requested_item"],
+            country=request["country"],
+            urgency=request["urgency"],
             strategy=strategy,
             total_execution_time_ms=total_execution_time,
             total_tokens=total_tokens,
             total_cost_usd=total_cost,
-            agents_executed=self.current_request_metrics["agents_executed"],
-            agent_metrics=self.agent_metrics_list.copy(),
+            agents_executed=request["agents_executed"],
+            agent_metrics=agent_metrics,
             final_recommendations_count=recommendations_count,
             success=success
         )
-        
-        # Reset for next request
-        self.current_request_metrics = None
-        self.agent_metrics_list = []
-        
-        return request_metrics
+    
+    def discard_request(self, request_id: str) -> None:
+        """Stop tracking a request that will not be finalized (failed or abandoned)"""
+        with self._drained:
+            # Its still-queued executions are dropped by the drain thread
+            self._requests.pop(request_id, None)
+            self._drained.notify_all()
     
     def get_metrics_dict(self, metrics: RequestMetrics) -> Dict[str, Any]:
         """Convert metrics to dictionary format"""
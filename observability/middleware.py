@@ -2,6 +2,7 @@
 Observability Middleware - Integrates observability into the agent system
 """
 
+import os
 import uuid
 import time
 import copy
@@ -23,7 +24,8 @@ class ObservabilityMiddleware:
         self, 
         enable_ai_analysis: bool = True,
         enable_cloudwatch: bool = None,
-        cloudwatch_region: str = None
+        cloudwatch_region: str = None,
+        enable_agent_metrics: bool = None
     ):
         """
         Initialize observability middleware
@@ -32,8 +34,13 @@ class ObservabilityMiddleware:
             enable_ai_analysis: Whether to run AI analysis on outputs (more expensive)
             enable_cloudwatch: Enable CloudWatch metrics publishing (defaults to env var)
             cloudwatch_region: AWS region for CloudWatch (defaults to AWS_DEFAULT_REGION)
+            enable_agent_metrics: Track per-agent executions (defaults to the
+                ENABLE_AGENT_METRICS env var, on unless set to "false")
         """
-        self.metrics_collector = MetricsCollector()
+        if enable_agent_metrics is None:
+            enable_agent_metrics = os.environ.get('ENABLE_AGENT_METRICS', 'true').lower() != 'false'
+        
+        self.metrics_collector = MetricsCollector(enabled=enable_agent_metrics)
         self.ai_analyzer = AIObservabilityAnalyzer() if enable_ai_analysis else None
         self.drift_detector = DriftDetector()
         self.storage = ObservabilityStorage(
@@ -91,6 +98,7 @@ class ObservabilityMiddleware:
             def wrapper(state, *args, **kwargs):
                 # Capture input
                 input_text = self._serialize_state(state)
+                request_id = state.get("observability_request_id") if isinstance(state, dict) else None
                 
                 # Track execution time
                 start_time = time.time()
@@ -112,7 +120,8 @@ class ObservabilityMiddleware:
                         output_text=output_text,
                         execution_time_ms=execution_time,
                         model_name=model_name,
-                        success=True
+                        success=True,
+                        request_id=request_id
                     )
                     
                     return result
@@ -128,7 +137,8 @@ class ObservabilityMiddleware:
                         execution_time_ms=execution_time,
                         model_name=model_name,
                         success=False,
-                        error_message=str(e)
+                        error_message=str(e),
+                        request_id=request_id
                     )
                     
                     raise
@@ -136,12 +146,24 @@ class ObservabilityMiddleware:
             return wrapper
         return decorator
     
+    def discard_request_tracking(self, request_id: str) -> None:
+        """
+        Stop tracking a request without finalizing it
+        
+        Used when the graph run fails or its consumer goes away, so the
+        request doesn't stay in the metrics collector.
+        """
+        self.metrics_collector.discard_request(request_id)
+        if self.current_request_id == request_id:
+            self.current_request_id = None
+    
     def finalize_request(
         self,
         strategy: str,
         recommendations_count: int,
         success: bool = True,
-        run_ai_analysis: bool = None
+        run_ai_analysis: bool = None,
+        request_id: str = None
     ) -> Dict[str, Any]:
         """
         Finalize request tracking and perform analysis
@@ -151,6 +173,8 @@ class ObservabilityMiddleware:
             recommendations_count: Number of recommendations generated
             success: Whether the request was successful
             run_ai_analysis: Override enable_ai_analysis for this request
+            request_id: Request to finalize, as returned by start_request_tracking()
+                (defaults to the only request being tracked)
             
         Returns:
             Complete observability report
@@ -159,15 +183,16 @@ class ObservabilityMiddleware:
         request_metrics = self.metrics_collector.finalize_request(
             strategy=strategy,
             recommendations_count=recommendations_count,
-            success=success
+            success=success,
+            request_id=request_id
         )
         
         metrics_dict = self.metrics_collector.get_metrics_dict(request_metrics)
         public_metrics = copy.deepcopy(metrics_dict)
         public_metrics.pop("agent_metrics", None)
         
-        # Store metrics
-        self.storage.store_request_metrics(metrics_dict)
+        # Store metrics (CloudWatch metrics are published together below)
+        self.storage.store_request_metrics(metrics_dict, publish=False)
         
         # Perform AI analysis if enabled
         ai_analysis = {}
@@ -183,7 +208,7 @@ class ObservabilityMiddleware:
         
         if run_ai_analysis and self.ai_analyzer:
             ai_analysis = self._perform_ai_analysis(metrics_dict)
-            self.storage.store_ai_analysis(request_metrics.request_id, ai_analysis)
+            self.storage.store_ai_analysis(request_metrics.request_id, ai_analysis, publish=False)
         
         # Check for drift (after enough requests)
         drift_analysis = {}
@@ -209,7 +234,10 @@ class ObservabilityMiddleware:
             drift_analysis = self.drift_detector.detect_drift(recent_window)
             
             # Persist the drift analysis so the drift endpoints can retrieve it
-            self.storage.store_drift_analysis(drift_analysis)
+            self.storage.store_drift_analysis(drift_analysis, publish=False)
+        
+        # One CloudWatch batch for the request, drift and AI analysis metrics
+        self.storage.publish_request(metrics_dict, ai_analysis=ai_analysis, drift_analysis=drift_analysis)
         
         return {
             "request_id": request_metrics.request_id,
@@ -223,9 +251,6 @@ class ObservabilityMiddleware:
         if not self.ai_analyzer:
             return {}
         
-        text_quality_results = []
-        reasoning_results = []
-        
         agent_metrics = metrics_dict.get("agent_metrics", [])
         target_metric = next(
             (am for am in agent_metrics if am.get("agent_name") == "recommendation_agent"),
@@ -236,42 +261,16 @@ class ObservabilityMiddleware:
             # Fallback to the last executed agent if recommendation metrics are missing
             target_metric = agent_metrics[-1]
         
-        if target_metric:
-            agent_name = target_metric["agent_name"]
-            
-            if target_metric.get("output_text"):
-                quality = self.ai_analyzer.analyze_text_quality(
-                    text=target_metric["output_text"],
-                    context=f"Agent: {agent_name}"
-                )
-                quality["agent_name"] = agent_name
-                text_quality_results.append(quality)
-            
-            if target_metric.get("input_text") and target_metric.get("output_text"):
-                reasoning = self.ai_analyzer.analyze_reasoning(
-                    agent_name=agent_name,
-                    input_data=target_metric["input_text"],
-                    output_data=target_metric["output_text"]
-                )
-                reasoning_results.append(reasoning)
+        if not target_metric:
+            target_metric = {"agent_name": "unknown"}
         
-        # Performance analysis
-        performance = self.ai_analyzer.analyze_request_performance(metrics_dict)
-        
-        # Generate comprehensive report
-        report = self.ai_analyzer.generate_comprehensive_report(
-            request_metrics=metrics_dict,
-            text_quality_results=text_quality_results,
-            reasoning_results=reasoning_results,
-            performance_analysis=performance
+        # Independent LLM analyses run concurrently, then the comprehensive report
+        return self.ai_analyzer.analyze_all(
+            agent_name=target_metric["agent_name"],
+            input_text=target_metric.get("input_text", ""),
+            output_text=target_metric.get("output_text", ""),
+            request_metrics=metrics_dict
         )
-        
-        return {
-            "text_quality": text_quality_results,
-            "reasoning_analysis": reasoning_results,
-            "performance_analysis": performance,
-            "comprehensive_report": report
-        }
     
     def _serialize_state(self, state) -> str:
         """Serialize state object to string for tracking"""
@@ -319,7 +318,8 @@ _observability_instance = None
 def get_observability_middleware(
     enable_ai_analysis: bool = True,
     enable_cloudwatch: bool = None,
-    cloudwatch_region: str = None
+    cloudwatch_region: str = None,
+    enable_agent_metrics: bool = None
 ) -> ObservabilityMiddleware:
     """
     Get or create global observability middleware instance
@@ -328,6 +328,7 @@ def get_observability_middleware(
         enable_ai_analysis: Whether to run AI analysis on outputs
         enable_cloudwatch: Enable CloudWatch metrics publishing
         cloudwatch_region: AWS region for CloudWatch
+        enable_agent_metrics: Track per-agent executions (defaults to ENABLE_AGENT_METRICS)
     """
     global _observability_instance
     
@@ -335,7 +336,8 @@ def get_observability_middleware(
         _observability_instance = ObservabilityMiddleware(
             enable_ai_analysis=enable_ai_analysis,
             enable_cloudwatch=enable_cloudwatch,
-            cloudwatch_region=cloudwatch_region
+            cloudwatch_region=cloudwatch_region,
+            enable_agent_metrics=enable_agent_metrics
         )
     
     return _observability_instance
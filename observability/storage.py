@@ -2,6 +2,7 @@
 Observability Storage - Stores and retrieves observability data
 """
 
+import importlib.util
 import json
 import os
 import numpy as np
@@ -17,12 +18,11 @@ try:
 except ImportError:
     load_dotenv = None
 
-# Import CloudWatch publisher (optional dependency)
-try:
-    from .cloudwatch_publisher import CloudWatchPublisher
-    CLOUDWATCH_AVAILABLE = True
-except ImportError:
-    CLOUDWATCH_AVAILABLE = False
+# CloudWatch publisher (optional dependency: boto3 is only imported once
+# publishing is enabled)
+from .cloudwatch_publisher import CloudWatchPublisher
+CLOUDWATCH_AVAILABLE = importlib.util.find_spec("boto3") is not None
+if not CLOUDWATCH_AVAILABLE:
     print("⚠️  CloudWatch publisher not available. Install boto3 to enable CloudWatch metrics.")
 
 
@@ -70,7 +70,8 @@ class ObservabilityStorage:
             try:
                 self.cloudwatch_publisher = CloudWatchPublisher(
                     region_name=cloudwatch_region,
-                    enabled=True
+                    enabled=True,
+                    pending_path=self.storage_dir / "cloudwatch_pending.jsonl"
                 )
                 print("✅ CloudWatch metrics publishing enabled")
             except Exception as e:
@@ -139,8 +140,8 @@ class ObservabilityStorage:
         self.recent_analyses = self.recent_analyses[-100:]
         self.drift_history = self.drift_history[-50:]
     
-    def store_request_metrics(self, metrics: Dict[str, Any]) -> None:
-        """Store request metrics and publish to CloudWatch"""
+    def store_request_metrics(self, metrics: Dict[str, Any], publish: bool = True) -> None:
+        """Store request metrics and publish to CloudWatch (unless publish is False)"""
         with self.lock:
             # Sanitize numpy types before storing
             sanitized_metrics = self._sanitize_numpy_types(metrics)
@@ -158,7 +159,7 @@ class ObservabilityStorage:
             })
             
             # Publish to CloudWatch
-            if self.cloudwatch_publisher:
+            if publish and self.cloudwatch_publisher and self.cloudwatch_publisher.enabled:
                 try:
                     request_id = sanitized_metrics.get('request_id', 'unknown')
                     print(f"[Observability] Publishing request metrics to CloudWatch (request_id={request_id})")
@@ -182,8 +183,8 @@ class ObservabilityStorage:
                 except Exception as e:
                     print(f"⚠️  Error publishing request metrics to CloudWatch: {e}")
     
-    def store_ai_analysis(self, request_id: str, analysis: Dict[str, Any]) -> None:
-        """Store AI analysis results and publish to CloudWatch"""
+    def store_ai_analysis(self, request_id: str, analysis: Dict[str, Any], publish: bool = True) -> None:
+        """Store AI analysis results and publish to CloudWatch (unless publish is False)"""
         with self.lock:
             analysis_data = {
                 "request_id": request_id,
@@ -205,7 +206,7 @@ class ObservabilityStorage:
             })
             
             # Publish to CloudWatch
-            if self.cloudwatch_publisher:
+            if publish and self.cloudwatch_publisher and self.cloudwatch_publisher.enabled:
                 try:
                     print(f"[Observability] Publishing AI analysis metrics to CloudWatch (request_id={request_id})")
                     ai_publish_success = self.cloudwatch_publisher.publish_ai_analysis_metrics(analysis)
@@ -213,8 +214,8 @@ class ObservabilityStorage:
                 except Exception as e:
                     print(f"⚠️  Error publishing AI analysis metrics to CloudWatch: {e}")
     
-    def store_drift_analysis(self, drift_analysis: Dict[str, Any]) -> None:
-        """Store drift detection results and publish to CloudWatch"""
+    def store_drift_analysis(self, drift_analysis: Dict[str, Any], publish: bool = True) -> None:
+        """Store drift detection results and publish to CloudWatch (unless publish is False)"""
         with self.lock:
             drift_data = {
                 "timestamp": datetime.utcnow().isoformat(),
@@ -235,7 +236,7 @@ class ObservabilityStorage:
             })
             
             # Publish to CloudWatch
-            if self.cloudwatch_publisher:
+            if publish and self.cloudwatch_publisher and self.cloudwatch_publisher.enabled:
                 try:
                     print("[Observability] Publishing drift metrics to CloudWatch")
                     drift_publish_success = self.cloudwatch_publisher.publish_drift_metrics(drift_analysis)
@@ -243,6 +244,27 @@ class ObservabilityStorage:
                 except Exception as e:
                     print(f"⚠️  Error publishing drift metrics to CloudWatch: {e}")
     
+    def publish_request(
+        self,
+        metrics: Dict[str, Any],
+        ai_analysis: Optional[Dict[str, Any]] = None,
+        drift_analysis: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Publish all CloudWatch metrics of a request in one batch"""
+        if not (self.cloudwatch_publisher and self.cloudwatch_publisher.enabled):
+            return
+        try:
+            request_id = metrics.get('request_id', 'unknown')
+            print(f"[Observability] Publishing request observability metrics to CloudWatch (request_id={request_id})")
+            publish_success = self.cloudwatch_publisher.publish_all(
+                self._sanitize_numpy_types(metrics),
+                drift_analysis=drift_analysis,
+                ai_analysis=ai_analysis
+            )
+            print(f"[Observability] Request observability metrics publish {'succeeded' if publish_success else 'failed'} (request_id={request_id})")
+        except Exception as e:
+            print(f"⚠️  Error publishing request observability metrics to CloudWatch: {e}")
+    
     def _append_to_file(self, data: Dict[str, Any]) -> None:
         """Append data to today's file"""
         filepath = self.storage_dir / self._get_date_filename()
@@ -1,9 +1,11 @@
 from .catalog_service import add_product_to_catalog, bulk_add_products
-from .recommendation_service import recommend_substitute
+from .recommendation_service import arecommend_substitute, astream_recommendation, recommend_substitute
 
 __all__ = [
     "add_product_to_catalog",
     "bulk_add_products",
+    "arecommend_substitute",
+    "astream_recommendation",
     "recommend_substitute",
 ]
 
@@ -2,12 +2,13 @@
 Catalog Service - Product management functions
 """
 
+import logging
 from typing import List, Dict, Any
 from langchain_core.documents import Document
-from langchain_community.vectorstores import FAISS
-from config import embeddings
 import data
 
+logger = logging.getLogger(__name__)
+
 
 def add_product_to_catalog(
     product_description: str,
@@ -23,17 +24,20 @@ def add_product_to_catalog(
         page_content=product_description,
         metadata={
             "sku": sku,
+            "product_name": product_description.split(" - ")[0],
             "atc": atc_code,
             "cold_chain": cold_chain,
             "shelf_life_months": shelf_life_months
         }
     )
     
-    data.catalog_docs.append(new_doc)
-    # Recreate vectorstore with all documents
-    data.vectorstore = FAISS.from_documents(data.catalog_docs, embeddings)
+    # Runs in a threadpool: concurrent adds must not rebuild from stale snapshots
+    with data.catalog_lock:
+        data.catalog_docs.append(new_doc)
+        # Recreate vectorstore with all documents (also invalidates cached searches)
+        data.vectorstore = data.refresh_vectorstore()
     
-    print(f"✅ Product {sku} added to catalog")
+    logger.info("✅ Product %s added to catalog", sku)
     return new_doc
 
 
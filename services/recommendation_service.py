@@ -2,40 +2,36 @@
 Recommendation Service - Main business logic for substitute recommendations
 """
 
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict
+
+from agents.recommendation_agent import REPORT_STREAM_EVENT
 from graph import app
 from observability.middleware import get_observability_middleware
 
+logger = logging.getLogger(__name__)
 
-def recommend_substitute(
-    requested_item: str, 
-    country: str, 
-    quantity: int = 100,
-    urgency: str = "medium",
-    enable_observability: bool = True,
-    enable_ai_analysis: bool = False  # AI analysis is expensive, disabled by default
+
+def _start_request(
+    requested_item: str,
+    country: str,
+    quantity: int,
+    urgency: str,
+    enable_observability: bool,
+    enable_ai_analysis: bool,
+    explain_strategy: bool
 ):
     """
-    Main function to request substitute recommendations (MULTI-AGENT)
-    
-    Args:
-        requested_item: Name of unavailable product
-        country: Destination country code (CO, PE, MX)
-        quantity: Required quantity
-        urgency: Urgency level ("low", "medium", "high", "critical")
-        enable_observability: Whether to track observability metrics
-        enable_ai_analysis: Whether to run AI analysis on outputs (more expensive)
-    
+    Log the request, start observability tracking and build the initial state
+
     Returns:
-        Final state with recommendations and observability data
+        Tuple of (observability middleware or None, initial graph state)
     """
-    print("\n" + "=" * 80)
-    print(f"🏥 MULTI-AGENT REGULATED SUBSTITUTE RECOMMENDER")
-    print("=" * 80)
-    print(f"Product: {requested_item}")
-    print(f"Country: {country}")
-    print(f"Quantity: {quantity} units")
-    print(f"Urgency: {urgency.upper()}")
-    print("=" * 80 + "\n")
+    logger.info(
+        "🏥 MULTI-AGENT REGULATED SUBSTITUTE RECOMMENDER - Product: %s | Country: %s | Quantity: %s units | Urgency: %s",
+        requested_item, country, quantity, urgency.upper()
+    )
     
     # Initialize observability tracking
     observability = None
@@ -48,7 +44,7 @@ def recommend_substitute(
             country=country,
             urgency=urgency
         )
-        print(f"📊 Observability enabled - Request ID: {request_id}\n")
+        logger.info("📊 Observability enabled - Request ID: %s", request_id)
     
     state = {
         "requested_item": requested_item,
@@ -56,43 +52,50 @@ def recommend_substitute(
         "requested_quantity": quantity,
         "urgency": urgency,
         "strategy": None,
+        "strategy_reasoning": None,
+        "explain_strategy": explain_strategy,
         "compliance_result": None,
         "inventory_result": None,
         "logistics_result": None,
         "cost_result": None,
         "catalog_candidates": [],
+        "lots_join": [],
         "agent_decisions": [],
         "compliant_substitutes": [],
         "coordinator_synthesis": None,
+        "negotiation_summary": None,
         "recommendations": [],
         "suggested_action": "",
         "final_report": None,
         "observability_request_id": request_id,  # Add request ID to state
     }
     
-    # Configuration required by checkpointer
-    config = {"configurable": {"thread_id": "1"}}
-    result = app.invoke(state, config)
-    
-    print("\n" + "=" * 80)
-    print("📊 FINAL EXECUTIVE REPORT")
-    print("=" * 80)
-    print(f"\n{result['final_report']}\n")
+    return observability, state
+
+
+def _discard_request(observability, state) -> None:
+    """Drop the observability tracking of a request that did not finish"""
+    if observability:
+        observability.discard_request_tracking(state["observability_request_id"])
+
+
+def _finish_request(result, observability, enable_ai_analysis: bool):
+    """
+    Log the final report and finalize observability tracking
+
+    Returns:
+        The final state, with the observability report attached when enabled
+    """
+    logger.debug("📊 FINAL EXECUTIVE REPORT\n%s", result["final_report"])
     
-    if result["recommendations"]:
-        print("🎯 Top-3 Recommended Substitutes:")
-        print("-" * 80)
+    if result["recommendations"] and logger.isEnabledFor(logging.INFO):
         for i, rec in enumerate(result["recommendations"], 1):
-            print(f"\n{i}. {rec['sku']} - {rec['product_name']}")
-            print(f"   Score: {rec['score']:.1f}/100")
-            print(f"   Warehouse: {rec['warehouse']} | Lot: {rec['lot']} | Stock: {rec['stock']} units")
-            print(f"   {rec['justification']}")
-            print(f"   Compliance: {', '.join(rec['compliance_rules'])}")
+            logger.info(
+                "🎯 %d. %s - %s | Score: %.1f/100 | Warehouse: %s | Lot: %s | Stock: %s units",
+                i, rec["sku"], rec["product_name"], rec["score"], rec["warehouse"], rec["lot"], rec["stock"]
+            )
     
-    print("\n" + "=" * 80)
-    print(f"💼 SUGGESTED ACTION: {result['suggested_action']}")
-    print(f"🎯 Applied strategy: {result['strategy'].upper()}")
-    print("=" * 80 + "\n")
+    logger.info("💼 SUGGESTED ACTION: %s | 🎯 Applied strategy: %s", result["suggested_action"], result["strategy"].upper())
     
     # Finalize observability tracking
     if observability:
@@ -101,28 +104,144 @@ def recommend_substitute(
                 strategy=result.get("strategy", "unknown"),
                 recommendations_count=len(result.get("recommendations", [])),
                 success=True,
-                run_ai_analysis=enable_ai_analysis
+                run_ai_analysis=enable_ai_analysis,
+                request_id=result.get("observability_request_id")
             )
             
             result["observability"] = observability_report
             
-            print("=" * 80)
-            print("📈 OBSERVABILITY METRICS")
-            print("=" * 80)
             metrics = observability_report["metrics"]
-            print(f"Total execution time: {metrics['total_execution_time_ms']:.0f}ms")
-            print(f"Total tokens used: {metrics['total_tokens']}")
-            print(f"Total cost: ${metrics['total_cost_usd']:.4f}")
-            print(f"Agents executed: {', '.join(metrics['agents_executed'])}")
+            logger.info(
+                "📈 OBSERVABILITY METRICS - Total execution time: %.0fms | Total tokens used: %s | Total cost: $%.4f | Agents executed: %s",
+                metrics["total_execution_time_ms"],
+                metrics["total_tokens"],
+                metrics["total_cost_usd"],
+                ", ".join(metrics["agents_executed"])
+            )
             
             if observability_report.get("drift_analysis") and observability_report["drift_analysis"].get("drift_detected"):
-                print("\n⚠️  DRIFT DETECTED:")
-                for indicator in observability_report["drift_analysis"].get("drift_indicators", []):
-                    print(f"   • {indicator}")
-            
-            print("=" * 80 + "\n")
+                logger.warning(
+                    "⚠️  DRIFT DETECTED: %s",
+                    "; ".join(observability_report["drift_analysis"].get("drift_indicators", []))
+                )
         except Exception as e:
-            print(f"⚠️  Warning: Observability tracking failed: {e}\n")
+            logger.warning("⚠️  Warning: Observability tracking failed: %s", e)
     
     return result
 
+
+async def arecommend_substitute(
+    requested_item: str, 
+    country: str, 
+    quantity: int = 100,
+    urgency: str = "medium",
+    enable_observability: bool = True,
+    enable_ai_analysis: bool = False,  # AI analysis is expensive, disabled by default
+    explain_strategy: bool = False
+):
+    """
+    Main function to request substitute recommendations (MULTI-AGENT)
+    
+    Runs the agent graph asynchronously so LLM calls don't block the event loop.
+    
+    Args:
+        requested_item: Name of unavailable product
+        country: Destination country code (CO, PE, MX)
+        quantity: Required quantity
+        urgency: Urgency level ("low", "medium", "high", "critical")
+        enable_observability: Whether to track observability metrics
+        enable_ai_analysis: Whether to run AI analysis on outputs (more expensive)
+        explain_strategy: Whether to ask the LLM to justify the chosen strategy
+    
+    Returns:
+        Final state with recommendations and observability data
+    """
+    observability, state = _start_request(
+        requested_item, country, quantity, urgency, enable_observability, enable_ai_analysis, explain_strategy
+    )
+    
+    # Configuration required by checkpointer
+    config = {"configurable": {"thread_id": "1"}}
+    try:
+        result = await app.ainvoke(state, config)
+    except BaseException:
+        _discard_request(observability, state)
+        raise
+    
+    # Observability storage writes (and the optional AI analysis) are blocking
+    return await asyncio.to_thread(_finish_request, result, observability, enable_ai_analysis)
+
+
+async def astream_recommendation(
+    requested_item: str, 
+    country: str, 
+    quantity: int = 100,
+    urgency: str = "medium",
+    enable_observability: bool = True,
+    enable_ai_analysis: bool = False,
+    explain_strategy: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of arecommend_substitute()
+    
+    Yields the executive report token by token while the graph runs, then
+    the final state.
+    
+    Args:
+        Same as arecommend_substitute()
+    
+    Yields:
+        {"event": "report_delta", "data": str} for each report token, then
+        {"event": "result", "data": final state}
+    """
+    observability, state = _start_request(
+        requested_item, country, quantity, urgency, enable_observability, enable_ai_analysis, explain_strategy
+    )
+    
+    config = {"configurable": {"thread_id": "1"}}
+    result = None
+    finished = False
+    
+    # Early exit (graph error, consumer disconnect) must not leave the
+    # request tracked in the metrics collector
+    try:
+        async for event in app.astream_events(state, config, version="v2"):
+            if event["event"] == "on_custom_event" and event["name"] == REPORT_STREAM_EVENT:
+                yield {"event": "report_delta", "data": event["data"]}
+            elif event["event"] == "on_chain_end" and not event.get("parent_ids"):
+                # End of the root graph run: its output is the final state
+                result = event["data"]["output"]
+        
+        if result is None:
+            raise RuntimeError("Recommendation graph finished without a final state")
+        
+        result = await asyncio.to_thread(_finish_request, result, observability, enable_ai_analysis)
+        finished = True
+    finally:
+        if not finished:
+            _discard_request(observability, state)
+    
+    yield {"event": "result", "data": result}
+
+
+def recommend_substitute(
+    requested_item: str, 
+    country: str, 
+    quantity: int = 100,
+    urgency: str = "medium",
+    enable_observability: bool = True,
+    enable_ai_analysis: bool = False,
+    explain_strategy: bool = False
+):
+    """
+    Synchronous entry point for scripts; see arecommend_substitute()
+    """
+    return asyncio.run(arecommend_substitute(
+        requested_item=requested_item,
+        country=country,
+        quantity=quantity,
+        urgency=urgency,
+        enable_observability=enable_observability,
+        enable_ai_analysis=enable_ai_analysis,
+        explain_strategy=explain_strategy
+    ))